@@ -0,0 +1,188 @@
+"""Content-addressed cache of serialized scan reports.
+
+Keys are ``<sha256 of the uploaded bytes>-<fingerprint>``, where the
+fingerprint covers the scan settings and the pattern pack version, so
+changing either (including a hot-reloaded pack) misses instead of serving
+stale results. Entries are the report
+JSON bytes, kept in a byte-capped in-memory LRU and, optionally, in a
+byte-capped directory on disk (evicted oldest-access first) that survives
+restarts.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import asdict
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Optional
+
+from dataguardian.config import Settings
+from dataguardian.patterns import get_pack
+from dataguardian.metrics import CACHE_REQUESTS
+
+_SHA256_RE = re.compile(r"^[0-9a-f]{64}$")
+
+
+def is_sha256(value: str) -> bool:
+    return bool(_SHA256_RE.match(value or ""))
+
+
+def scan_fingerprint(settings: Settings) -> str:
+    """Hash of everything besides the bytes that changes a report."""
+    return _fingerprint(settings, get_pack(settings.patterns_path or None).version)
+
+
+@lru_cache(maxsize=32)
+def _fingerprint(settings: Settings, patterns_version: str) -> str:
+    relevant = {k: v for k, v in asdict(settings).items() if not k.startswith(("api_", "daemon_", "patterns_")) and k not in ("findings_db", "redact_mode")}
+    relevant["patterns"] = patterns_version
+    relevant["entry_format"] = 2  # 2: entries carry no created_at/target
+    return hashlib.sha256(json.dumps(relevant, sort_keys=True, default=str).encode("utf-8")).hexdigest()[:16]
+
+
+class ReportCache:
+    def __init__(
+        self,
+        *,
+        fingerprint: str,
+        max_memory_bytes: int,
+        directory: str = "",
+        max_disk_bytes: int = 0,
+        settings: Optional[Settings] = None,
+    ) -> None:
+        self._fingerprint = fingerprint
+        self._settings = settings  # set: fingerprint follows pattern pack reloads
+        self.max_memory_bytes = max_memory_bytes
+        self.dir = Path(directory) if directory else None
+        self.max_disk_bytes = max_disk_bytes
+        if self.dir is not None:
+            self.dir.mkdir(parents=True, exist_ok=True)
+        self._mem: "OrderedDict[str, bytes]" = OrderedDict()
+        self._mem_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "ReportCache":
+        return cls(
+            fingerprint=scan_fingerprint(settings),
+            max_memory_bytes=settings.api_cache_mb * 1024 * 1024,
+            directory=settings.api_cache_dir,
+            max_disk_bytes=settings.api_cache_disk_mb * 1024 * 1024,
+            settings=settings,
+        )
+
+    @property
+    def fingerprint(self) -> str:
+        return self.fingerprint_for()
+
+    def fingerprint_for(self, patterns_version: Optional[str] = None) -> str:
+        """Fingerprint for reports made with ``patterns_version`` (default: this process's current pack)."""
+        if self._settings is None:
+            return self._fingerprint
+        if patterns_version is None:
+            return scan_fingerprint(self._settings)
+        return _fingerprint(self._settings, patterns_version)
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_memory_bytes > 0 or self.dir is not None
+
+    def key(self, content_sha256: str, patterns_version: Optional[str] = None) -> str:
+        return f"{content_sha256}-{self.fingerprint_for(patterns_version)}"
+
+    def get(self, content_sha256: str) -> Optional[bytes]:
+        key = self.key(content_sha256)
+        with self._lock:
+            data = self._mem.get(key)
+            if data is not None:
+                self._mem.move_to_end(key)
+                self.hits += 1
+                CACHE_REQUESTS.inc(cache="report", result="hit")
+                return data
+        data = self._disk_get(key)
+        with self._lock:
+            if data is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._mem_put(key, data)
+        CACHE_REQUESTS.inc(cache="report", result="miss" if data is None else "hit")
+        return data
+
+    def put(self, content_sha256: str, data: bytes, *, patterns_version: Optional[str] = None) -> None:
+        """Store a report; pass the pack version the scan used (``report.meta["patterns"]``)."""
+        key = self.key(content_sha256, patterns_version)
+        with self._lock:
+            self._mem_put(key, data)
+        self._disk_put(key, data)
+
+    def stats(self) -> Dict[str, object]:
+        total = self.hits + self.misses
+        with self._lock:
+            entries, size = len(self._mem), self._mem_bytes
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+            "memory_entries": entries,
+            "memory_bytes": size,
+            "disk": str(self.dir) if self.dir is not None else None,
+        }
+
+    # -------- internals --------
+
+    def _mem_put(self, key: str, data: bytes) -> None:
+        if len(data) > self.max_memory_bytes:
+            return
+        old = self._mem.pop(key, None)
+        if old is not None:
+            self._mem_bytes -= len(old)
+        self._mem[key] = data
+        self._mem_bytes += len(data)
+        while self._mem_bytes > self.max_memory_bytes:
+            _, evicted = self._mem.popitem(last=False)
+            self._mem_bytes -= len(evicted)
+
+    def _disk_get(self, key: str) -> Optional[bytes]:
+        if self.dir is None:
+            return None
+        path = self.dir / f"{key}.json"
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            return None
+        os.utime(path)  # mtime doubles as last access for eviction
+        return data
+
+    def _disk_put(self, key: str, data: bytes) -> None:
+        if self.dir is None or (self.max_disk_bytes and len(data) > self.max_disk_bytes):
+            return
+        path = self.dir / f"{key}.json"
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+        if self.max_disk_bytes:
+            self._disk_evict()
+
+    def _disk_evict(self) -> None:
+        entries = []
+        for p in self.dir.glob("*.json"):
+            try:
+                st = p.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_mtime, st.st_size, p))
+        total = sum(size for _, size, _ in entries)
+        for _, size, p in sorted(entries):
+            if total <= self.max_disk_bytes:
+                break
+            p.unlink(missing_ok=True)
+            total -= size
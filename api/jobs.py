@@ -0,0 +1,381 @@
+"""Asynchronous scan jobs for big uploads.
+
+``POST /jobs`` spools the upload into ``Settings.api_jobs_dir`` and returns a
+job id at once; a ``JobRunner`` task in the API process feeds queued jobs to
+the scan pool. Job state lives in a SQLite file next to the spooled uploads,
+so queued work survives an API restart: jobs left ``running`` by a process
+that is gone are put back in the queue on startup.
+
+Progress (``bytes_scanned``/``findings``) is read from the scan budget by a
+background thread in the worker, the same way workers heartbeat in
+``dataguardian.workqueue``. The budget counts cell characters, not file
+bytes, so while a job runs ``bytes_scanned`` is an estimate held below
+``bytes_total``; a job that finishes without hitting a budget limit reports
+``bytes_scanned == bytes_total``. Reports are written as NDJSON and streamed back.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import re
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+
+from dataguardian.budget import ScanBudget
+from dataguardian.config import Settings
+from dataguardian.merge import iter_report_records
+
+from api.pool import PoolSaturated, PoolUnavailable, ScanPool, _detectors
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL DEFAULT 'queued',
+    filename TEXT NOT NULL,
+    path TEXT NOT NULL,
+    bytes_total INTEGER NOT NULL,
+    bytes_scanned INTEGER NOT NULL DEFAULT 0,
+    rows_scanned INTEGER,
+    findings INTEGER NOT NULL DEFAULT 0,
+    score INTEGER,
+    level TEXT,
+    report_path TEXT,
+    error TEXT,
+    owner TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created_at);
+"""
+
+_COLUMNS = (
+    "id", "status", "filename", "path", "bytes_total", "bytes_scanned", "rows_scanned",
+    "findings", "score", "level", "report_path", "error", "owner", "created_at", "updated_at",
+)
+
+
+@dataclass(frozen=True)
+class Job:
+    id: str
+    status: str
+    filename: str
+    path: str
+    bytes_total: int
+    bytes_scanned: int
+    rows_scanned: Optional[int]
+    findings: int
+    score: Optional[int]
+    level: Optional[str]
+    report_path: Optional[str]
+    error: Optional[str]
+    owner: Optional[str]
+    created_at: float
+    updated_at: float
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "status": self.status,
+            "filename": self.filename,
+            "bytes_total": self.bytes_total,
+            "bytes_scanned": self.bytes_scanned,
+            "rows_scanned": self.rows_scanned,
+            "findings": self.findings,
+            "score": self.score,
+            "level": self.level,
+            "error": self.error,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+        }
+
+
+def safe_filename(name: str) -> str:
+    """Basename of an uploaded file name, reduced to a safe charset (suffix kept)."""
+    base = Path(name or "").name
+    return re.sub(r"[^\w.\-]", "_", base).lstrip(".") or "upload"
+
+
+# a restarted container usually gets the same hostname and PID: the boot id
+# tells this process's jobs apart from those of its dead predecessor
+_BOOT_ID = uuid.uuid4().hex[:12]
+
+
+def _owner() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{_BOOT_ID}"
+
+
+def _owner_alive(owner: Optional[str]) -> bool:
+    """Is the process that claimed a job still running? (only knowable on this host)"""
+    if not owner:
+        return False
+    parts = owner.split(":")
+    host, pid, boot = parts[0], parts[1] if len(parts) > 1 else "", parts[2] if len(parts) > 2 else ""
+    if host != socket.gethostname():
+        return True
+    if pid == str(os.getpid()):
+        return boot == _BOOT_ID
+    try:
+        os.kill(int(pid), 0)
+    except (ValueError, ProcessLookupError):
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class JobStore:
+    def __init__(self, root: str | Path) -> None:
+        self.root = Path(root)
+        self._db: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._open_lock = threading.Lock()
+
+    @property
+    def db_path(self) -> str:
+        return str(self.root / "jobs.db")
+
+    @property
+    def _conn(self) -> sqlite3.Connection:
+        # opened on first use: importing the API must not create the jobs dir
+        if self._db is None:
+            with self._open_lock:
+                if self._db is None:
+                    self.root.mkdir(parents=True, exist_ok=True)
+                    conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None, check_same_thread=False)
+                    conn.execute("PRAGMA journal_mode=WAL")
+                    conn.execute("PRAGMA busy_timeout=30000")
+                    conn.executescript(_SCHEMA)
+                    self._db = conn
+        return self._db
+
+    def close(self) -> None:
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def job_dir(self, job_id: str) -> Path:
+        return self.root / job_id
+
+    def new_job_id(self) -> str:
+        return uuid.uuid4().hex
+
+    def create(self, job_id: str, filename: str, path: str | Path) -> Job:
+        """Register a spooled upload as a queued job."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs (id, filename, path, bytes_total, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (job_id, filename, str(path), Path(path).stat().st_size, now, now),
+            )
+        return self.get(job_id)
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            row = self._conn.execute(f"SELECT {', '.join(_COLUMNS)} FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return Job(*row) if row else None
+
+    def claim_next(self) -> Optional[Job]:
+        """Atomically mark the oldest queued job as running (owned by this process)."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute("SELECT id FROM jobs WHERE status = 'queued' ORDER BY created_at LIMIT 1").fetchone()
+                if row is not None:
+                    self._conn.execute(
+                        "UPDATE jobs SET status = 'running', owner = ?, error = NULL, updated_at = ? WHERE id = ?",
+                        (_owner(), now, row[0]),
+                    )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return self.get(row[0]) if row else None
+
+    def requeue(self, job_id: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = 'queued', owner = NULL, updated_at = ? WHERE id = ? AND status = 'running'",
+                (time.time(), job_id),
+            )
+
+    def recover(self) -> int:
+        """Put back in the queue the running jobs whose owner process is gone."""
+        with self._lock:
+            rows = self._conn.execute("SELECT id, owner FROM jobs WHERE status = 'running'").fetchall()
+        lost = [job_id for job_id, owner in rows if not _owner_alive(owner)]
+        for job_id in lost:
+            self.requeue(job_id)
+        return len(lost)
+
+    def update_progress(self, job_id: str, *, bytes_scanned: int, findings: int) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET bytes_scanned = ?, findings = ?, updated_at = ? WHERE id = ? AND status = 'running'",
+                (bytes_scanned, findings, time.time(), job_id),
+            )
+
+    def finish(self, job_id: str, *, report_path: str | Path, bytes_scanned: int, rows_scanned: Optional[int], findings: int, score: int, level: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = 'done', report_path = ?, bytes_scanned = ?, rows_scanned = ?, findings = ?, "
+                "score = ?, level = ?, updated_at = ? WHERE id = ?",
+                (str(report_path), bytes_scanned, rows_scanned, findings, score, level, time.time(), job_id),
+            )
+
+    def fail(self, job_id: str, error: str) -> None:
+        with self._lock:
+            self._conn.execute("UPDATE jobs SET status = 'failed', error = ?, updated_at = ? WHERE id = ?", (error, time.time(), job_id))
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        out = {"queued": 0, "running": 0, "done": 0, "failed": 0}
+        out.update({status: n for status, n in rows})
+        return out
+
+
+# -------- Worker side (runs inside the scan pool) --------
+
+_STORES: Dict[str, JobStore] = {}
+
+
+def _store_for(root: str) -> JobStore:
+    if root not in _STORES:
+        _STORES[root] = JobStore(root)
+    return _STORES[root]
+
+
+def run_job(root: str, job_id: str, progress_seconds: float = 0.5) -> str:
+    """Scan a spooled upload, writing its NDJSON report next to it; returns the final status."""
+    from dataguardian.scan import scan_path
+
+    store = _store_for(root)
+    job = store.get(job_id)
+    if job is None:
+        return "missing"
+    settings = Settings()
+    budget = ScanBudget.for_scan(settings)
+    stop = threading.Event()
+
+    # cell characters stand in for file bytes until the scan is over
+    running_cap = max(0, job.bytes_total - 1)
+
+    def _report_progress() -> None:
+        while not stop.wait(progress_seconds):
+            store.update_progress(job_id, bytes_scanned=min(budget.bytes, running_cap), findings=budget.findings)
+
+    reporter = threading.Thread(target=_report_progress, daemon=True)
+    reporter.start()
+    try:
+        report = scan_path(job.path, settings=settings, budget=budget, detectors=_detectors())
+    except Exception as e:
+        store.fail(job_id, f"{type(e).__name__}: {e}")
+        return "failed"
+    finally:
+        stop.set()
+        reporter.join()
+    report.target = f"api:job:{job.filename}"
+
+    out = store.job_dir(job_id) / "report.ndjson"
+    tmp = out.with_suffix(".tmp")
+    with open(tmp, "w", encoding="utf-8") as fh:
+        for line in report.iter_ndjson():
+            fh.write(line + "\n")
+    os.replace(tmp, out)
+
+    if settings.findings_db:
+        from dataguardian.store import FindingsStore
+
+        findings_store = FindingsStore(settings.findings_db)
+        try:
+            findings_store.add_report(report)
+        finally:
+            findings_store.close()
+
+    bytes_scanned = min(budget.bytes, job.bytes_total) if budget.reasons else job.bytes_total
+    store.finish(
+        job_id,
+        report_path=out,
+        bytes_scanned=bytes_scanned,
+        rows_scanned=report.meta.get("rows_scanned"),
+        findings=len(report.findings),
+        score=report.summary.score,
+        level=report.summary.level,
+    )
+    # the report is what clients come back for; the spooled upload can go
+    Path(job.path).unlink(missing_ok=True)
+    return "done"
+
+
+def iter_report_json(path: str | Path) -> Iterator[str]:
+    """Re-emit an NDJSON report as one JSON document, chunk by chunk.
+
+    Key order differs from ``ScanReport.to_json`` (summary comes last, as in
+    the NDJSON), which JSON consumers do not care about.
+    """
+    first = True
+    for kind, rec in iter_report_records(path):
+        if kind == "header":
+            yield "{" + ", ".join(f"{json.dumps(k)}: {json.dumps(rec.get(k), ensure_ascii=False)}" for k in ("created_at", "target", "meta"))
+            yield ', "findings": ['
+        elif kind == "finding":
+            yield ("" if first else ", ") + json.dumps(rec, ensure_ascii=False)
+            first = False
+        elif kind == "summary":
+            yield '], "summary": ' + json.dumps(rec, ensure_ascii=False) + "}"
+
+
+# -------- API side --------
+
+
+class JobRunner:
+    """Feeds queued jobs to the scan pool, at most ``concurrency`` at a time."""
+
+    def __init__(self, store: JobStore, pool: ScanPool, *, concurrency: int) -> None:
+        self.store = store
+        self.pool = pool
+        self.concurrency = max(1, concurrency)
+        self._wake = asyncio.Event()
+        self._running: set = set()
+
+    def notify(self) -> None:
+        self._wake.set()
+
+    async def run(self) -> None:
+        self.store.recover()
+        while True:
+            while len(self._running) < self.concurrency:
+                job = self.store.claim_next()
+                if job is None:
+                    break
+                task = asyncio.ensure_future(self._execute(job))
+                self._running.add(task)
+                task.add_done_callback(self._running.discard)
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=1.0)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+
+    async def _execute(self, job: Job) -> None:
+        try:
+            await self.pool.submit(run_job, str(self.store.root), job.id)
+        except (PoolSaturated, PoolUnavailable):
+            # the pool is busy with synchronous scans (or restarting): try again later
+            self.store.requeue(job.id)
+            await asyncio.sleep(1.0)
+        except Exception as e:
+            self.store.fail(job.id, f"{type(e).__name__}: {e}")
+        self.notify()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"running": len(self._running), **self.store.counts()}
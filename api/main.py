@@ -1,41 +1,388 @@
 from __future__ import annotations
 
-from fastapi import FastAPI, File, UploadFile, HTTPException
-from fastapi.responses import HTMLResponse, JSONResponse
+import asyncio
+import hashlib
+import json
+import shutil
+import tempfile
+import time
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, List, Optional, Tuple
+
+from fastapi import FastAPI, File, Request, UploadFile, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, JSONResponse, PlainTextResponse, Response, StreamingResponse
 import pandas as pd
+from starlette.background import BackgroundTask
+
+from dataguardian.config import Settings
+from dataguardian.merge import read_report
+from dataguardian.metrics import API_SECONDS, REGISTRY
+from dataguardian.redact import resolve_mode
+from dataguardian.reporting import ScanReport, iter_html, now_iso
+from dataguardian.store import FindingsStore
+
+from api.cache import ReportCache, is_sha256
+from api.jobs import JobRunner, JobStore, iter_report_json, safe_filename
+from api.pool import PoolSaturated, PoolUnavailable, ScanPool, redact_file_job, scan_file_job, scan_text_job, scan_texts_job
+
+settings = Settings()
+pool = ScanPool.from_settings(settings)
+_store: Optional[FindingsStore] = None
+jobs = JobStore(settings.api_jobs_dir)
+# jobs use at most half the workers so synchronous scans are not starved
+runner = JobRunner(jobs, pool, concurrency=max(1, pool.workers // 2))
+cache = ReportCache.from_settings(settings)
+
+REGISTRY.gauge("dataguardian_pool_in_flight", "Scans admitted to the pool (running + waiting).", lambda: pool.in_flight)
+REGISTRY.gauge("dataguardian_pool_queue_depth", "Admitted scans waiting for a free worker.", lambda: pool.queue_depth)
+REGISTRY.gauge("dataguardian_jobs_running", "Async jobs being scanned.", lambda: jobs.counts()["running"])
+REGISTRY.gauge("dataguardian_jobs_queued", "Async jobs waiting to be scanned.", lambda: jobs.counts()["queued"])
+
+SPOOL_CHUNK = 1024 * 1024
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    task = asyncio.create_task(runner.run())
+    yield
+    task.cancel()
+    pool.shutdown()
+
+
+app = FastAPI(title="DataGuardian API", version="1.0.0", lifespan=lifespan)
+
+
+def _get_store() -> Optional[FindingsStore]:
+    global _store
+    if _store is None and settings.findings_db:
+        _store = FindingsStore(settings.findings_db)
+    return _store
+
+
+async def _index(report: ScanReport) -> None:
+    store = _get_store()
+    if store is not None:
+        await run_in_threadpool(store.add_report, report)
+
+
+async def _run(fn: Callable[..., Any], *args: Any) -> Any:
+    """Run a scan job in the pool, mapping saturation to 429 and pool failure to 503."""
+    started = time.perf_counter()
+    try:
+        result = await pool.submit(fn, *args)
+        API_SECONDS.observe(time.perf_counter() - started, endpoint=fn.__name__.removesuffix("_job"))
+        return result
+    except PoolSaturated as e:
+        raise HTTPException(status_code=429, detail=f"scanner busy: {e}", headers={"Retry-After": "1"})
+    except PoolUnavailable as e:
+        raise HTTPException(status_code=503, detail=f"scanner unavailable: {e}", headers={"Retry-After": "5"})
+
+
+# content types whose files carry no extension still need one for parsing
+_SUFFIX_BY_TYPE = {"text/csv": ".csv", "application/json": ".json", "text/plain": ".txt"}
+
+
+def _upload_name(file: UploadFile) -> str:
+    name = safe_filename(file.filename or "uploaded")
+    if not Path(name).suffix and file.content_type in _SUFFIX_BY_TYPE:
+        name += _SUFFIX_BY_TYPE[file.content_type]
+    return name
+
+
+async def _spool(file: UploadFile, dest: Path) -> Tuple[int, str]:
+    """Copy an upload to ``dest`` in chunks; returns (bytes written, SHA-256 hex).
+
+    At most one chunk is held in memory. Past ``api_max_upload_bytes`` the
+    partial file is removed and the request fails with 413.
+    """
+    written = 0
+    digest = hashlib.sha256()
+    limit = settings.api_max_upload_bytes
+    with open(dest, "wb") as fh:
+        while True:
+            chunk = await file.read(SPOOL_CHUNK)
+            if not chunk:
+                break
+            written += len(chunk)
+            if limit and written > limit:
+                break
+            digest.update(chunk)
+            await run_in_threadpool(fh.write, chunk)
+    if limit and written > limit:
+        dest.unlink(missing_ok=True)
+        raise HTTPException(status_code=413, detail=f"upload larger than {limit} bytes")
+    return written, digest.hexdigest()
+
+
+async def _read_body(chunks: AsyncIterator[bytes], limit: int) -> bytes:
+    """Collect a request body, failing with 413 as soon as it passes ``limit`` bytes (0 = no cap)."""
+    body = bytearray()
+    async for chunk in chunks:
+        body += chunk
+        if limit and len(body) > limit:
+            raise HTTPException(status_code=413, detail=f"body larger than {limit} bytes")
+    return bytes(body)
+
+
+def _etag(content_sha256: str, format: str, patterns_version: Optional[str] = None) -> str:
+    return f'"{cache.key(content_sha256, patterns_version)}{"-html" if format == "html" else ""}"'
+
+
+def _not_modified(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match", "")
+    return header.strip() == "*" or etag in [t.strip() for t in header.split(",")]
+
+
+def _cacheable(report: ScanReport) -> bytes:
+    """Report JSON without ``created_at``/``target``: those belong to each response
+    (a hit must not show another client's filename or the first scan's time)."""
+    body = report.to_dict()
+    body.pop("created_at", None)
+    body.pop("target", None)
+    return json.dumps(body, ensure_ascii=False).encode("utf-8")
+
+
+def _stamp(data: bytes, target: str, created_at: Optional[str] = None) -> bytes:
+    head = json.dumps({"created_at": created_at or now_iso(), "target": target}, ensure_ascii=False).encode("utf-8")
+    return head[:-1] + b", " + data[1:]
 
-from core.file_processor import process_file
-from dataguardian.scan import scan_dataframe, scan_text
-from dataguardian.reporting import to_html
 
-app = FastAPI(title="DataGuardian API", version="1.0.0")
+def _cached_report(data: bytes, target: str, created_at: str) -> ScanReport:
+    """A cached report re-stamped for this request, e.g. to index it under a new target."""
+    return ScanReport.from_dict(json.loads(_stamp(data, target, created_at)))
+
+
+def _cached_response(data: bytes, etag: str, format: str, hit: bool, target: str, created_at: Optional[str] = None) -> Response:
+    headers = {"ETag": etag, "X-Cache": "hit" if hit else "miss"}
+    data = _stamp(data, target, created_at)
+    if format == "html":
+        return StreamingResponse(iter_html(ScanReport.from_dict(json.loads(data))), media_type="text/html", headers=headers)
+    return Response(content=data, media_type="application/json", headers=headers)
 
 
 @app.get("/health")
 def health():
-    return {"status": "ok"}
+    return {"status": "ok", "pool": pool.stats(), "jobs": runner.stats(), "cache": cache.stats()}
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    """Prometheus text exposition of the scanner's internal counters."""
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
 
 
 @app.post("/scan/text")
-def scan_text_endpoint(payload: dict):
+async def scan_text_endpoint(payload: dict):
     text = payload.get("text", "")
     if not isinstance(text, str) or not text.strip():
         raise HTTPException(status_code=400, detail="payload must contain non-empty 'text'")
-    report = scan_text(text, target="api:text")
+    report = await _run(scan_text_job, text, "api:text")
+    await _index(report)
     return JSONResponse(report.to_dict())
 
 
+def _parse_texts(body: bytes, content_type: str) -> List[str]:
+    """Texts from a JSON array (of strings or {"text": ...}), {"texts": [...]}, or NDJSON."""
+    def _text(item: Any) -> str:
+        if isinstance(item, dict):
+            item = item.get("text", "")
+        if not isinstance(item, str):
+            raise ValueError("each item must be a string or an object with a 'text' string")
+        return item
+
+    if "ndjson" in content_type or "jsonl" in content_type:
+        return [_text(json.loads(line)) for line in body.splitlines() if line.strip()]
+    data = json.loads(body or b"null")
+    if isinstance(data, dict):
+        data = data.get("texts")
+    if not isinstance(data, list):
+        raise ValueError("body must be a JSON array, {\"texts\": [...]}, or NDJSON")
+    return [_text(item) for item in data]
+
+
+@app.post("/scan/texts")
+async def scan_texts_endpoint(request: Request):
+    """Batch scan: compact per-item results (only items with matches) plus one summary."""
+    try:
+        body = await _read_body(request.stream(), settings.api_max_upload_bytes)
+        texts = _parse_texts(body, request.headers.get("content-type", ""))
+    except ValueError as e:  # includes JSONDecodeError
+        raise HTTPException(status_code=400, detail=str(e))
+    return JSONResponse(await _run(scan_texts_job, texts))
+
+
 @app.post("/scan/file")
-async def scan_file(file: UploadFile = File(...), format: str = "json"):
+async def scan_file(request: Request, file: UploadFile = File(...), format: str = "json"):
+    """Scan an upload; identical bytes under identical settings are served from the cache."""
+    spool_dir = Path(tempfile.mkdtemp(prefix="dg-upload-", dir=settings.api_spool_dir or None))
     try:
-        df = process_file(file)
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=f"could not parse file: {e}")
+        dest = spool_dir / _upload_name(file)
+        target = f"api:file:{file.filename}"
+        size, sha = await _spool(file, dest)
+        if size == 0:
+            raise HTTPException(status_code=400, detail="empty or invalid file")
+        etag = _etag(sha, format)
+        data = cache.get(sha) if cache.enabled else None
+        if data is not None:
+            # a rescan under another name is still a scan of that target: index it
+            created_at = now_iso()
+            if settings.findings_db:
+                await _index(await run_in_threadpool(_cached_report, data, target, created_at))
+            if _not_modified(request, etag):
+                return Response(status_code=304, headers={"ETag": etag})
+            return _cached_response(data, etag, format, hit=True, target=target, created_at=created_at)
+        try:
+            report = await _run(scan_file_job, str(dest), target)
+        except HTTPException:
+            raise
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=f"could not parse file: {e}")
+    finally:
+        shutil.rmtree(spool_dir, ignore_errors=True)
 
-    if df is None or df.empty:
+    if report is None:
         raise HTTPException(status_code=400, detail="empty or invalid file")
 
-    report = scan_dataframe(df, target=f"api:file:{file.filename}")
+    await _index(report)
+    data = _cacheable(report)
+    # key by the pack the worker actually scanned with, not this process's current one
+    patterns = report.meta.get("patterns")
+    etag = _etag(sha, format, patterns)
+    if cache.enabled and patterns:
+        await run_in_threadpool(cache.put, sha, data, patterns_version=patterns)
+    return _cached_response(data, etag, format, hit=False, target=target, created_at=report.created_at)
+
+
+@app.get("/scan/cache/{content_sha256}")
+def scan_cache_lookup(content_sha256: str, request: Request, format: str = "json"):
+    """Hash-only pre-check: the cached report for these bytes, or 404 (then upload)."""
+    sha = content_sha256.lower()
+    if not is_sha256(sha):
+        raise HTTPException(status_code=400, detail="expected a hex SHA-256 of the file bytes")
+    data = cache.get(sha) if cache.enabled else None
+    if data is None:
+        raise HTTPException(status_code=404, detail="not cached; upload the file to /scan/file")
+    etag = _etag(sha, format)
+    if _not_modified(request, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    return _cached_response(data, etag, format, hit=True, target=f"api:cache:{sha}")
+
+
+@app.post("/redact")
+async def redact(file: UploadFile = File(...), mode: Optional[str] = None):
+    """Sanitized copy of an upload (same format, detected values masked or hashed)."""
+    try:
+        mode = resolve_mode(mode, settings)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    spool_dir = Path(tempfile.mkdtemp(prefix="dg-redact-", dir=settings.api_spool_dir or None))
+    try:
+        name = _upload_name(file)
+        src, dst = spool_dir / name, spool_dir / f"redacted-{name}"
+        size, _ = await _spool(file, src)
+        if size == 0:
+            raise HTTPException(status_code=400, detail="empty file")
+        stats = await _run(redact_file_job, str(src), str(dst), mode)
+        src.unlink(missing_ok=True)
+    except BaseException:
+        shutil.rmtree(spool_dir, ignore_errors=True)
+        raise
+
+    replaced = ",".join(f"{t}={n}" for t, n in sorted(stats["replaced"].items()))
+    return FileResponse(
+        dst,
+        filename=f"redacted-{name}",
+        media_type=file.content_type or "application/octet-stream",
+        headers={"X-Redacted": replaced or "none"},
+        # the copy is streamed from disk, then the spool dir goes
+        background=BackgroundTask(shutil.rmtree, spool_dir, True),
+    )
+
+
+@app.post("/jobs", status_code=202)
+async def create_job(file: UploadFile = File(...)):
+    """Spool the upload to disk and queue it; poll ``GET /jobs/{id}`` for progress."""
+    job_id = jobs.new_job_id()
+    name = _upload_name(file)
+    job_dir = jobs.job_dir(job_id)
+    job_dir.mkdir(parents=True, exist_ok=True)
+    dest = job_dir / name
+    try:
+        size, _ = await _spool(file, dest)
+        if size == 0:
+            raise HTTPException(status_code=400, detail="empty file")
+    except HTTPException:
+        shutil.rmtree(job_dir, ignore_errors=True)
+        raise
+    job = jobs.create(job_id, name, dest)
+    runner.notify()
+    return {**job.to_dict(), "status_url": f"/jobs/{job_id}", "report_url": f"/jobs/{job_id}/report"}
+
+
+def _get_job(job_id: str):
+    job = jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="unknown job")
+    return job
+
+
+@app.get("/jobs/{job_id}")
+def get_job(job_id: str):
+    return _get_job(job_id).to_dict()
+
+
+@app.get("/jobs/{job_id}/report")
+def get_job_report(job_id: str, format: str = "json"):
+    job = _get_job(job_id)
+    if job.status == "failed":
+        raise HTTPException(status_code=409, detail=f"job failed: {job.error}")
+    if job.status != "done" or not job.report_path:
+        raise HTTPException(status_code=409, detail=f"job is {job.status}", headers={"Retry-After": "2"})
+    if format == "ndjson":
+        return FileResponse(job.report_path, media_type="application/x-ndjson")
     if format == "html":
-        return HTMLResponse(to_html(report))
-    return JSONResponse(report.to_dict())
+        return StreamingResponse(iter_html(read_report(job.report_path)), media_type="text/html")
+    return StreamingResponse(iter_report_json(job.report_path), media_type="application/json")
+
+
+def _check_window(days: Any, limit: Any) -> None:
+    """400 unless ``days`` is None or a positive number and ``limit`` an int in 1..10000
+    (SQLite reads ``LIMIT -1`` as no limit)."""
+    if days is not None and (isinstance(days, bool) or not isinstance(days, (int, float)) or days <= 0):
+        raise HTTPException(status_code=400, detail="'days' must be a positive number")
+    if isinstance(limit, bool) or not isinstance(limit, int) or not 1 <= limit <= 10_000:
+        raise HTTPException(status_code=400, detail="'limit' must be an integer between 1 and 10000")
+
+
+@app.post("/findings/lookup")
+def findings_lookup(payload: dict):
+    """Where has a raw value appeared? The value is hashed here and never stored."""
+    store = _get_store()
+    if store is None:
+        raise HTTPException(status_code=503, detail="findings store disabled (set DATAGUARDIAN_FINDINGS_DB)")
+    value, typ = payload.get("value"), payload.get("type")
+    if not isinstance(value, str) or not value or not isinstance(typ, str) or not typ:
+        raise HTTPException(status_code=400, detail="payload must contain non-empty 'value' and 'type'")
+    days, limit = payload.get("days"), payload.get("limit", 100)
+    _check_window(days, limit)
+    rows = store.find_value(value, typ, days=days, limit=limit)
+    return {"count": len(rows), "findings": rows}
+
+
+@app.get("/findings")
+def findings_query(
+    value_hash: Optional[str] = None,
+    type: Optional[str] = None,
+    target: Optional[str] = None,
+    days: Optional[float] = None,
+    limit: int = 100,
+):
+    store = _get_store()
+    if store is None:
+        raise HTTPException(status_code=503, detail="findings store disabled (set DATAGUARDIAN_FINDINGS_DB)")
+    _check_window(days, limit)
+    since = time.time() - days * 86400 if days is not None else None
+    rows = store.query(value_hash=value_hash, type=type, target=target, since=since, limit=limit)
+    return {"count": len(rows), "findings": rows}
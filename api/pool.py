@@ -0,0 +1,143 @@
+"""Bounded worker pool for the API: keeps CPU-bound scans off the event loop.
+
+Parsing and detection run in a process pool (or a thread pool, see
+``Settings.api_pool``). Detectors are built once per worker. The pool admits
+at most ``workers + max_queue`` jobs; past that, ``submit`` raises
+``PoolSaturated`` right away so the API can answer 429 instead of queueing
+unboundedly.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from dataguardian.config import Settings
+from dataguardian.detectors.base import Detector
+from dataguardian.metrics import REGISTRY
+from dataguardian.redact import redact_file
+from dataguardian.reporting import ScanReport
+from dataguardian.scan import default_detectors, scan_path, scan_text, scan_texts
+
+
+class PoolSaturated(Exception):
+    """Every worker is busy and the wait queue is full."""
+
+
+class PoolUnavailable(Exception):
+    """The pool is shut down or its worker processes died."""
+
+
+# -------- Worker side (runs inside the pool) --------
+
+_DETECTORS: Optional[List[Detector]] = None
+
+
+def _detectors() -> List[Detector]:
+    global _DETECTORS
+    if _DETECTORS is None:
+        _DETECTORS = default_detectors(Settings())
+    return _DETECTORS
+
+
+def _warm_up() -> None:
+    _detectors()
+
+
+def _with_metrics(fn: Callable[..., Any], *args: Any) -> Tuple[Any, Dict[str, Any]]:
+    """Run ``fn`` in a worker process and ship its metric deltas back with the result."""
+    return fn(*args), REGISTRY.drain()
+
+
+def scan_file_job(path: str, target: str) -> Optional[ScanReport]:
+    """Scan a spooled upload; None if it parsed to nothing."""
+    report = scan_path(path, detectors=_detectors())
+    meta = report.meta
+    if meta.get("mode") != "raw_text" and not meta.get("rows_scanned") and not meta.get("budget", {}).get("truncated"):
+        return None
+    report.target = target
+    return report
+
+
+def scan_text_job(text: str, target: str) -> ScanReport:
+    return scan_text(text, target=target, detectors=_detectors())
+
+
+def scan_texts_job(texts: List[str]) -> Dict[str, Any]:
+    return scan_texts(texts, detectors=_detectors()).to_dict()
+
+
+def redact_file_job(src: str, dst: str, mode: str) -> Dict[str, Any]:
+    return redact_file(src, dst, mode=mode).to_dict()
+
+
+# -------- API side --------
+
+
+class ScanPool:
+    def __init__(self, *, workers: int, max_queue: int, kind: str = "process") -> None:
+        self.workers = max(1, workers)
+        self.max_queue = max(0, max_queue)
+        self.kind = kind
+        self._in_flight = 0
+        self._executor: Optional[Executor] = None
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> "ScanPool":
+        return cls(workers=settings.api_workers, max_queue=settings.api_max_queue, kind=settings.api_pool)
+
+    @property
+    def capacity(self) -> int:
+        return self.workers + self.max_queue
+
+    def _ensure_executor(self) -> Executor:
+        if self._executor is None:
+            if self.kind == "thread":
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="dg-scan", initializer=_warm_up)
+            else:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_warm_up)
+        return self._executor
+
+    async def submit(self, fn: Callable[..., Any], *args: Any) -> Any:
+        # only touched from the event loop thread, so a plain counter is enough
+        if self._in_flight >= self.capacity:
+            raise PoolSaturated(f"{self._in_flight} scans in flight (capacity {self.capacity})")
+        self._in_flight += 1
+        try:
+            executor = self._ensure_executor()
+            loop = asyncio.get_running_loop()
+            if self.kind == "thread":
+                # same process: metrics are recorded straight into REGISTRY
+                return await loop.run_in_executor(executor, fn, *args)
+            result, delta = await loop.run_in_executor(executor, _with_metrics, fn, *args)
+            REGISTRY.merge(delta)
+            return result
+        except BrokenProcessPool as e:
+            # a worker died (OOM-killed, segfault): start a fresh pool for the next request
+            self._executor = None
+            raise PoolUnavailable(str(e)) from e
+        except RuntimeError as e:
+            if "shutdown" in str(e):
+                raise PoolUnavailable(str(e)) from e
+            raise
+        finally:
+            self._in_flight -= 1
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def queue_depth(self) -> int:
+        """Admitted scans waiting for a free worker."""
+        return max(0, self._in_flight - self.workers)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"kind": self.kind, "workers": self.workers, "capacity": self.capacity, "in_flight": self._in_flight, "queued": self.queue_depth}
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
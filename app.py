@@ -1,17 +1,88 @@
+import hashlib
+from dataclasses import asdict
+
 import streamlit as st
 import pandas as pd
 import plotly.express as px
 
 from core.file_processor import process_file
 from dataguardian.config import Settings
-from dataguardian.scan import scan_dataframe
-from dataguardian.reporting import to_html
+from dataguardian.scan import default_detectors, scan_dataframe
+from dataguardian.reporting import ScanReport, to_html
 from utils.encryption import DataEncryptor
 
 st.set_page_config(page_title="DataGuardian", layout="wide")
 st.title("🔍 DataGuardian - Monitor de Segurança de Dados")
 
 settings = Settings()
+# cache key for everything that depends on the settings
+SETTINGS_KEY = hashlib.sha256(repr(sorted(asdict(settings).items())).encode()).hexdigest()[:16]
+
+
+# --- Cache (reruns on widget interaction must not re-parse/re-scan) ----------
+
+
+@st.cache_resource
+def get_detectors(settings_key: str, _settings: Settings):
+    return default_detectors(_settings)
+
+
+@st.cache_resource
+def get_encryptor(allow_file_key: bool) -> DataEncryptor:
+    return DataEncryptor(use_env_key=True, allow_file_key=allow_file_key)
+
+
+def upload_hash(uploaded) -> str:
+    """SHA-256 of the upload, computed once per uploaded file (kept in session).
+
+    Keyed on the uploader's per-upload id (``id`` in Streamlit 1.24, ``file_id``
+    in later releases): a re-upload of an edited file with the same name and
+    size gets a new id. Without an id the bytes are hashed every rerun.
+    """
+    upload_id = getattr(uploaded, "file_id", None) or getattr(uploaded, "id", None)
+    if upload_id is None:
+        return hashlib.sha256(uploaded.getbuffer()).hexdigest()
+    key = f"upload_hash:{upload_id}"
+    if key not in st.session_state:
+        st.session_state[key] = hashlib.sha256(uploaded.getbuffer()).hexdigest()
+    return st.session_state[key]
+
+
+@st.cache_data(max_entries=4, show_spinner="Lendo arquivo...")
+def load_dataframe(content_hash: str, _uploaded) -> pd.DataFrame:
+    _uploaded.seek(0)
+    return process_file(_uploaded)
+
+
+@st.cache_data(max_entries=8, show_spinner="Analisando...")
+def scan_cached(content_hash: str, settings_key: str, name: str, _df: pd.DataFrame) -> ScanReport:
+    return scan_dataframe(_df, target=name, settings=settings, detectors=get_detectors(settings_key, settings))
+
+
+@st.cache_data(max_entries=8)
+def findings_frame(content_hash: str, settings_key: str, _report: ScanReport) -> pd.DataFrame:
+    rows = [
+        {
+            "Local": f.location,
+            "Valor (mascarado)": f.masked_value,
+            "Tipos": ", ".join(sorted({m.type for m in f.matches})),
+            "Detectores": ", ".join(sorted({m.detector for m in f.matches})),
+        }
+        for f in _report.findings
+    ]
+    return pd.DataFrame(rows)
+
+
+@st.cache_data(max_entries=8)
+def type_histogram_frame(content_hash: str, settings_key: str, _findings_df: pd.DataFrame) -> pd.DataFrame:
+    exploded = _findings_df.assign(Tipos=_findings_df["Tipos"].str.split(", ")).explode("Tipos")
+    return exploded[exploded["Tipos"].fillna("").ne("")]
+
+
+@st.cache_data(max_entries=8)
+def export_payloads(content_hash: str, settings_key: str, _report: ScanReport):
+    return _report.to_json(), to_html(_report)
+
 
 uploaded_file = st.file_uploader(
     "Carregue seu arquivo de dados",
@@ -22,7 +93,8 @@ if uploaded_file:
     st.write("✅ Arquivo carregado:", uploaded_file.name)
 
     try:
-        df = process_file(uploaded_file)
+        content_hash = upload_hash(uploaded_file)
+        df = load_dataframe(content_hash, uploaded_file)
         if df.empty:
             st.warning("❌ Arquivo carregado está vazio ou inválido.")
             st.stop()
@@ -31,7 +103,7 @@ if uploaded_file:
         with st.expander("📂 Prévia dos dados"):
             st.dataframe(df.head(settings.max_rows_preview) if show_raw else df.head(settings.max_rows_preview))
 
-        report = scan_dataframe(df, target=uploaded_file.name, settings=settings)
+        report = scan_cached(content_hash, SETTINGS_KEY, uploaded_file.name, df)
 
         st.subheader("🧭 Risco (resumo)")
         c1, c2, c3 = st.columns(3)
@@ -43,25 +115,14 @@ if uploaded_file:
             st.info("✅ Nenhum dado sensível foi encontrado na amostra analisada.")
             st.stop()
 
-        # Flatten findings for UI
-        rows = []
-        for f in report.findings:
-            rows.append(
-                {
-                    "Local": f.location,
-                    "Valor (mascarado)": f.masked_value,
-                    "Tipos": ", ".join(sorted({m.type for m in f.matches})),
-                    "Detectores": ", ".join(sorted({m.detector for m in f.matches})),
-                }
-            )
-        findings_df = pd.DataFrame(rows)
+        # Flatten findings for UI (built once per upload+settings, then cached)
+        findings_df = findings_frame(content_hash, SETTINGS_KEY, report)
 
         st.subheader("📌 Achados (valores mascarados)")
         st.dataframe(findings_df)
 
         st.subheader("📊 Distribuição de tipos")
-        exploded = findings_df.assign(Tipos=findings_df["Tipos"].str.split(", ")).explode("Tipos")
-        exploded = exploded[exploded["Tipos"].fillna("").ne("")]
+        exploded = type_histogram_frame(content_hash, SETTINGS_KEY, findings_df)
         if not exploded.empty:
             fig = px.histogram(exploded, x="Tipos")
             st.plotly_chart(fig, use_container_width=True)
@@ -69,16 +130,17 @@ if uploaded_file:
         st.divider()
 
         st.subheader("🧾 Exportar relatório")
+        json_payload, html_payload = export_payloads(content_hash, SETTINGS_KEY, report)
         col1, col2 = st.columns(2)
         col1.download_button(
             "⬇️ Baixar JSON",
-            data=report.to_json(),
+            data=json_payload,
             file_name=f"dataguardian_{uploaded_file.name}.json",
             mime="application/json",
         )
         col2.download_button(
             "⬇️ Baixar HTML",
-            data=to_html(report),
+            data=html_payload,
             file_name=f"dataguardian_{uploaded_file.name}.html",
             mime="text/html",
         )
@@ -90,7 +152,7 @@ if uploaded_file:
         allow_file_key = st.checkbox("Permitir chave em arquivo local (NÃO recomendado)", value=False)
 
         try:
-            encryptor = DataEncryptor(use_env_key=True, allow_file_key=allow_file_key)
+            encryptor = get_encryptor(allow_file_key)
         except Exception as e:
             st.error(f"Erro ao inicializar criptografia: {e}")
             st.stop()
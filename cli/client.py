@@ -0,0 +1,82 @@
+"""Thin client for the warm scanner daemon (``python -m cli.main serve``).
+
+Standard library only, so it starts in milliseconds (no pandas, no
+detectors):
+
+    python -m cli.client scan data/clientes.csv --out reports/clientes.json
+
+Exits 0 on success, 1 if the scan failed, 2 if no daemon is listening.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import socket
+import sys
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+
+def default_socket_path() -> str:
+    """Same as ``dataguardian.daemon.default_socket_path`` (not imported: it pulls in pandas)."""
+    runtime = os.getenv("XDG_RUNTIME_DIR")
+    if runtime:
+        return os.path.join(runtime, "dataguardian", "scanner.sock")
+    return f"/tmp/dataguardian-{os.getuid()}.sock"
+
+
+def request(socket_path: str, payload: Dict[str, Any], *, timeout: Optional[float] = None) -> Tuple[Dict[str, Any], bytes]:
+    """Send one request; returns the response header and report bytes."""
+    # the default may live in /tmp: only talk to a daemon run by this user
+    if os.stat(socket_path).st_uid != os.getuid():
+        raise PermissionError(f"{socket_path} is owned by another user")
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(socket_path)
+        sock.sendall(json.dumps(payload).encode("utf-8") + b"\n")
+        reader = sock.makefile("rb")
+        header = json.loads(reader.readline() or b'{"ok": false, "error": "connection closed"}')
+        body = reader.read(header.get("size", 0)) if header.get("ok") else b""
+    return header, body
+
+
+def main(argv: Optional[list] = None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m cli.client", description="Scan through a running DataGuardian daemon.")
+    sub = ap.add_subparsers(dest="command", required=True)
+    scan = sub.add_parser("scan", help="Scan PATH and write the report")
+    scan.add_argument("path", type=Path)
+    scan.add_argument("--out", "-o", type=Path, help="Report path (.json or .ndjson/.jsonl); default: stdout")
+    scan.add_argument("--shard", help="Only scan shard i of N ('i/N', 0-based), by path hash")
+    scan.add_argument("--socket", default=os.getenv("DATAGUARDIAN_DAEMON_SOCKET") or default_socket_path())
+    scan.add_argument("--timeout", type=float, default=None, help="Seconds to wait for the report")
+    args = ap.parse_args(argv)
+
+    out = args.out
+    fmt = "ndjson" if out is not None and out.suffix.lower() in (".ndjson", ".jsonl") else "json"
+    try:
+        header, body = request(
+            args.socket,
+            {"path": str(args.path.resolve()), "format": fmt, "shard": args.shard},
+            timeout=args.timeout,
+        )
+    except (FileNotFoundError, ConnectionRefusedError, PermissionError) as e:
+        print(f"no scanner daemon on {args.socket} ({e}); start one with: python -m cli.main serve", file=sys.stderr)
+        return 2
+
+    if not header.get("ok"):
+        print(f"scan failed: {header.get('error')}", file=sys.stderr)
+        return 1
+    if out is None:
+        sys.stdout.buffer.write(body)
+        return 0
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_bytes(body)
+    print(f"✅ {fmt.upper()} report written to: {out}")
+    print(f"Risk: {header['level']} (score={header['score']})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,12 +1,22 @@
 from __future__ import annotations
 
 from pathlib import Path
+from typing import List, Optional
 import sys
 
 import typer
 
+from dataguardian.config import Settings
+from dataguardian.binreport import BINARY_SUFFIXES
+from dataguardian.merge import NDJSON_SUFFIXES, merge_reports, read_report
+from dataguardian.metrics import REGISTRY
+from dataguardian.redact import redact_file, resolve_mode
 from dataguardian.scan import scan_path
-from dataguardian.reporting import to_html
+from dataguardian.reporting import write_html
+from dataguardian.sharding import parse_shard
+from dataguardian.store import FindingsStore
+from dataguardian.tail import tail_path
+from dataguardian.workqueue import run_worker, scan_path_distributed
 
 app = typer.Typer(add_completion=False, help="DataGuardian - scan files/folders for sensitive data (DLP-lite).")
 
@@ -14,18 +24,172 @@ app = typer.Typer(add_completion=False, help="DataGuardian - scan files/folders
 @app.command()
 def scan(
     path: Path = typer.Argument(..., help="File or folder to scan"),
-    out: Path = typer.Option(Path("reports/report.json"), "--out", "-o", help="Output JSON report path"),
+    out: Path = typer.Option(Path("reports/report.json"), "--out", "-o", help="Output report path (.json, .ndjson/.jsonl for NDJSON, .dgr for binary)"),
     html: bool = typer.Option(True, help="Also write an HTML report next to JSON"),
+    shard: Optional[str] = typer.Option(None, "--shard", help="Only scan shard i of N ('i/N', 0-based), by path hash"),
+    metrics: bool = typer.Option(False, "--metrics", help="Print scanner metrics (latency, bytes, detector time, cache) at the end"),
 ):
     """Scan PATH and export a report."""
-    report = scan_path(path)
+    try:
+        shard_spec = parse_shard(shard) if shard else None
+    except ValueError as e:
+        raise typer.BadParameter(str(e), param_hint="--shard")
+
+    report = scan_path(path, shard=shard_spec)
+    _write_report(report, out, html)
+    if metrics:
+        _print_metrics()
+
+
+@app.command()
+def tail(
+    path: Path = typer.Argument(..., help="Log/JSONL file, or folder of them"),
+    state: Path = typer.Option(Path("reports/tail_state.json"), "--state", help="Checkpoint file (offset/inode per file)"),
+    out: Path = typer.Option(Path("reports/tail.json"), "--out", "-o", help="Output report path (.json, .ndjson/.jsonl for NDJSON, .dgr for binary)"),
+    html: bool = typer.Option(False, help="Also write an HTML report next to JSON"),
+    from_end: bool = typer.Option(False, "--from-end", help="Files seen for the first time: skip what is already there"),
+):
+    """Scan only what was appended to PATH since the last run (handles rotation/truncation)."""
+    report = tail_path(path, state, from_end=from_end)
+    _write_report(report, out, html)
+    typer.echo(f"{report.meta['new_bytes']} new bytes in {report.meta['files_scanned']} file(s)")
+
+
+@app.command()
+def redact(
+    src: Path = typer.Argument(..., help="File to sanitize (CSV, JSONL, SQL, TXT/log)"),
+    out: Path = typer.Option(..., "--out", "-o", help="Redacted copy"),
+    mode: Optional[str] = typer.Option(None, "--mode", help="mask | hash (default: DATAGUARDIAN_REDACT_MODE; hash needs DATAGUARDIAN_STORE_HASH_KEY)"),
+):
+    """Write a copy of SRC with every detected value masked or hashed, in one streaming pass."""
+    try:
+        mode = resolve_mode(mode, Settings())
+    except ValueError as e:
+        raise typer.BadParameter(str(e), param_hint="--mode")
+    try:
+        stats = redact_file(src, out, mode=mode)
+    except ValueError as e:
+        raise typer.BadParameter(str(e), param_hint="--out")
+    replaced = ", ".join(f"{t}={n}" for t, n in sorted(stats.replaced.items())) or "nothing"
+    typer.echo(f"✅ Redacted copy written to: {out} ({replaced}; {stats.to_dict()['mb_per_s']} MB/s)")
+
+
+@app.command()
+def coordinate(
+    path: Path = typer.Argument(..., help="File or folder to scan"),
+    db: Path = typer.Option(Path("reports/queue.db"), "--db", help="SQLite queue file (put it on storage shared with workers)"),
+    workers: int = typer.Option(2, "--workers", "-w", help="Local workers to start (0 = only remote workers)"),
+    out: Path = typer.Option(Path("reports/report.json"), "--out", "-o", help="Output report path (.json, .ndjson/.jsonl for NDJSON, .dgr for binary)"),
+    html: bool = typer.Option(True, help="Also write an HTML report next to JSON"),
+):
+    """Queue PATH as work items, wait for workers, and export one report."""
+    db.parent.mkdir(parents=True, exist_ok=True)
+    report = scan_path_distributed(path, db, workers=workers)
+    typer.echo(f"Items done: {report.meta['items_done']} • failed: {len(report.meta['items_failed'])}")
+    _write_report(report, out, html)
+
+
+@app.command()
+def worker(
+    db: Path = typer.Option(Path("reports/queue.db"), "--db", help="SQLite queue file shared with the coordinator"),
+    lease_seconds: float = typer.Option(60.0, help="Lease length; renewed by heartbeat while scanning"),
+    idle_exit: float = typer.Option(30.0, help="Exit after this many seconds with an empty queue"),
+):
+    """Lease and scan queued items until the queue stays empty."""
+    n = run_worker(db, lease_seconds=lease_seconds, idle_exit_seconds=idle_exit)
+    typer.echo(f"✅ Worker finished {n} items")
+
+
+@app.command()
+def serve(
+    socket: Optional[Path] = typer.Option(None, "--socket", help="Unix socket path (default: DATAGUARDIAN_DAEMON_SOCKET)"),
+    workers: Optional[int] = typer.Option(None, "--workers", "-w", help="Pre-forked scanner processes (default: DATAGUARDIAN_DAEMON_WORKERS)"),
+    max_requests: int = typer.Option(0, help="Recycle a worker after this many scans (0 = never)"),
+):
+    """Keep warm scanner processes on a Unix socket for `python -m cli.client scan`."""
+    from dataguardian.daemon import default_socket_path, serve as serve_daemon
+
+    settings = Settings()
+    socket = socket or Path(settings.daemon_socket or default_socket_path())
+    typer.echo(f"Scanner daemon listening on {socket} (Ctrl-C to stop)")
+    serve_daemon(socket, workers=workers or settings.daemon_workers, settings=settings, max_requests=max_requests)
+
+
+@app.command()
+def merge(
+    reports: List[Path] = typer.Argument(..., help="JSON/NDJSON/.dgr reports to combine (e.g. one per shard)"),
+    out: Path = typer.Option(Path("reports/merged.json"), "--out", "-o", help="Merged report path (.json, or .ndjson/.jsonl)"),
+):
+    """Merge many reports into one, re-scoring from the per-type counts."""
+    summary = merge_reports(reports, out)
+    typer.echo(f"✅ Merged {len(reports)} reports into: {out}")
+    typer.echo(f"Risk: {summary.level} (score={summary.score})")
+
+
+@app.command()
+def index(
+    reports: List[Path] = typer.Argument(..., help="JSON/NDJSON reports to add to the findings store"),
+    db: Optional[Path] = typer.Option(None, "--db", help="Findings store (default: DATAGUARDIAN_FINDINGS_DB)"),
+):
+    """Add existing reports to the indexed findings store (value hashes only)."""
+    store = _open_store(db)
+    for rp in reports:
+        store.add_report(read_report(rp))
+    store.close()
+    typer.echo(f"✅ Indexed {len(reports)} reports into: {store.db_path}")
+
+
+@app.command()
+def lookup(
+    value: str = typer.Argument(..., help="Raw value to look up (hashed locally, never stored)"),
+    type: str = typer.Option(..., "--type", "-t", help="Data type, e.g. CPF, EMAIL"),
+    days: Optional[float] = typer.Option(None, help="Only the last N days"),
+    limit: int = typer.Option(100, help="Max rows"),
+    db: Optional[Path] = typer.Option(None, "--db", help="Findings store (default: DATAGUARDIAN_FINDINGS_DB)"),
+):
+    """Where has VALUE appeared? Queries the findings store by value hash."""
+    store = _open_store(db)
+    rows = store.find_value(value, type, days=days, limit=limit)
+    store.close()
+    for r in rows:
+        typer.echo(f"{r['created_at']}  {r['target']}  {r['location']}  {r['masked_value']}")
+    typer.echo(f"{len(rows)} occurrence(s)")
+
+
+def _print_metrics() -> None:
+    typer.echo("Metrics:")
+    for line in REGISTRY.summary():
+        typer.echo(f"  {line}")
+
+
+def _open_store(db: Optional[Path]) -> FindingsStore:
+    path = db or Settings().findings_db
+    if not path:
+        raise typer.BadParameter("no findings store: pass --db or set DATAGUARDIAN_FINDINGS_DB", param_hint="--db")
+    return FindingsStore(path)
+
+
+def _write_report(report, out: Path, html: bool) -> None:
+    settings = Settings()
+    if settings.findings_db:
+        store = FindingsStore(settings.findings_db)
+        store.add_report(report)
+        store.close()
+
     out.parent.mkdir(parents=True, exist_ok=True)
-    out.write_text(report.to_json(), encoding="utf-8")
-    typer.echo(f"✅ JSON report written to: {out}")
+    if out.suffix.lower() in NDJSON_SUFFIXES:
+        out.write_text(report.to_ndjson(), encoding="utf-8")
+        typer.echo(f"✅ NDJSON report written to: {out}")
+    elif out.suffix.lower() in BINARY_SUFFIXES:
+        report.to_binary(out)
+        typer.echo(f"✅ Binary report written to: {out}")
+    else:
+        out.write_text(report.to_json(), encoding="utf-8")
+        typer.echo(f"✅ JSON report written to: {out}")
 
     if html:
         html_path = out.with_suffix(".html")
-        html_path.write_text(to_html(report), encoding="utf-8")
+        write_html(report, html_path)
         typer.echo(f"✅ HTML report written to: {html_path}")
 
     typer.echo(f"Risk: {report.summary.level} (score={report.summary.score})")
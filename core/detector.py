@@ -1,10 +1,10 @@
 import re
-import json
-import os
 from typing import Dict, List, Tuple, Any, Optional
 
 import spacy
 
+from dataguardian.patterns import PatternPack, get_pack
+
 # Presidio é opcional: o app não deve quebrar se não estiver instalado
 try:
     from presidio_analyzer import AnalyzerEngine, RecognizerRegistry
@@ -26,8 +26,8 @@ except Exception:
 
 class SensitiveDataDetector:
     def __init__(self) -> None:
-        # Carrega padrões regex
-        self.patterns: Dict[str, str] = self._load_patterns()
+        # Padrões regex: pacote compilado compartilhado com o RegexDetector (recarregado se o arquivo mudar)
+        self.pack: PatternPack = get_pack()
 
         # Carrega modelo SpaCy (português)
         try:
@@ -54,16 +54,10 @@ class SensitiveDataDetector:
                 print(f"⚠️ Erro ao inicializar Presidio: {e}")
                 self.presidio = None
 
-    def _load_patterns(self) -> Dict[str, str]:
-        """Carrega padrões regex de um arquivo JSON (caminho relativo ao projeto)."""
-        try:
-            base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-            patterns_path = os.path.join(base_dir, "models", "pi_patterns.json")
-            with open(patterns_path, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except Exception as e:
-            print(f"Erro ao carregar padrões: {e}")
-            return {}
+    @property
+    def patterns(self) -> Dict[str, str]:
+        """Padrões (fonte) do pacote atual."""
+        return self.pack.sources
 
     @staticmethod
     def _digits_only(value: str) -> str:
@@ -108,11 +102,9 @@ class SensitiveDataDetector:
         if not text:
             return matches
 
-        for name, pattern in self.patterns.items():
-            try:
-                found = re.findall(pattern, text, flags=re.IGNORECASE)
-            except re.error:
-                continue
+        self.pack = get_pack()
+        for name, pattern in self.pack.compiled.items():
+            found = pattern.findall(text)
 
             if not found:
                 continue
@@ -4,4 +4,5 @@ This package contains the reusable engine (detectors, scanning, scoring, reports
 """
 
 from .config import Settings
-from .scan import scan_text, scan_dataframe, scan_path
+from .scan import scan_text, scan_texts, scan_dataframe, scan_path
+from .textscan import scan_text_file
@@ -0,0 +1,202 @@
+"""Compact binary report format (``.dgr``) with a lazy, memory-mapped loader.
+
+A JSON report repeats ``"detector": "regex", "type": "CPF"`` and the key
+names on every finding. Here every string is stored once in a string table,
+and findings/matches are fixed-width columns of little-endian uint32
+indexes into it (dictionary encoding, like an Arrow dictionary column):
+
+    b"DGRB" u16 version u16 0  u32 header_len  header (UTF-8 JSON)
+    u32[n_strings + 1]  string offsets      blob (UTF-8)      pad to 4
+    u32[n_findings, 4]  location, masked_value, first match, also_at
+    u32[n_matches, 3]   detector, type, raw
+
+Header = created_at, target, summary, meta and the three counts. Finding
+``i`` owns matches ``[first[i], first[i + 1])`` (the last one runs to
+``n_matches``). ``also_at`` is one string, the locations joined by
+``\x1f``. ``load_binary`` maps the file and builds ``Finding`` objects
+only when they are read, so opening a report to check its summary or one
+page of findings costs the header, not the whole file.
+"""
+
+from __future__ import annotations
+
+import json
+import mmap
+import struct
+from collections.abc import Sequence
+from dataclasses import asdict
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple
+
+import numpy as np
+
+from .detectors.base import Match
+from .reporting import Finding, ScanReport
+from .scoring import RiskSummary
+
+MAGIC = b"DGRB"
+VERSION = 2
+_ALSO_SEP = "\x1f"
+BINARY_SUFFIXES = {".dgr"}
+_PREFIX = struct.Struct("<4sHHI")
+_BLOCK = 4096
+
+
+def is_binary_report(path: str | Path) -> bool:
+    with open(path, "rb") as fh:
+        return fh.read(4) == MAGIC
+
+
+def write_binary(report: ScanReport, path: str | Path) -> int:
+    """Write ``report`` as ``.dgr``; returns the file size."""
+    strings: Dict[str, int] = {}
+
+    def sid(s: str) -> int:
+        i = strings.get(s)
+        if i is None:
+            i = strings[s] = len(strings)
+        return i
+
+    findings = np.empty((len(report.findings), 4), dtype="<u4")
+    match_rows: List[Tuple[int, int, int]] = []
+    for i, f in enumerate(report.findings):
+        findings[i] = (sid(f.location), sid(f.masked_value), len(match_rows), sid(_ALSO_SEP.join(f.also_at)))
+        match_rows.extend((sid(m.detector), sid(m.type), sid(m.raw)) for m in f.matches)
+    matches = np.array(match_rows, dtype="<u4").reshape(-1, 3)
+
+    encoded = [s.encode("utf-8") for s in strings]
+    offsets = np.zeros(len(encoded) + 1, dtype="<u8")
+    np.cumsum([len(b) for b in encoded], out=offsets[1:])
+    if offsets[-1] >= 2**32:
+        raise ValueError("string table over 4 GiB")
+    blob = b"".join(encoded)
+
+    header = json.dumps(
+        {
+            "created_at": report.created_at,
+            "target": report.target,
+            "summary": asdict(report.summary),
+            "meta": report.meta,
+            "n_strings": len(encoded),
+            "n_findings": len(findings),
+            "n_matches": len(matches),
+        },
+        ensure_ascii=False,
+        default=str,
+    ).encode("utf-8")
+    header += b" " * (-len(header) % 4)
+
+    with open(path, "wb") as fh:
+        fh.write(_PREFIX.pack(MAGIC, VERSION, 0, len(header)))
+        fh.write(header)
+        fh.write(offsets.astype("<u4").tobytes())
+        fh.write(blob)
+        fh.write(b"\0" * (-len(blob) % 4))
+        fh.write(findings.tobytes())
+        fh.write(matches.tobytes())
+        return fh.tell()
+
+
+class LazyFindings(Sequence):
+    """Read-only sequence of ``Finding`` decoded on access from the mapped file."""
+
+    def __init__(self, buf: mmap.mmap, offsets: np.ndarray, blob_start: int, findings: np.ndarray, matches: np.ndarray) -> None:
+        self._buf = buf
+        self._offsets = offsets
+        self._blob_start = blob_start
+        self._findings = findings
+        self._matches = matches
+        self._strings: Dict[int, str] = {}
+        # Match is frozen, so equal (detector, type, raw) rows can share one object
+        self._match_memo: Dict[Tuple[int, int, int], Match] = {}
+
+    def _str(self, i: int) -> str:
+        s = self._strings.get(i)
+        if s is None:
+            a, b = int(self._offsets[i]), int(self._offsets[i + 1])
+            s = self._strings[i] = self._buf[self._blob_start + a : self._blob_start + b].decode("utf-8")
+        return s
+
+    def __len__(self) -> int:
+        return len(self._findings)
+
+    def _finding(self, i: int) -> Finding:
+        return next(self._iter_range(i, i + 1))
+
+    def _iter_range(self, lo: int, hi: int) -> Iterator[Finding]:
+        # whole blocks go through .tolist(): indexing numpy scalars one by one is ~10x slower
+        n, n_matches, s, memo = len(self._findings), len(self._matches), self._str, self._match_memo
+        for a in range(lo, hi, _BLOCK):
+            b = min(a + _BLOCK, hi)
+            rows = self._findings[a:b].tolist()
+            first = rows[0][2]
+            last = int(self._findings[b, 2]) if b < n else n_matches
+            mrows = self._matches[first:last].tolist()
+            for j, (loc, masked, start, also) in enumerate(rows):
+                end = rows[j + 1][2] if j + 1 < len(rows) else last
+                matches = []
+                for row in mrows[start - first : end - first]:
+                    key = tuple(row)
+                    m = memo.get(key)
+                    if m is None:
+                        m = memo[key] = Match(detector=s(row[0]), type=s(row[1]), raw=s(row[2]))
+                    matches.append(m)
+                also_at = s(also).split(_ALSO_SEP) if s(also) else []
+                yield Finding(location=s(loc), masked_value=s(masked), matches=matches, also_at=also_at)
+
+    def __getitem__(self, index):  # type: ignore[override]
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step == 1:
+                return list(self._iter_range(start, max(start, stop)))
+            return [self._finding(i) for i in range(start, stop, step)]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return self._finding(index)
+
+    def __iter__(self) -> Iterator[Finding]:
+        return self._iter_range(0, len(self))
+
+    def type_counts(self) -> Dict[str, int]:
+        """Matches per type straight from the type column (no ``Finding`` built)."""
+        ids, counts = np.unique(self._matches[:, 1], return_counts=True)
+        return {self._str(int(i)): int(n) for i, n in zip(ids, counts)}
+
+
+def load_binary(path: str | Path) -> ScanReport:
+    """Open a ``.dgr`` report; ``findings`` is a ``LazyFindings`` over the mapped file."""
+    with open(path, "rb") as fh:
+        buf = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+    magic, version, _, header_len = _PREFIX.unpack_from(buf, 0)
+    if magic != MAGIC:
+        raise ValueError(f"{path}: not a DataGuardian binary report")
+    if version != VERSION:
+        raise ValueError(f"{path}: unsupported binary report version {version}")
+    pos = _PREFIX.size
+    header = json.loads(bytes(buf[pos : pos + header_len]))
+    pos += header_len
+
+    n_strings, n_findings, n_matches = header["n_strings"], header["n_findings"], header["n_matches"]
+    offsets = np.frombuffer(buf, dtype="<u4", count=n_strings + 1, offset=pos)
+    pos += offsets.nbytes
+    blob_start = pos
+    pos += int(offsets[-1])
+    pos += -pos % 4
+    findings = np.frombuffer(buf, dtype="<u4", count=n_findings * 4, offset=pos).reshape(-1, 4)
+    pos += findings.nbytes
+    matches = np.frombuffer(buf, dtype="<u4", count=n_matches * 3, offset=pos).reshape(-1, 3)
+
+    summary = header.get("summary") or {}
+    return ScanReport(
+        created_at=header.get("created_at", ""),
+        target=header.get("target", ""),
+        summary=RiskSummary(
+            score=int(summary.get("score", 0)),
+            level=summary.get("level", "LOW"),
+            counts_by_type=dict(summary.get("counts_by_type") or {}),
+        ),
+        findings=LazyFindings(buf, offsets, blob_start, findings, matches),  # type: ignore[arg-type]
+        meta=header.get("meta") or {},
+    )
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from .config import Settings
+
+
+@dataclass
+class ScanBudget:
+    """Wall-time / bytes / findings limits for a scan (0 = unlimited).
+
+    Budgets nest: a per-file budget is a ``child`` of the per-scan one, charges
+    flow up to the parent, and a child is exhausted as soon as either is.
+    Scanners check ``exceeded()`` between units of work (columns, windows,
+    files) and stop early, flagging what was cut short via ``stop()``.
+    """
+
+    label: str = "scan"
+    seconds: float = 0.0
+    max_bytes: int = 0
+    max_findings: int = 0
+    parent: Optional["ScanBudget"] = None
+    started: float = field(default_factory=time.monotonic)
+    bytes: int = 0
+    findings: int = 0
+    reasons: List[str] = field(default_factory=list)
+
+    @classmethod
+    def for_scan(cls, settings: Settings) -> "ScanBudget":
+        return cls(
+            label="scan",
+            seconds=settings.max_scan_seconds,
+            max_bytes=settings.max_scan_bytes,
+            max_findings=settings.max_findings,
+        )
+
+    def child(self, label: str, *, seconds: float = 0.0, max_bytes: int = 0) -> "ScanBudget":
+        return ScanBudget(label=label, seconds=seconds, max_bytes=max_bytes, parent=self)
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+    def charge(self, *, nbytes: int = 0, findings: int = 0) -> None:
+        self.bytes += nbytes
+        self.findings += findings
+        if self.parent is not None:
+            self.parent.charge(nbytes=nbytes, findings=findings)
+
+    def exceeded(self) -> Optional[str]:
+        """Reason string for the first exhausted limit (self or parents), else None."""
+        if self.seconds and self.elapsed >= self.seconds:
+            return f"{self.label} time budget ({self.seconds:g}s)"
+        if self.max_bytes and self.bytes >= self.max_bytes:
+            return f"{self.label} byte budget ({self.max_bytes})"
+        if self.max_findings and self.findings >= self.max_findings:
+            return f"{self.label} findings budget ({self.max_findings})"
+        return self.parent.exceeded() if self.parent is not None else None
+
+    def bytes_left(self) -> Optional[int]:
+        """Smallest remaining byte allowance up the chain (None = unlimited)."""
+        left = max(0, self.max_bytes - self.bytes) if self.max_bytes else None
+        up = self.parent.bytes_left() if self.parent is not None else None
+        if left is None:
+            return up
+        return left if up is None else min(left, up)
+
+    def findings_full(self) -> Optional[str]:
+        """Like ``exceeded()`` but only for the findings limit (checked per finding)."""
+        if self.max_findings and self.findings >= self.max_findings:
+            return f"{self.label} findings budget ({self.max_findings})"
+        return self.parent.findings_full() if self.parent is not None else None
+
+    def stop(self, reason: str) -> None:
+        if reason not in self.reasons:
+            self.reasons.append(reason)
+
+    def to_meta(self) -> Dict[str, Any]:
+        return {
+            "truncated": bool(self.reasons),
+            "reasons": list(self.reasons),
+            "elapsed_s": round(self.elapsed, 3),
+            "bytes": self.bytes,
+            "findings": self.findings,
+        }
@@ -16,8 +16,73 @@ class Settings:
     max_unique_per_column: int = int(os.getenv("DATAGUARDIAN_MAX_UNIQUE_PER_COLUMN", "200"))
     max_chars_per_cell: int = int(os.getenv("DATAGUARDIAN_MAX_CHARS_PER_CELL", "20000"))
 
+    # Budgets (0 = unlimited); a scan that hits one returns partial results
+    max_scan_seconds: float = float(os.getenv("DATAGUARDIAN_MAX_SCAN_SECONDS", "0"))
+    max_file_seconds: float = float(os.getenv("DATAGUARDIAN_MAX_FILE_SECONDS", "0"))
+    # per pattern per cell; > 0 runs RegexDetector on the third-party `regex` engine
+    max_cell_seconds: float = float(os.getenv("DATAGUARDIAN_MAX_CELL_SECONDS", "0"))
+    max_scan_bytes: int = int(os.getenv("DATAGUARDIAN_MAX_SCAN_BYTES", "0"))
+    max_file_bytes: int = int(os.getenv("DATAGUARDIAN_MAX_FILE_BYTES", "0"))
+    max_findings: int = int(os.getenv("DATAGUARDIAN_MAX_FINDINGS", "0"))
+
+    # Raw text (mmap) scanning for .txt/.log
+    raw_text_scan: bool = os.getenv("DATAGUARDIAN_RAW_TEXT_SCAN", "1") == "1"
+    text_window_bytes: int = int(os.getenv("DATAGUARDIAN_TEXT_WINDOW_BYTES", str(8 * 1024 * 1024)))
+    text_window_overlap: int = int(os.getenv("DATAGUARDIAN_TEXT_WINDOW_OVERLAP", "4096"))
+
+    # CSV parser: "auto" (pyarrow if installed, else pandas' C engine), "pyarrow" or "c"
+    csv_engine: str = os.getenv("DATAGUARDIAN_CSV_ENGINE", "auto")
+    # opt-in: with routing on, CSVs wanting more rows than this read that many first and
+    # never read the columns routing rules out on them (a sparse column may be missed; 0 = off)
+    route_sample_rows: int = int(os.getenv("DATAGUARDIAN_ROUTE_SAMPLE_ROWS", "0"))
+
+    # Work-queue (distributed) scans: text files above this are split into byte ranges
+    queue_chunk_bytes: int = int(os.getenv("DATAGUARDIAN_QUEUE_CHUNK_BYTES", str(256 * 1024 * 1024)))
+
+    # Pattern pack (empty = bundled models/pi_patterns.json); edits are picked up by running
+    # processes within reload_seconds (0 = load once per process). See dataguardian.patterns
+    patterns_path: str = os.getenv("DATAGUARDIAN_PATTERNS_PATH", "")
+    patterns_reload_seconds: float = float(os.getenv("DATAGUARDIAN_PATTERNS_RELOAD_SECONDS", "2"))
+
     # Detection toggles
     enable_presidio: bool = os.getenv("DATAGUARDIAN_ENABLE_PRESIDIO", "1") == "1"
+    # which values the NLP tier (Presidio) sees after regex; see dataguardian.tiers
+    nlp_escalation: str = os.getenv("DATAGUARDIAN_NLP_ESCALATION", "tokens>=4,ambiguous,header")
+    # profile columns first and only run detectors/patterns that can match
+    route_columns: bool = os.getenv("DATAGUARDIAN_ROUTE_COLUMNS", "1") == "1"
+
+    # Scan-wide dictionary of distinct values: detect each once, report it once (0 = disabled)
+    value_dict_entries: int = int(os.getenv("DATAGUARDIAN_VALUE_DICT_ENTRIES", "500000"))
+
+    # Shared memo cache of detector results by cell value (0 = disabled)
+    detection_cache_mb: int = int(os.getenv("DATAGUARDIAN_DETECTION_CACHE_MB", "0"))
+
+    # Indexed findings store (SQLite path; empty = disabled). When set, CLI/API scans are indexed.
+    findings_db: str = os.getenv("DATAGUARDIAN_FINDINGS_DB", "")
+    # HMAC key for value hashes (store rows, redaction hash tokens); empty = plain SHA-256
+    store_hash_key: str = os.getenv("DATAGUARDIAN_STORE_HASH_KEY", "")
+
+    # API concurrency: scans run in a bounded pool ("process" or "thread");
+    # beyond workers + max_queue in-flight scans the API answers 429
+    api_pool: str = os.getenv("DATAGUARDIAN_API_POOL", "process")
+    api_workers: int = int(os.getenv("DATAGUARDIAN_API_WORKERS", str(os.cpu_count() or 2)))
+    api_max_queue: int = int(os.getenv("DATAGUARDIAN_API_MAX_QUEUE", "16"))
+    # async jobs (POST /jobs): spooled uploads, job state and reports live here
+    api_jobs_dir: str = os.getenv("DATAGUARDIAN_API_JOBS_DIR", ".dataguardian/jobs")
+    # uploads are streamed to disk (spool dir, empty = system temp) and rejected past this size
+    api_max_upload_bytes: int = int(os.getenv("DATAGUARDIAN_API_MAX_UPLOAD_BYTES", str(2 * 1024 * 1024 * 1024)))
+    api_spool_dir: str = os.getenv("DATAGUARDIAN_API_SPOOL_DIR", "")
+    # content-addressed report cache for /scan/file (memory LRU; optional on-disk tier)
+    api_cache_mb: int = int(os.getenv("DATAGUARDIAN_API_CACHE_MB", "64"))
+    api_cache_dir: str = os.getenv("DATAGUARDIAN_API_CACHE_DIR", "")
+    api_cache_disk_mb: int = int(os.getenv("DATAGUARDIAN_API_CACHE_DISK_MB", "1024"))
+
+    # Warm scanner daemon (`cli serve` / `python -m cli.client`): Unix socket and pre-forked workers
+    # (empty socket = per-user absolute default, see daemon.default_socket_path)
+    daemon_socket: str = os.getenv("DATAGUARDIAN_DAEMON_SOCKET", "")
+    daemon_workers: int = int(os.getenv("DATAGUARDIAN_DAEMON_WORKERS", "2"))
 
     # Reporting
     mask_keep_last: int = int(os.getenv("DATAGUARDIAN_MASK_KEEP_LAST", "4"))
+    # redaction token: "mask" (keeps mask_keep_last chars) or "hash" (TYPE + store value hash)
+    redact_mode: str = os.getenv("DATAGUARDIAN_REDACT_MODE", "mask")
@@ -0,0 +1,208 @@
+"""Pre-forked scanner daemon behind a Unix domain socket.
+
+``serve`` imports pandas and builds the detectors (Presidio/spaCy models
+included) once. It binds the socket, then forks ``workers`` children that
+share the warm state copy-on-write and ``accept()`` on the same listening
+socket. A scan request then costs the scan itself, with no interpreter
+start, imports or model load. The parent only respawns children that exit:
+a crash, or a recycle after ``max_requests``.
+
+Protocol, one request per connection:
+
+- request: one JSON line ``{"path": "/abs/path", "format": "json"|"ndjson",
+  "shard": "i/N" | null}``;
+- response: one JSON line ``{"ok": true, "size": n, "level", "score",
+  "findings"}`` followed by ``n`` bytes of the serialized report. On
+  failure it is ``{"ok": false, "error": "..."}``.
+
+``cli/client.py`` is the stdlib-only client. The socket is created mode
+0600, because the daemon reads any path its user can.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import signal
+import socket
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .config import Settings
+from .detectors.base import Detector
+from .merge import NDJSON_SUFFIXES
+from .scan import default_detectors, scan_path
+from .sharding import parse_shard
+
+log = logging.getLogger(__name__)
+
+MAX_REQUEST_BYTES = 64 * 1024
+# an idle or half-open client holds a worker at most this long
+REQUEST_TIMEOUT = 10.0
+SEND_TIMEOUT = 60.0
+# a worker that dies sooner than this after spawning is crashing: back off
+CRASH_WINDOW = 1.0
+MAX_BACKOFF = 30.0
+
+
+def default_socket_path() -> str:
+    """Per-user socket: ``$XDG_RUNTIME_DIR/dataguardian/scanner.sock``, else ``/tmp/dataguardian-<uid>.sock``.
+
+    Absolute, so a client started from any directory finds the daemon.
+    (``cli/client.py`` repeats this: it must not import the package.)
+    """
+    runtime = os.getenv("XDG_RUNTIME_DIR")
+    if runtime:
+        return os.path.join(runtime, "dataguardian", "scanner.sock")
+    return f"/tmp/dataguardian-{os.getuid()}.sock"
+
+
+class _Stop(Exception):
+    pass
+
+
+def _bind(path: Path) -> socket.socket:
+    if path.exists():
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(str(path))
+        except OSError:
+            path.unlink()  # stale socket of a daemon that died
+        else:
+            raise RuntimeError(f"a scanner daemon is already listening on {path}")
+        finally:
+            probe.close()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    old_umask = os.umask(0o177)
+    try:
+        sock.bind(str(path))
+    finally:
+        os.umask(old_umask)
+    sock.listen(128)
+    return sock
+
+
+def handle_request(raw: bytes, *, settings: Settings, detectors: List[Detector]) -> tuple[Dict[str, Any], bytes]:
+    """Run one request; returns the response header and payload."""
+    try:
+        req = json.loads(raw)
+        path = Path(req["path"])
+        if not path.is_absolute():
+            raise ValueError("path must be absolute (the daemon has its own working directory)")
+        fmt = req.get("format") or "json"
+        shard = parse_shard(req["shard"]) if req.get("shard") else None
+        report = scan_path(path, settings=settings, shard=shard, detectors=detectors)
+    except Exception as e:
+        return {"ok": False, "error": f"{type(e).__name__}: {e}"}, b""
+
+    if settings.findings_db:
+        from .store import FindingsStore
+
+        store = FindingsStore(settings.findings_db)
+        store.add_report(report)
+        store.close()
+    payload = (report.to_ndjson() if fmt == "ndjson" or f".{fmt}" in NDJSON_SUFFIXES else report.to_json()).encode("utf-8")
+    header = {
+        "ok": True,
+        "size": len(payload),
+        "level": report.summary.level,
+        "score": report.summary.score,
+        "findings": len(report.findings),
+    }
+    return header, payload
+
+
+def _child(sock: socket.socket, *, settings: Settings, detectors: List[Detector], max_requests: int) -> None:
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # Ctrl-C goes to the parent, which stops us
+    served = 0
+    while not max_requests or served < max_requests:
+        conn, _ = sock.accept()
+        with conn:
+            try:
+                conn.settimeout(REQUEST_TIMEOUT)
+                raw = conn.makefile("rb").readline(MAX_REQUEST_BYTES)
+                header, payload = handle_request(raw, settings=settings, detectors=detectors)
+                conn.settimeout(SEND_TIMEOUT)
+                conn.sendall(json.dumps(header).encode("utf-8") + b"\n" + payload)
+            except (BrokenPipeError, ConnectionResetError, TimeoutError):
+                pass  # client went away or stalled
+        served += 1
+
+
+def _spawn(sock: socket.socket, **kwargs: Any) -> int:
+    pid = os.fork()
+    if pid == 0:
+        code = 0
+        try:
+            _child(sock, **kwargs)
+        except BaseException:
+            log.exception("scanner worker crashed")
+            code = 1
+        finally:
+            os._exit(code)
+    return pid
+
+
+def serve(
+    socket_path: str | Path,
+    *,
+    workers: int = 2,
+    settings: Optional[Settings] = None,
+    max_requests: int = 0,
+) -> None:
+    """Run the daemon until SIGTERM/SIGINT (POSIX only: uses ``fork``)."""
+    settings = settings or Settings()
+    path = Path(socket_path)
+    detectors = default_detectors(settings)  # warm up before forking: children inherit it
+    sock = _bind(path)
+
+    def _stop(signum, frame) -> None:
+        # waitpid is retried after a handler returns (PEP 475): raise to get out
+        raise _Stop()
+
+    signal.signal(signal.SIGTERM, _stop)
+    signal.signal(signal.SIGINT, _stop)
+
+    kwargs = {"settings": settings, "detectors": detectors, "max_requests": max_requests}
+    children: Dict[int, float] = {}  # pid -> spawn time
+    backoff = 0.0
+    try:
+        for _ in range(max(1, workers)):
+            children[_spawn(sock, **kwargs)] = time.monotonic()
+        log.info("scanner daemon on %s with %d workers", path, len(children))
+        while True:
+            try:
+                pid, _ = os.waitpid(-1, 0)
+            except ChildProcessError:
+                break
+            spawned = children.pop(pid, None)
+            if spawned is not None and time.monotonic() - spawned < CRASH_WINDOW:
+                backoff = min(MAX_BACKOFF, backoff * 2 or 0.5)
+                log.warning("scanner worker %d died right after start; respawning in %.1fs", pid, backoff)
+                time.sleep(backoff)
+            else:
+                backoff = 0.0
+            children[_spawn(sock, **kwargs)] = time.monotonic()
+    except _Stop:
+        pass
+    finally:
+        for pid in list(children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+        deadline = time.monotonic() + 5
+        for pid in list(children):
+            while time.monotonic() < deadline:
+                try:
+                    if os.waitpid(pid, os.WNOHANG)[0]:
+                        break
+                except ChildProcessError:
+                    break
+                time.sleep(0.05)
+        sock.close()
+        path.unlink(missing_ok=True)
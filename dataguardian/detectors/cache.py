@@ -0,0 +1,204 @@
+"""Memo cache of detector results.
+
+``CachedDetector`` wraps any detector and looks each value up in a
+``DetectionCache`` first: a byte-capped LRU keyed by detector version plus
+a BLAKE2b digest of the value. ``shared_cache`` gives one cache per process,
+so repeated values hit across columns, files and scans. The version is read
+on every call, so a reloaded pattern pack misses instead of reusing old
+results.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Collection, Dict, List, Optional, Sequence, Tuple
+
+from ..metrics import CACHE_REQUESTS
+from .base import Detector, Match
+
+
+def detector_version(detector: Detector) -> str:
+    """Cache namespace for a detector: its name plus its ``version`` (if any)."""
+    name = getattr(detector, "name", detector.__class__.__name__)
+    return f"{name}@{getattr(detector, 'version', '0')}"
+
+
+def _entry_size(matches: Tuple[Match, ...]) -> int:
+    # rough, but stable: key + tuple overhead + each Match with its strings
+    return 128 + sum(120 + len(m.raw) + len(m.type) + len(m.detector) for m in matches)
+
+
+class DetectionCache:
+    """Bounded LRU of detector results keyed by (detector version, value hash).
+
+    Raw values are never stored as keys — only a BLAKE2b digest — so the cache
+    holds no more PII than the findings themselves. Thread-safe.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024) -> None:
+        self.max_bytes = max_bytes
+        self._data: "OrderedDict[Tuple[str, bytes], Tuple[Match, ...]]" = OrderedDict()
+        self._sizes: Dict[Tuple[str, bytes], int] = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # per-thread [hits, misses, evictions]: a scan runs on one thread, so
+        # its own counts are a diff of these even while other scans share the cache
+        self._local = threading.local()
+
+    def _thread_counts(self) -> List[int]:
+        counts = getattr(self._local, "counts", None)
+        if counts is None:
+            counts = self._local.counts = [0, 0, 0]
+        return counts
+
+    def thread_counts(self) -> Tuple[int, int, int]:
+        """(hits, misses, evictions) caused by the calling thread so far."""
+        return tuple(self._thread_counts())  # type: ignore[return-value]
+
+    @staticmethod
+    def key(version: str, text: str) -> Tuple[str, bytes]:
+        return version, hashlib.blake2b(text.encode("utf-8", errors="surrogatepass"), digest_size=16).digest()
+
+    def get(self, key: Tuple[str, bytes]) -> Optional[Tuple[Match, ...]]:
+        with self._lock:
+            found = self._data.get(key)
+            if found is None:
+                self.misses += 1
+            else:
+                self._data.move_to_end(key)
+                self.hits += 1
+        self._thread_counts()[0 if found is not None else 1] += 1
+        CACHE_REQUESTS.inc(cache="detection", result="miss" if found is None else "hit")
+        return found
+
+    def put(self, key: Tuple[str, bytes], matches: Sequence[Match]) -> None:
+        value = tuple(matches)
+        size = _entry_size(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._data:
+                self._bytes -= self._sizes[key]
+            self._data[key] = value
+            self._data.move_to_end(key)
+            self._sizes[key] = size
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                old, _ = self._data.popitem(last=False)
+                self._bytes -= self._sizes.pop(old)
+                self.evictions += 1
+                self._thread_counts()[2] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._sizes.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._data),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+_SHARED: Optional[DetectionCache] = None
+_SHARED_LOCK = threading.Lock()
+
+
+def shared_cache(max_bytes: int) -> DetectionCache:
+    """Process-wide cache, so repeated values across columns/files/scans hit."""
+    global _SHARED
+    with _SHARED_LOCK:
+        if _SHARED is None:
+            _SHARED = DetectionCache(max_bytes=max_bytes)
+        else:
+            _SHARED.max_bytes = max_bytes
+        return _SHARED
+
+
+@dataclass
+class CachedDetector:
+    """Memoizing wrapper around any ``Detector``."""
+
+    inner: Detector
+    cache: DetectionCache = field(default_factory=DetectionCache)
+
+    def __post_init__(self) -> None:
+        self.name = getattr(self.inner, "name", self.inner.__class__.__name__)
+
+    @property
+    def _version(self) -> str:
+        # read per call: a hot-reloaded pattern pack changes it
+        return detector_version(self.inner)
+
+    @property
+    def available(self) -> bool:
+        return getattr(self.inner, "available", True)
+
+    def detect(self, text: str) -> List[Match]:
+        key = self.cache.key(self._version, text or "")
+        found = self.cache.get(key)
+        if found is None:
+            timeouts = self.timeouts
+            found = tuple(self.inner.detect(text))
+            # a cell cut short by the regex timeout has partial matches: don't memoize it
+            if self.timeouts == timeouts:
+                self.cache.put(key, found)
+        return list(found)
+
+    @property
+    def timeouts(self) -> int:
+        return getattr(self.inner, "timeouts", 0)
+
+    @property
+    def types(self) -> Optional[List[str]]:
+        return getattr(self.inner, "types", None)
+
+    @property
+    def covers(self) -> Optional[Sequence[str]]:
+        return getattr(self.inner, "covers", None)
+
+    def detect_many(self, texts: Sequence[str], types: Optional[Collection[str]] = None) -> List[List[Match]]:
+        version = self._version if types is None else f"{self._version}[{','.join(sorted(types))}]"
+        out: List[Optional[List[Match]]] = [None] * len(texts)
+        keys = [self.cache.key(version, t or "") for t in texts]
+        missing: List[int] = []
+        for i, k in enumerate(keys):
+            found = self.cache.get(k)
+            if found is None:
+                missing.append(i)
+            else:
+                out[i] = list(found)
+
+        if missing:
+            batch = [texts[i] for i in missing]
+            many = getattr(self.inner, "detect_many", None)
+            timeouts = self.timeouts
+            if many is None:
+                results = [self.inner.detect(t) for t in batch]
+                if types is not None:
+                    results = [[m for m in found if m.type in types] for found in results]
+            else:
+                results = many(batch) if types is None else many(batch, types=types)
+            # results cut short by a regex timeout are partial: don't memoize them
+            cacheable = self.timeouts == timeouts
+            for i, found in zip(missing, results):
+                if cacheable:
+                    self.cache.put(keys[i], found)
+                out[i] = list(found)
+
+        return out  # type: ignore[return-value]
@@ -0,0 +1,115 @@
+"""Batch checksum validators (CPF, CNPJ, PIS, Luhn, payment cards).
+
+Every validator takes a sequence of candidate strings (as found by the regex
+patterns, separators included) and returns a boolean NumPy mask. Digits are
+packed into a ``(n_candidates, n_digits)`` uint8 matrix and the check digits
+are computed for the whole batch with a couple of matrix products, so the
+cost per candidate is a ``str.translate`` plus a few vector ops.
+"""
+
+from __future__ import annotations
+
+from typing import Callable, Dict, Sequence
+
+import numpy as np
+
+# deletes every ASCII non-digit (separators like ".", "-", "/", spaces)
+_STRIP_NON_DIGITS = {c: None for c in range(128) if not chr(c).isdigit()}
+
+_CPF_W1 = np.arange(10, 1, -1)  # 10..2
+_CPF_W2 = np.arange(11, 1, -1)  # 11..2
+_CNPJ_W1 = np.array([5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2])
+_CNPJ_W2 = np.array([6, 5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2])
+_PIS_W = np.array([3, 2, 9, 8, 7, 6, 5, 4, 3, 2])
+
+_LUHN_MIN, _LUHN_MAX = 13, 19
+# first digit of the card networks' IIN ranges: Mastercard 2-series, Amex/Diners/JCB,
+# Visa/Elo, Mastercard/Maestro/Elo, Discover/UnionPay/Hipercard
+_CARD_FIRST_DIGITS = np.array([2, 3, 4, 5, 6])
+
+
+def _digit_matrix(values: Sequence[str], width: int, *, exact: bool = True):
+    """Return ``(mask, matrix)``.
+
+    ``mask`` marks candidates whose digit count fits ``width`` (exactly, or
+    at most when ``exact=False``); ``matrix`` holds their digits, left-padded
+    with zeros to ``width``.
+    """
+    digits = [str(v).translate(_STRIP_NON_DIGITS) for v in values]
+    if exact:
+        ok = [len(d) == width and d.isascii() for d in digits]
+    else:
+        ok = [_LUHN_MIN <= len(d) <= width and d.isascii() for d in digits]
+    mask = np.array(ok, dtype=bool)
+    packed = "".join(d.zfill(width) for d, good in zip(digits, ok) if good)
+    matrix = (np.frombuffer(packed.encode("ascii"), dtype=np.uint8) - ord("0")).reshape(-1, width).astype(np.int64)
+    return mask, matrix
+
+
+def _mod11_digit(weighted_sum: np.ndarray) -> np.ndarray:
+    r = weighted_sum % 11
+    return np.where(r < 2, 0, 11 - r)
+
+
+def _not_repeated(matrix: np.ndarray) -> np.ndarray:
+    return ~(matrix == matrix[:, :1]).all(axis=1)
+
+
+def validate_cpf_batch(values: Sequence[str]) -> np.ndarray:
+    mask, m = _digit_matrix(values, 11)
+    if m.size:
+        d1 = _mod11_digit(m[:, :9] @ _CPF_W1[:9])
+        d2 = _mod11_digit(m[:, :10] @ _CPF_W2[:10])
+        mask[mask] = _not_repeated(m) & (m[:, 9] == d1) & (m[:, 10] == d2)
+    return mask
+
+
+def validate_cnpj_batch(values: Sequence[str]) -> np.ndarray:
+    mask, m = _digit_matrix(values, 14)
+    if m.size:
+        d1 = _mod11_digit(m[:, :12] @ _CNPJ_W1)
+        d2 = _mod11_digit(m[:, :13] @ _CNPJ_W2)
+        mask[mask] = _not_repeated(m) & (m[:, 12] == d1) & (m[:, 13] == d2)
+    return mask
+
+
+def validate_pis_batch(values: Sequence[str]) -> np.ndarray:
+    mask, m = _digit_matrix(values, 11)
+    if m.size:
+        d = _mod11_digit(m[:, :10] @ _PIS_W)
+        mask[mask] = _not_repeated(m) & (m[:, 10] == d)
+    return mask
+
+
+def validate_luhn_batch(values: Sequence[str]) -> np.ndarray:
+    mask, m = _digit_matrix(values, _LUHN_MAX, exact=False)
+    if m.size:
+        # digits are right-aligned, so every 2nd digit from the right is doubled
+        doubled = m[:, -2::-2] * 2
+        total = m[:, ::-2].sum(axis=1) + (doubled - 9 * (doubled > 9)).sum(axis=1)
+        mask[mask] = (total % 10 == 0) & (m.sum(axis=1) > 0)
+    return mask
+
+
+def validate_card_batch(values: Sequence[str]) -> np.ndarray:
+    """Luhn, plus a known IIN first digit; an unformatted 14-digit run that
+    validates as a CNPJ is left to the CNPJ pattern (about 1 in 10 CNPJs
+    pass Luhn too)."""
+    mask = validate_luhn_batch(values)
+    if not mask.any():
+        return mask
+    digits = [str(v).translate(_STRIP_NON_DIGITS) for v in values]
+    first = np.array([int(d[0]) if ok else -1 for d, ok in zip(digits, mask)])
+    mask &= np.isin(first, _CARD_FIRST_DIGITS)
+    fourteen = mask & np.array([len(d) == 14 for d in digits], dtype=bool)
+    if fourteen.any():
+        mask[fourteen] &= ~validate_cnpj_batch([values[i] for i in np.flatnonzero(fourteen)])
+    return mask
+
+
+BATCH_VALIDATORS: Dict[str, Callable[[Sequence[str]], np.ndarray]] = {
+    "CPF": validate_cpf_batch,
+    "CNPJ": validate_cnpj_batch,
+    "PIS": validate_pis_batch,
+    "CREDIT_CARD": validate_card_batch,
+}
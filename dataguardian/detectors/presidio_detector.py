@@ -31,6 +31,8 @@ class PresidioDetector:
     """
 
     name: str = "presidio"
+    # entity types the registry below can report (see tiers.exclusive_types)
+    covers: tuple = ("EMAIL_ADDRESS", "CREDIT_CARD", "IBAN_CODE", "IP_ADDRESS", "MEDICAL_LICENSE")
 
     def __post_init__(self) -> None:
         self._engine = None
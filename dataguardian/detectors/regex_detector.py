@@ -1,101 +1,106 @@
 from __future__ import annotations
 
-import json
-import os
 import re
 from dataclasses import dataclass
-from typing import Dict, List
+from typing import Collection, Dict, List, Optional, Sequence
 
 from .base import Match
-
-
-def _digits_only(value: str) -> str:
-    return re.sub(r"\D", "", value or "")
-
-
-def _validate_cpf(cpf: str) -> bool:
-    cpf_digits = _digits_only(cpf)
-    if len(cpf_digits) != 11 or cpf_digits == cpf_digits[0] * 11:
-        return False
-
-    def calc_digit(cpf_str: str, peso: int) -> int:
-        soma = sum(int(d) * (peso - i) for i, d in enumerate(cpf_str[: peso - 1]))
-        resto = soma % 11
-        return 0 if resto < 2 else 11 - resto
-
-    digito1 = calc_digit(cpf_digits, 10)
-    digito2 = calc_digit(cpf_digits, 11)
-    return cpf_digits[-2:] == f"{digito1}{digito2}"
-
-
-def _validate_cnpj(cnpj: str) -> bool:
-    cnpj_digits = _digits_only(cnpj)
-    if len(cnpj_digits) != 14 or cnpj_digits == cnpj_digits[0] * 14:
-        return False
-
-    def calc_digit(base: str, weights: List[int]) -> str:
-        s = sum(int(d) * w for d, w in zip(base, weights))
-        r = s % 11
-        return "0" if r < 2 else str(11 - r)
-
-    w1 = [5, 4, 3, 2, 9, 8, 7, 6, 5, 4, 3, 2]
-    w2 = [6] + w1
-
-    d1 = calc_digit(cnpj_digits[:12], w1)
-    d2 = calc_digit(cnpj_digits[:12] + d1, w2)
-    return cnpj_digits[-2:] == d1 + d2
+from .checksums import BATCH_VALIDATORS
+from ..patterns import PatternPack, get_pack
 
 
 @dataclass
 class RegexDetector:
-    """Fast detector based on compiled regex patterns."""
+    """Fast detector based on compiled regex patterns.
+
+    Patterns come from the process-wide pack (``dataguardian.patterns``):
+    instances share the compiled objects, and a changed pack file is
+    picked up between batches.
+    """
 
     patterns_path: str | None = None
     name: str = "regex"
+    # per-cell, per-pattern time limit in seconds (needs the `regex` package)
+    cell_timeout: float | None = None
+    # how often to re-check the pack file (None = Settings.patterns_reload_seconds)
+    reload_seconds: float | None = None
 
     def __post_init__(self) -> None:
-        base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-        default_path = os.path.join(base_dir, "models", "pi_patterns.json")
-        path = self.patterns_path or default_path
-
-        try:
-            with open(path, "r", encoding="utf-8") as f:
-                raw: Dict[str, str] = json.load(f)
-        except Exception:
-            raw = {}
-
-        self._compiled: Dict[str, re.Pattern] = {}
-        for k, v in raw.items():
-            try:
-                self._compiled[k] = re.compile(v, flags=re.IGNORECASE)
-            except re.error:
-                # skip invalid patterns
-                continue
+        self.timeouts = 0
+        self.pack = get_pack(self.patterns_path, timed=bool(self.cell_timeout), reload_seconds=self.reload_seconds)
 
-    def detect(self, text: str) -> List[Match]:
-        if not text:
-            return []
+    def refresh(self) -> PatternPack:
+        """Switch to the current pack if its file changed (cheap: a throttled stat)."""
+        self.pack = get_pack(self.patterns_path, timed=bool(self.cell_timeout), reload_seconds=self.reload_seconds)
+        return self.pack
 
-        out: List[Match] = []
-        for typ, pattern in self._compiled.items():
-            found = pattern.findall(text)
-            if not found:
-                continue
+    @property
+    def version(self) -> str:
+        # content fingerprint, used to namespace cached results
+        return self.refresh().version
 
-            flat: List[str] = []
-            for item in found:
-                if isinstance(item, tuple):
-                    flat.append("".join(item))
-                else:
-                    flat.append(str(item))
+    @property
+    def _compiled(self) -> Dict[str, re.Pattern]:
+        return self.pack.compiled
 
-            # extra validation to reduce FP
-            if typ == "CPF":
-                flat = [v for v in flat if _validate_cpf(v)]
-            elif typ == "CNPJ":
-                flat = [v for v in flat if _validate_cnpj(v)]
+    def detect(self, text: str) -> List[Match]:
+        return self.detect_many([text])[0]
+
+    @property
+    def types(self) -> List[str]:
+        return list(self._compiled)
+
+    def detect_many(self, texts: Sequence[str], types: Optional[Collection[str]] = None) -> List[List[Match]]:
+        """Detect over a batch of texts (e.g. the unique values of a column).
+
+        Checksummed types are validated once per batch instead of per text.
+        ``types`` restricts the run to a subset of pattern types.
+        """
+        out: List[List[Match]] = [[] for _ in texts]
+        pack = self.refresh()  # one pack for the whole batch, even if a reload lands mid-way
+        for typ, pattern in pack.compiled.items():
+            if types is not None and typ not in types:
+                continue
+            owners: List[int] = []
+            flat: List[str] = []
+            for i, text in enumerate(texts):
+                if not text:
+                    continue
+                try:
+                    found = pattern.findall(text, timeout=self.cell_timeout) if pack.timed else pattern.findall(text)
+                except TimeoutError:
+                    # pathological cell: skip it for this pattern, keep going
+                    self.timeouts += 1
+                    continue
+                for item in found:
+                    owners.append(i)
+                    flat.append("".join(item) if isinstance(item, tuple) else str(item))
+            if not flat:
+                continue
 
-            for v in dict.fromkeys(flat):
-                out.append(Match(detector=self.name, type=typ, raw=v))
+            keep = self.validate_mask(typ, flat)
+            seen = set()
+            for i, v, ok in zip(owners, flat, keep):
+                if ok and (i, v) not in seen:
+                    seen.add((i, v))
+                    out[i].append(Match(detector=self.name, type=typ, raw=v))
 
         return out
+
+    def validate_mask(self, typ: str, values: Sequence[str]) -> List[bool]:
+        """Checksum mask for ``values`` of type ``typ`` (all True if it has none)."""
+        check = BATCH_VALIDATORS.get(typ)
+        if check is None:
+            return [True] * len(values)
+        return check(values).tolist()
+
+    def validate(self, typ: str, values: List[str]) -> List[str]:
+        """Drop candidates that fail the checksum for ``typ`` (if it has one)."""
+        return [v for v, ok in zip(values, self.validate_mask(typ, values)) if ok]
+
+    def bytes_patterns(self) -> Dict[str, "re.Pattern[bytes]"]:
+        """Byte-level twins of the compiled patterns (for raw/mmap scanning).
+
+        Patterns that can't be expressed over bytes are skipped.
+        """
+        return self.refresh().bytes_patterns()
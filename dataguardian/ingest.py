@@ -0,0 +1,255 @@
+"""Path-based ingestion of structured files into DataFrames.
+
+``scan_dataframe`` only looks at the first ``Settings.max_rows_preview`` rows,
+so row-oriented formats (CSV, tab-separated .txt, JSON arrays, JSONL) are
+read straight from the file with that row limit: memory depends on the
+preview size, not the file size. JSON elements are streamed one at a time
+and flattened into dotted-path columns (see ``jsonstream``). SQL dumps have
+no row boundary to stop at and still go through
+``core.file_processor.process_file`` whole.
+
+CSV/TXT are never decoded in Python: the parser gets the path and decodes
+natively (pyarrow's streaming reader when installed, else pandas' C engine)
+with the encoding and dialect sniffed from a 64 KiB prefix. When more rows
+than ``Settings.route_sample_rows`` are wanted (opt-in, off by default) and
+routing is on, a sample of that many rows decides which columns can hold
+anything (``route_by_dtype``) and only those are read (``usecols``). That
+trades recall for speed: a column empty or numeric in the sample is never
+read. A file pyarrow fails to convert is re-read with the C engine.
+"""
+
+from __future__ import annotations
+
+import codecs
+import csv
+import logging
+from dataclasses import dataclass
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from .config import Settings
+from .detectors.base import Detector
+from .jsonstream import flatten, iter_json_rows
+
+try:
+    import pyarrow as _pa
+    import pyarrow.csv as _pacsv
+except Exception:
+    _pa = None
+    _pacsv = None
+
+ROW_SUFFIXES = {".csv", ".json", ".jsonl", ".txt"}
+SNIFF_BYTES = 64 * 1024
+
+
+@dataclass(frozen=True)
+class CsvFormat:
+    encoding: str
+    sep: str
+    quotechar: str = '"'
+
+
+def sniff_csv(path: str | Path, *, default_sep: str = ",") -> CsvFormat:
+    """Encoding (BOM, else UTF-8 if the prefix decodes, else cp1252) and
+    delimiter/quote char (``csv.Sniffer`` over , ; tab |) from a file prefix."""
+    with open(path, "rb") as fh:
+        head = fh.read(SNIFF_BYTES)
+    if head.startswith(codecs.BOM_UTF8):
+        encoding = "utf-8-sig"
+    elif head.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        encoding = "utf-16"
+    else:
+        try:
+            head.decode("utf-8")
+            encoding = "utf-8"
+        except UnicodeDecodeError as e:
+            # a multi-byte char cut by the prefix boundary is still UTF-8
+            encoding = "utf-8" if e.start >= len(head) - 3 and len(head) == SNIFF_BYTES else "cp1252"
+
+    text = head.decode(encoding, errors="replace")
+    # sniff on whole lines only
+    sample = text[: text.rfind("\n")] if "\n" in text else text
+    try:
+        dialect = csv.Sniffer().sniff(sample, delimiters=",;\t|")
+        return CsvFormat(encoding=encoding, sep=dialect.delimiter, quotechar=dialect.quotechar or '"')
+    except csv.Error:
+        return CsvFormat(encoding=encoding, sep=default_sep)
+
+
+def read_frame(
+    path: str | Path,
+    *,
+    settings: Optional[Settings] = None,
+    max_rows: Optional[int] = None,
+    detectors: Optional[Sequence[Detector]] = None,
+) -> pd.DataFrame:
+    """Load ``path`` for scanning (at most ``max_rows`` rows for row formats).
+
+    Same contract as ``process_file``: lower-cased column names, and an empty
+    frame (logged) when the file can't be parsed. CSV columns left out by
+    sample routing are listed in ``df.attrs["routing"]``; a JSON file that
+    breaks part-way keeps its earlier rows (``df.attrs["parse_error"]``).
+    """
+    settings = settings or Settings()
+    p = Path(path)
+    suffix = p.suffix.lower()
+    if suffix not in ROW_SUFFIXES:
+        return _read_whole(p)
+
+    limit = max_rows if max_rows is not None else settings.max_rows_preview
+    try:
+        if suffix in (".json", ".jsonl"):
+            with open(p, "r", encoding="utf-8", errors="replace", newline="") as fh:
+                df = _flattened_frame(islice(iter_json_rows(fh), limit), name=p.name)
+        else:
+            df = read_csv_frame(p, settings=settings, max_rows=limit, detectors=detectors)
+    except Exception as e:
+        logging.error(f"Erro ao processar {p.name}: {e}")
+        return pd.DataFrame()
+
+    if not df.empty:
+        df.columns = df.columns.astype(str).str.lower().str.strip()
+    return df
+
+
+def read_csv_frame(
+    path: Path,
+    *,
+    settings: Settings,
+    max_rows: int,
+    detectors: Optional[Sequence[Detector]] = None,
+) -> pd.DataFrame:
+    fmt = sniff_csv(path, default_sep="\t" if path.suffix.lower() == ".txt" else ",")
+    usecols: Optional[List[str]] = None
+    routing: Dict[str, Dict[str, object]] = {}
+    sample_rows = settings.route_sample_rows
+    if settings.route_columns and detectors and 0 < sample_rows < max_rows:
+        usecols, routing = _route_sample(path, fmt, detectors, sample_rows)
+
+    arrow = _use_arrow(settings)
+    try:
+        df = _read_csv(path, fmt, max_rows, usecols, arrow)
+    except ValueError:
+        if usecols is None:
+            raise
+        # e.g. duplicate header names mangled in the sample: read every column
+        df, routing = _read_csv(path, fmt, max_rows, None, arrow), {}
+    if routing:
+        df.attrs["routing"] = routing
+    return df
+
+
+def csv_engines() -> Tuple[str, ...]:
+    """CSV parsers usable here: ``"c"``, plus ``"pyarrow"`` when it is installed."""
+    return ("c", "pyarrow") if _pacsv is not None else ("c",)
+
+
+def _use_arrow(settings: Settings) -> bool:
+    engine = settings.csv_engine
+    if engine == "pyarrow" and _pacsv is None:
+        logging.warning("DATAGUARDIAN_CSV_ENGINE=pyarrow but pyarrow is not installed; using the C engine")
+    return _pacsv is not None and engine in ("auto", "pyarrow")
+
+
+def _read_csv(path: Path, fmt: CsvFormat, max_rows: int, usecols: Optional[List[str]], arrow: bool) -> pd.DataFrame:
+    if arrow:
+        try:
+            return _read_csv_arrow(path, fmt, max_rows, usecols)
+        except ValueError as e:  # includes ArrowInvalid, e.g. a later block not matching the inferred types
+            logging.warning(f"pyarrow could not read {path.name} ({e}); using the C engine")
+    return _read_csv_pandas(path, fmt, max_rows, usecols)
+
+
+def _read_csv_pandas(path: Path, fmt: CsvFormat, max_rows: int, usecols: Optional[List[str]]) -> pd.DataFrame:
+    # a path (not decoded text): the C parser reads and decodes the bytes itself
+    return pd.read_csv(
+        path,
+        sep=fmt.sep,
+        quotechar=fmt.quotechar,
+        encoding=fmt.encoding,
+        encoding_errors="replace",
+        nrows=max_rows,
+        usecols=usecols,
+        on_bad_lines="skip",
+        engine="c",
+    )
+
+
+def _read_csv_arrow(path: Path, fmt: CsvFormat, max_rows: int, usecols: Optional[List[str]]) -> pd.DataFrame:
+    """pyarrow's streaming reader: record batches until ``max_rows``, then one conversion."""
+    encoding = "utf8" if fmt.encoding in ("utf-8", "utf-8-sig") else fmt.encoding
+    reader = _pacsv.open_csv(
+        path,
+        read_options=_pacsv.ReadOptions(encoding=encoding, block_size=1 << 20),
+        parse_options=_pacsv.ParseOptions(delimiter=fmt.sep, quote_char=fmt.quotechar, invalid_row_handler=lambda row: "skip"),
+        convert_options=_pacsv.ConvertOptions(include_columns=usecols) if usecols else None,
+    )
+    batches, rows = [], 0
+    for batch in reader:
+        batches.append(batch)
+        rows += batch.num_rows
+        if rows >= max_rows:
+            break
+    return _pa.Table.from_batches(batches, schema=reader.schema).slice(0, max_rows).to_pandas()
+
+
+def _route_sample(
+    path: Path, fmt: CsvFormat, detectors: Sequence[Detector], rows: int
+) -> Tuple[Optional[List[str]], Dict[str, Dict[str, object]]]:
+    """Columns worth reading, decided by ``route_by_dtype`` on the first ``rows`` rows."""
+    from .profiling import route_by_dtype
+
+    sample = _read_csv_pandas(path, fmt, rows, None)
+    keep: List[str] = []
+    routing: Dict[str, Dict[str, object]] = {}
+    for col in sample.columns:
+        route = route_by_dtype(str(col).lower().strip(), sample[col], detectors)
+        if route.skipped:
+            route.reasons.append(f"not read (decided on the first {rows} rows)")
+            routing[route.column] = route.to_dict()
+        else:
+            keep.append(col)
+    return (keep if routing and keep else None), (routing if keep else {})
+
+
+def _flattened_frame(records: Iterable[Any], *, name: str = "") -> pd.DataFrame:
+    """One column per leaf path; list items add values, so columns may be ragged.
+
+    A malformed (or oversized) element ends the read but keeps the rows before
+    it; the error goes to ``df.attrs["parse_error"]``.
+    """
+    columns: Dict[str, List[Any]] = {}
+    error = None
+    try:
+        for rec in records:
+            for path, values in flatten(rec).items():
+                columns.setdefault(path, []).extend(values)
+    except ValueError as e:  # includes JSONDecodeError
+        error = str(e)
+        logging.warning(f"{name}: JSON read stopped early ({error}); scanning what was read before it")
+    df = pd.DataFrame({k: pd.Series(v) for k, v in columns.items()})
+    if error is not None:
+        df.attrs["parse_error"] = error
+    return df
+
+
+def _read_whole(p: Path) -> pd.DataFrame:
+    from core.file_processor import process_file
+
+    class _F:
+        # just enough of an UploadedFile for process_file
+        def __init__(self, file_path: Path):
+            self.name = file_path.name
+            self.type = ""
+            self._b = file_path.read_bytes()
+
+        def read(self):
+            return self._b
+
+        def seek(self, pos: int):
+            pass
+
+    return process_file(_F(p))
@@ -0,0 +1,200 @@
+"""Incremental JSON reading and nested-document flattening.
+
+``iter_json_records`` walks a top-level array element by element (or a
+stream of concatenated / newline-delimited values), decoding one element at
+a time from a chunked buffer, so memory is bounded by the largest element
+rather than the file. An element that still doesn't decode after
+``max_element_chars`` of pending text (malformed, or just too large)
+raises ``ValueError`` instead of buffering the rest of the file.
+``iter_object_items`` does the same for the members of a top-level object,
+streaming the elements of the arrays it is asked to expand, and
+``iter_json_rows`` (what ingestion uses) streams every array member of a
+top-level object, so ``{"data": [...]}`` exports aren't one huge element.
+
+``flatten`` turns a nested element into dotted leaf paths
+(``user.contact.email``; list items go under ``path[]``) so detectors see
+leaf values instead of the repr of a whole dict.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import IO, Any, Callable, Collection, Dict, Iterator, List, Optional, Tuple
+
+_WS = " \t\r\n"
+MAX_ELEMENT_CHARS = 16 * 1024 * 1024
+
+
+class _Buffer:
+    def __init__(self, fh: IO[str], chunk_size: int, max_pending: int = MAX_ELEMENT_CHARS) -> None:
+        self.fh = fh
+        self.chunk_size = chunk_size
+        self.max_pending = max_pending
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self) -> bool:
+        """Read more text, dropping what was consumed; False at end of file.
+
+        Reads grow with the pending tail, so an element that spans many
+        chunks is re-decoded O(log n) times, not once per chunk.
+        """
+        if self.eof:
+            return False
+        pending = len(self.buf) - self.pos
+        # grow with the pending tail, but stop right past the cap
+        data = self.fh.read(max(1, min(max(self.chunk_size, pending), self.max_pending - pending + 1)))
+        if not data:
+            self.eof = True
+            return False
+        self.buf = self.buf[self.pos :] + data
+        self.pos = 0
+        return True
+
+    def peek(self) -> Optional[str]:
+        """Next non-whitespace character (not consumed), or None at end of file."""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in _WS:
+                self.pos += 1
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self.fill():
+                return None
+
+    def decode(self, decoder: json.JSONDecoder) -> Any:
+        self.peek()  # raw_decode does not skip leading whitespace
+        while True:
+            try:
+                value, end = decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError as e:
+                pending = len(self.buf) - self.pos
+                if pending >= self.max_pending:
+                    raise ValueError(
+                        f"JSON element not decodable within {self.max_pending} chars (malformed or too large): {e.msg}"
+                    ) from e
+                if self.fill():
+                    continue
+                raise
+            # a number touching the end of the buffer may continue in the next chunk
+            if end == len(self.buf) and not self.eof and self.fill():
+                continue
+            self.pos = end
+            return value
+
+
+def iter_json_records(fh: IO[str], *, chunk_size: int = 1 << 16, max_element_chars: int = MAX_ELEMENT_CHARS) -> Iterator[Any]:
+    """Yield the elements of a top-level JSON array, or each top-level value
+    of a stream of JSON values (a single object, or JSONL)."""
+    decoder = json.JSONDecoder()
+    buf = _Buffer(fh, chunk_size, max_element_chars)
+    first = buf.peek()
+    if first is None:
+        return
+    if first != "[":
+        while buf.peek() is not None:
+            yield buf.decode(decoder)
+        return
+    yield from _iter_array(buf, decoder)
+
+
+def iter_json_rows(fh: IO[str], *, chunk_size: int = 1 << 16, max_element_chars: int = MAX_ELEMENT_CHARS) -> Iterator[Any]:
+    """``iter_json_records`` for scanning: a top-level object is streamed too.
+
+    Its array members come out one element at a time as ``{key: [element]}``
+    and its other members as ``{key: value}``, so an export like
+    ``{"data": [...]}`` is bounded by its largest element, and ``flatten``
+    still gives the ``data[].…`` paths of the whole object. Values after
+    the object (concatenated JSON) follow as usual.
+    """
+    decoder = json.JSONDecoder()
+    buf = _Buffer(fh, chunk_size, max_element_chars)
+    first = buf.peek()
+    if first == "[":
+        yield from _iter_array(buf, decoder)
+        return
+    if first == "{":
+        for key, value, element in _iter_members(buf, decoder, lambda key: True):
+            yield {key: [value]} if element else {key: value}
+    while buf.peek() is not None:
+        yield buf.decode(decoder)
+
+
+def iter_object_items(
+    fh: IO[str],
+    *,
+    expand: Collection[str] = (),
+    chunk_size: int = 1 << 16,
+    max_element_chars: int = MAX_ELEMENT_CHARS,
+) -> Iterator[Tuple[str, Any]]:
+    """Yield ``(key, value)`` for the members of a top-level JSON object.
+
+    A member named in ``expand`` that holds an array yields ``(key, element)``
+    once per element instead, so a large array (e.g. a report's
+    ``findings``) is never decoded whole.
+    """
+    buf = _Buffer(fh, chunk_size, max_element_chars)
+    if buf.peek() != "{":
+        raise ValueError("expected a JSON object")
+    for key, value, _ in _iter_members(buf, json.JSONDecoder(), lambda key: key in expand):
+        yield key, value
+
+
+def _iter_members(buf: _Buffer, decoder: json.JSONDecoder, expand: Callable[[str], bool]) -> Iterator[Tuple[str, Any, bool]]:
+    """``(key, value, False)`` per member of the object at ``buf``'s ``{``, or
+    ``(key, element, True)`` per element of an array member ``expand`` accepts."""
+    buf.pos += 1
+    if buf.peek() == "}":
+        buf.pos += 1
+        return
+    while True:
+        key = buf.decode(decoder)
+        if not isinstance(key, str) or buf.peek() != ":":
+            raise ValueError("malformed JSON object: expected a string key and ':'")
+        buf.pos += 1
+        if expand(key) and buf.peek() == "[":
+            for value in _iter_array(buf, decoder):
+                yield key, value, True
+        else:
+            yield key, buf.decode(decoder), False
+        sep = buf.peek()
+        if sep == ",":
+            buf.pos += 1
+        elif sep == "}":
+            buf.pos += 1
+            return
+        else:
+            raise ValueError(f"malformed JSON object: expected ',' or '}}', got {sep!r}")
+
+
+def _iter_array(buf: _Buffer, decoder: json.JSONDecoder) -> Iterator[Any]:
+    """Elements of the array starting at ``buf``'s position (its ``[``); stops past its ``]``."""
+    buf.pos += 1
+    if buf.peek() == "]":
+        buf.pos += 1
+        return
+    while True:
+        yield buf.decode(decoder)
+        sep = buf.peek()
+        if sep == ",":
+            buf.pos += 1
+        elif sep == "]":
+            buf.pos += 1
+            return
+        else:
+            raise ValueError(f"malformed JSON array: expected ',' or ']', got {sep!r}")
+
+
+def flatten(obj: Any, prefix: str = "", out: Optional[Dict[str, List[Any]]] = None) -> Dict[str, List[Any]]:
+    """Leaf values of ``obj`` by dotted path (several values per path under lists)."""
+    if out is None:
+        out = {}
+    if isinstance(obj, dict):
+        for k, v in obj.items():
+            flatten(v, f"{prefix}.{k}" if prefix else str(k), out)
+    elif isinstance(obj, list):
+        for v in obj:
+            flatten(v, f"{prefix}[]", out)
+    else:
+        out.setdefault(prefix or "value", []).append(obj)
+    return out
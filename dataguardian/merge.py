@@ -0,0 +1,128 @@
+"""Streaming merge of many JSON/NDJSON reports into one.
+
+Inputs are read one at a time and findings are written out as they are read
+(JSON inputs through ``jsonstream``), so memory stays at roughly one
+finding. The risk score is recomputed from the summed per-type counts of
+the input summaries (not from the findings, which may have been truncated
+by budgets).
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Tuple
+
+from .binreport import BINARY_SUFFIXES, load_binary
+from .jsonstream import iter_object_items
+from .reporting import ScanReport, finding_to_dict, now_iso
+from .scoring import RiskSummary, score_counts
+
+NDJSON_SUFFIXES = {".ndjson", ".jsonl"}
+_HEADER_KEYS = ("created_at", "target", "meta")
+
+
+def iter_report_records(path: str | Path) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """Yield ``(kind, record)`` for a report: ``header``, ``finding``…, ``summary``.
+
+    A JSON report may yield a second ``header`` after its findings, with
+    the fields that came after them.
+    """
+    p = Path(path)
+    if p.suffix.lower() in BINARY_SUFFIXES:
+        report = load_binary(p)
+        yield "header", {"created_at": report.created_at, "target": report.target, "meta": report.meta}
+        for f in report.findings:
+            yield "finding", finding_to_dict(f)
+        yield "summary", asdict(report.summary)
+        return
+    if p.suffix.lower() in NDJSON_SUFFIXES:
+        with open(p, "r", encoding="utf-8") as fh:
+            for line in fh:
+                if not line.strip():
+                    continue
+                rec = json.loads(line)
+                yield rec.pop("record", "finding"), rec
+        return
+
+    # JSON: stream the findings array; header fields after it (``meta``) come in a second header record
+    header: Dict[str, Any] = {}
+    summary: Dict[str, Any] = {}
+    started = False
+    with open(p, "r", encoding="utf-8") as fh:
+        for key, value in iter_object_items(fh, expand=("findings",)):
+            if key == "findings":
+                if not started:
+                    yield "header", header
+                    header, started = {}, True
+                yield "finding", value
+            elif key == "summary":
+                summary = value or {}
+            elif key in _HEADER_KEYS:
+                header[key] = value
+    if header or not started:
+        yield "header", header
+    yield "summary", summary
+
+
+def read_report(path: str | Path) -> ScanReport:
+    """Load a JSON, NDJSON or ``.dgr`` report file back into a ``ScanReport``."""
+    data: Dict[str, Any] = {"findings": []}
+    for kind, rec in iter_report_records(path):
+        if kind == "header":
+            data.update(rec)
+        elif kind == "finding":
+            data["findings"].append(rec)
+        elif kind == "summary":
+            data["summary"] = rec
+    return ScanReport.from_dict(data)
+
+
+def merge_reports(paths: Iterable[str | Path], out: str | Path, *, target: str = "merged") -> RiskSummary:
+    """Merge ``paths`` into ``out`` (NDJSON if it ends in .ndjson/.jsonl, else JSON).
+
+    Each merged finding gets a ``target`` key with the report it came from.
+    """
+    paths = [Path(p) for p in paths]
+    out = Path(out)
+    ndjson = out.suffix.lower() in NDJSON_SUFFIXES
+    out.parent.mkdir(parents=True, exist_ok=True)
+
+    created_at = now_iso()
+    meta = {"merged_from": len(paths)}
+    counts: Dict[str, int] = {}
+
+    with open(out, "w", encoding="utf-8") as fh:
+        if ndjson:
+            fh.write(json.dumps({"record": "header", "created_at": created_at, "target": target, "meta": meta}, ensure_ascii=False) + "\n")
+        else:
+            fh.write("{\n")
+            fh.write(f'  "created_at": {json.dumps(created_at)},\n  "target": {json.dumps(target, ensure_ascii=False)},\n  "findings": [')
+
+        first = True
+        for p in paths:
+            source = str(p)
+            for kind, rec in iter_report_records(p):
+                if kind == "header":
+                    source = rec.get("target") or source
+                elif kind == "summary":
+                    for t, n in (rec.get("counts_by_type") or {}).items():
+                        counts[t] = counts.get(t, 0) + int(n)
+                elif kind == "finding":
+                    rec = {"target": source, **rec}
+                    if ndjson:
+                        fh.write(json.dumps({"record": "finding", **rec}, ensure_ascii=False) + "\n")
+                    else:
+                        fh.write(("\n    " if first else ",\n    ") + json.dumps(rec, ensure_ascii=False))
+                    first = False
+
+        summary = score_counts(counts)
+        summary_dict = {"score": summary.score, "level": summary.level, "counts_by_type": summary.counts_by_type}
+        if ndjson:
+            fh.write(json.dumps({"record": "summary", **summary_dict}, ensure_ascii=False) + "\n")
+        else:
+            fh.write(("\n  " if not first else "") + "],\n")
+            fh.write(f'  "summary": {json.dumps(summary_dict, ensure_ascii=False)},\n  "meta": {json.dumps(meta)}\n}}\n')
+
+    return summary
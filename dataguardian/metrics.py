@@ -0,0 +1,187 @@
+"""In-process metrics registry with Prometheus text exposition.
+
+No client library or external service: counters and histograms keyed by
+label values, plus gauges read from callbacks at render time. Scans in
+worker processes record into their own registry; ``drain()`` hands the
+deltas back to the parent, which ``merge()``s them (see ``api.pool``).
+"""
+
+from __future__ import annotations
+
+import bisect
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+LabelValues = Tuple[str, ...]
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0)
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labels: Sequence[str], lock: threading.Lock) -> None:
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._lock = lock
+
+    def _key(self, labels: Dict[str, Any]) -> LabelValues:
+        return tuple(str(labels.get(k, "")) for k in self.labels)
+
+    def _fmt(self, values: LabelValues, extra: Sequence[Tuple[str, str]] = ()) -> str:
+        pairs = list(zip(self.labels, values)) + list(extra)
+        if not pairs:
+            return ""
+        return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, *args: Any) -> None:
+        super().__init__(*args)
+        self.values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self.values[key] = self.values.get(key, 0.0) + amount
+
+    def get(self, **labels: Any) -> float:
+        return self.values.get(self._key(labels), 0.0)
+
+    def render(self) -> List[str]:
+        return [f"{self.name}{self._fmt(k)} {_num(v)}" for k, v in sorted(self.values.items())]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, *args: Any, buckets: Sequence[float] = LATENCY_BUCKETS) -> None:
+        super().__init__(*args)
+        self.buckets = tuple(sorted(buckets))
+        # per label set: [count per bucket (+Inf last), sum]
+        self.values: Dict[LabelValues, List[Any]] = {}
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            entry = self.values.setdefault(key, [[0] * (len(self.buckets) + 1), 0.0])
+            entry[0][bisect.bisect_left(self.buckets, value)] += 1
+            entry[1] += value
+
+    def render(self) -> List[str]:
+        out = []
+        for key, (counts, total) in sorted(self.values.items()):
+            running = 0
+            for bound, n in zip(self.buckets + (float("inf"),), counts):
+                running += n
+                out.append(f"{self.name}_bucket{self._fmt(key, [('le', _num(bound))])} {running}")
+            out.append(f"{self.name}_sum{self._fmt(key)} {_num(total)}")
+            out.append(f"{self.name}_count{self._fmt(key)} {running}")
+        return out
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, _Metric] = {}
+        self._gauges: Dict[str, Tuple[str, Callable[[], float]]] = {}
+
+    def counter(self, name: str, help: str, labels: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, help, labels, self._lock))
+
+    def histogram(self, name: str, help: str, labels: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, help, labels, self._lock, buckets=buckets))
+
+    def gauge(self, name: str, help: str, fn: Callable[[], float]) -> None:
+        """A gauge read from ``fn`` at render time (re-registering replaces it)."""
+        self._gauges[name] = (help, fn)
+
+    def _register(self, metric: Any) -> Any:
+        existing = self._metrics.get(metric.name)
+        if existing is not None:
+            return existing
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)."""
+        lines: List[str] = []
+        for name, m in sorted(self._metrics.items()):
+            lines.append(f"# HELP {name} {m.help}")
+            lines.append(f"# TYPE {name} {m.kind}")
+            with self._lock:
+                lines.extend(m.render())
+        for name, (help, fn) in sorted(self._gauges.items()):
+            try:
+                value = float(fn())
+            except Exception:
+                continue
+            lines += [f"# HELP {name} {help}", f"# TYPE {name} gauge", f"{name} {_num(value)}"]
+        return "\n".join(lines) + "\n"
+
+    def drain(self) -> Dict[str, Dict[LabelValues, Any]]:
+        """Take (and reset) every counter/histogram value, for shipping to another process."""
+        out: Dict[str, Dict[LabelValues, Any]] = {}
+        with self._lock:
+            for name, m in self._metrics.items():
+                if m.values:
+                    out[name] = m.values
+                    m.values = {}
+        return out
+
+    def merge(self, delta: Dict[str, Dict[LabelValues, Any]]) -> None:
+        with self._lock:
+            for name, values in delta.items():
+                m = self._metrics.get(name)
+                if m is None:
+                    continue
+                for key, v in values.items():
+                    if isinstance(m, Histogram):
+                        entry = m.values.setdefault(key, [[0] * (len(m.buckets) + 1), 0.0])
+                        entry[0] = [a + b for a, b in zip(entry[0], v[0])]
+                        entry[1] += v[1]
+                    else:
+                        m.values[key] = m.values.get(key, 0.0) + v
+
+    def summary(self) -> List[str]:
+        """Human-readable end-of-run lines (counters, and histogram count/mean)."""
+        lines: List[str] = []
+        for name, m in sorted(self._metrics.items()):
+            for key, v in sorted(m.values.items()):
+                labels = ",".join(f"{k}={val}" for k, val in zip(m.labels, key))
+                label = f"{name}{{{labels}}}" if labels else name
+                if isinstance(m, Histogram):
+                    count = sum(v[0])
+                    lines.append(f"{label}: n={count} mean={v[1] / count if count else 0:.4f}s total={v[1]:.3f}s")
+                else:
+                    lines.append(f"{label}: {v:.6g}")
+        return lines
+
+
+def _num(v: float) -> str:
+    if v == float("inf"):
+        return "+Inf"
+    return str(int(v)) if float(v).is_integer() else repr(float(v))
+
+
+def _escape(v: str) -> str:
+    return v.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+REGISTRY = Registry()
+
+SCAN_SECONDS = REGISTRY.histogram("dataguardian_scan_seconds", "Wall time of single-file scans.", ["file_type"])
+SCANNED_BYTES = REGISTRY.counter("dataguardian_scanned_bytes_total", "Bytes handed to detectors.", ["file_type"])
+SCANNED_ROWS = REGISTRY.counter("dataguardian_scanned_rows_total", "Rows scanned in structured files.", ["file_type"])
+DETECTOR_SECONDS = REGISTRY.counter("dataguardian_detector_seconds_total", "Time spent inside detectors.", ["detector"])
+DETECTOR_MATCHES = REGISTRY.counter("dataguardian_detector_matches_total", "Matches reported by detectors.", ["detector"])
+CACHE_REQUESTS = REGISTRY.counter("dataguardian_cache_requests_total", "Cache lookups by cache and result.", ["cache", "result"])
+API_SECONDS = REGISTRY.histogram("dataguardian_api_scan_seconds", "API scan latency, queueing included.", ["endpoint"])
+
+
+def file_type(path: Optional[str | Path]) -> str:
+    return Path(path or "").suffix.lower().lstrip(".") or "none"
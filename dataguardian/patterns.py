@@ -0,0 +1,180 @@
+"""Compiled pattern packs, shared per process and hot-reloaded.
+
+A pack is a JSON file of ``{"TYPE": "regex", ...}`` (the bundled one is
+``models/pi_patterns.json``; ``DATAGUARDIAN_PATTERNS_PATH`` points
+elsewhere). ``get_pack`` compiles each file once per process and engine
+(``re``, or ``regex`` for per-cell timeouts). Every ``RegexDetector`` and
+``core.detector.SensitiveDataDetector`` then share the same compiled
+objects instead of compiling their own copies.
+
+``PatternPack.version`` is a fingerprint of the pattern content (SHA-256
+of the canonical JSON, 12 hex chars). The detection memo and the API
+report cache are namespaced by it.
+
+Long-running processes (API, ``serve`` daemon) pick up edits without a
+restart. ``get_pack`` re-stats the file at most every
+``DATAGUARDIAN_PATTERNS_RELOAD_SECONDS`` (0 = never). On a change it
+compiles the new pack and swaps it in as a whole. A pack that no longer
+parses, or is missing (e.g. renamed away mid-deploy), is logged and the
+previous one stays in use. With no previous pack (first load), a missing
+or broken file raises: detection must not silently run with no patterns.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple
+
+try:
+    import regex as _regex  # supports per-call timeouts
+except Exception:
+    _regex = None
+
+log = logging.getLogger(__name__)
+
+DEFAULT_PATTERNS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "models", "pi_patterns.json")
+
+
+@dataclass
+class PatternPack:
+    path: str
+    version: str
+    sources: Dict[str, str]
+    compiled: Dict[str, Any]
+    timed: bool = False
+    stat: Optional[Tuple[int, int, int]] = None  # (inode, size, mtime_ns) the pack was read at
+    _bytes: Optional[Dict[str, "re.Pattern[bytes]"]] = field(default=None, repr=False)
+
+    @property
+    def types(self):
+        return list(self.compiled)
+
+    def bytes_patterns(self) -> Dict[str, "re.Pattern[bytes]"]:
+        """Byte-level twins of the patterns (compiled on first use; untranslatable ones skipped)."""
+        if self._bytes is None:
+            out: Dict[str, re.Pattern] = {}
+            for k, src in self.sources.items():
+                if k not in self.compiled:
+                    continue
+                try:
+                    out[k] = re.compile(src.encode("utf-8"), flags=re.IGNORECASE)
+                except (re.error, UnicodeEncodeError):
+                    continue
+            self._bytes = out
+        return self._bytes
+
+
+def _stat(path: str) -> Optional[Tuple[int, int, int]]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_ino, st.st_size, st.st_mtime_ns
+
+
+def fingerprint(sources: Dict[str, str]) -> str:
+    return hashlib.sha256(json.dumps(sources, sort_keys=True).encode("utf-8")).hexdigest()[:12]
+
+
+def compile_pack(path: str, *, timed: bool = False) -> PatternPack:
+    """Read and compile ``path``; raises ``OSError``/``ValueError`` if it is missing or bad."""
+    stat = _stat(path)
+    if stat is None:
+        raise FileNotFoundError(f"pattern pack not found: {path} (check DATAGUARDIAN_PATTERNS_PATH)")
+    with open(path, "r", encoding="utf-8") as f:
+        sources = json.load(f)
+    if not isinstance(sources, dict):
+        raise ValueError(f"{path}: expected a JSON object of TYPE -> regex")
+
+    engine = _regex if (timed and _regex is not None) else re
+    compiled: Dict[str, Any] = {}
+    for k, v in sources.items():
+        try:
+            compiled[k] = engine.compile(v, flags=engine.IGNORECASE)
+        except (engine.error, TypeError):
+            # skip invalid patterns
+            log.warning("pattern %s in %s does not compile; skipped", k, path)
+    return PatternPack(path=path, version=fingerprint(sources), sources=sources, compiled=compiled, timed=engine is not re, stat=stat)
+
+
+class _Slot:
+    __slots__ = ("pack", "checked_at")
+
+    def __init__(self, pack: PatternPack) -> None:
+        self.pack = pack
+        self.checked_at = time.monotonic()
+
+
+_PACKS: Dict[Tuple[str, bool], _Slot] = {}
+_LOCK = threading.Lock()
+
+
+@lru_cache(maxsize=64)
+def resolve_path(path: Optional[str] = None) -> str:
+    from .config import Settings
+
+    return os.path.abspath(path or Settings().patterns_path or DEFAULT_PATTERNS_PATH)
+
+
+@lru_cache(maxsize=1)
+def _default_reload_seconds() -> float:
+    from .config import Settings
+
+    return Settings().patterns_reload_seconds
+
+
+def get_pack(path: Optional[str] = None, *, timed: bool = False, reload_seconds: Optional[float] = None) -> PatternPack:
+    """The process-wide compiled pack for ``path``, reloaded if the file changed.
+
+    Raises ``OSError``/``ValueError`` if the first load fails; later failed
+    reloads keep the previous pack.
+
+    ``reload_seconds`` bounds how often the file is re-stat'ed (default:
+    ``Settings.patterns_reload_seconds``; 0 = load once).
+    """
+    if reload_seconds is None:
+        reload_seconds = _default_reload_seconds()
+    key = (resolve_path(path), bool(timed and _regex is not None))
+    slot = _PACKS.get(key)
+    now = time.monotonic()
+    if slot is not None and (reload_seconds <= 0 or now - slot.checked_at < reload_seconds):
+        return slot.pack
+
+    with _LOCK:
+        slot = _PACKS.get(key)
+        if slot is None:
+            try:
+                pack = compile_pack(key[0], timed=key[1])
+            except (OSError, ValueError) as e:
+                log.error("could not load pattern pack %s: %s", key[0], e)
+                raise
+            _PACKS[key] = _Slot(pack)
+            return pack
+        if now - slot.checked_at < reload_seconds:
+            return slot.pack  # another thread just checked
+        slot.checked_at = now
+        if _stat(key[0]) != slot.pack.stat:
+            try:
+                pack = compile_pack(key[0], timed=key[1])
+            except (OSError, ValueError) as e:
+                log.warning("pattern pack %s changed but can't be loaded (%s); keeping %s", key[0], e, slot.pack.version)
+                slot.pack.stat = _stat(key[0])  # don't retry until it changes again
+            else:
+                if pack.version != slot.pack.version:
+                    log.info("reloaded pattern pack %s: %s -> %s", key[0], slot.pack.version, pack.version)
+                slot.pack = pack
+        return slot.pack
+
+
+def clear_packs() -> None:
+    """Forget every compiled pack (tests; the next ``get_pack`` recompiles)."""
+    with _LOCK:
+        _PACKS.clear()
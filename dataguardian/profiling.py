@@ -0,0 +1,183 @@
+"""Column profiling: decide which detectors/patterns are worth running per column.
+
+Two cheap stages, both explained in ``ScanReport.meta["routing"]``:
+
+1. ``route_by_dtype`` looks only at the dtype (no ``astype(str)``): booleans,
+   timestamps and short numbers can't hold any of our types and are skipped;
+   long integers only get the digit-based patterns.
+2. ``refine_by_content`` looks at the sampled values: no ``@`` means no email
+   pattern, no long digit run means no CPF/CNPJ/card/phone, and so on.
+
+Header-name hints (``cpf``, ``email``, ``senha``, ``token``…) always keep their
+pattern on. Pattern types we don't know about are never dropped.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence
+
+import pandas as pd
+
+from .detectors.base import Detector
+
+DIGIT_TYPES = {"CPF", "CNPJ", "PIS", "CREDIT_CARD", "TELEFONE"}
+EMAIL_TYPES = {"EMAIL"}
+SECRET_TYPES = {"SENHA", "TOKEN"}
+
+# numbers shorter than this can't be any of DIGIT_TYPES
+_MIN_DIGITS = 8
+
+_HEADER_HINTS: Dict[str, List[str]] = {
+    "cpf": ["CPF"],
+    "cnpj": ["CNPJ"],
+    "pis": ["PIS"],
+    "nis": ["PIS"],
+    "email": ["EMAIL"],
+    "mail": ["EMAIL"],
+    "senha": ["SENHA"],
+    "password": ["SENHA"],
+    "passwd": ["SENHA"],
+    "pwd": ["SENHA"],
+    "token": ["TOKEN"],
+    "secret": ["TOKEN"],
+    "apikey": ["TOKEN"],
+    "bearer": ["TOKEN"],
+    "telefone": ["TELEFONE"],
+    "phone": ["TELEFONE"],
+    "celular": ["TELEFONE"],
+    "fone": ["TELEFONE"],
+    "cartao": ["CREDIT_CARD"],
+    "card": ["CREDIT_CARD"],
+}
+
+_DIGIT_RUN_RE = re.compile(r"\d(?:[\s.\-/()]{0,2}\d){%d}" % (_MIN_DIGITS - 1))
+_SECRET_HINT_RE = re.compile(r"[:=]|eyJ")
+_ANY_DIGIT_RE = re.compile(r"\d")
+
+
+def header_hints(column: str) -> List[str]:
+    """Pattern types suggested by a column name (``user_cpf`` -> ``["CPF"]``)."""
+    tokens = [t for t in re.split(r"[^a-z0-9]+", column.lower()) if t]
+    out: List[str] = []
+    for tok in tokens:
+        for key, types in _HEADER_HINTS.items():
+            if tok.startswith(key):
+                out.extend(t for t in types if t not in out)
+    return out
+
+
+@dataclass
+class ColumnRoute:
+    column: str
+    dtype: str
+    # detector name -> pattern types to run (None = everything it has)
+    detectors: Dict[str, Optional[List[str]]]
+    hints: List[str] = field(default_factory=list)
+    reasons: List[str] = field(default_factory=list)
+
+    @property
+    def skipped(self) -> bool:
+        return not self.detectors
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            "dtype": self.dtype,
+            "skipped": self.skipped,
+            "detectors": self.detectors,
+            "hints": self.hints,
+            "reasons": self.reasons,
+        }
+
+
+def _name(d: Detector) -> str:
+    return getattr(d, "name", d.__class__.__name__)
+
+
+def _restrict(route: ColumnRoute, drop: set, reason: str) -> None:
+    """Remove ``drop`` types from every typed detector (hinted types survive)."""
+    drop = drop - set(route.hints)
+    removed = False
+    for name, types in list(route.detectors.items()):
+        if types is None:
+            continue
+        kept = [t for t in types if t not in drop]
+        if len(kept) != len(types):
+            removed = True
+        if kept:
+            route.detectors[name] = kept
+        else:
+            del route.detectors[name]
+    if removed:
+        route.reasons.append(reason)
+
+
+def _skip(route: ColumnRoute, reason: str) -> ColumnRoute:
+    route.detectors = {}
+    route.reasons.append(reason)
+    return route
+
+
+def route_by_dtype(column: str, series: pd.Series, detectors: Sequence[Detector]) -> ColumnRoute:
+    route = ColumnRoute(
+        column=column,
+        dtype=str(series.dtype),
+        detectors={_name(d): (list(getattr(d, "types")) if getattr(d, "types", None) is not None else None) for d in detectors},
+        hints=header_hints(column),
+    )
+    if route.hints:
+        route.reasons.append(f"header hints: {', '.join(route.hints)}")
+
+    if pd.api.types.is_bool_dtype(series):
+        return _skip(route, "boolean dtype")
+    if pd.api.types.is_datetime64_any_dtype(series) or pd.api.types.is_timedelta64_dtype(series):
+        return _skip(route, "temporal dtype")
+
+    if pd.api.types.is_numeric_dtype(series):
+        present = series.dropna()
+        if present.empty:
+            return _skip(route, "no values")
+        try:
+            digits = len(str(int(present.abs().max())))
+        except (OverflowError, ValueError):  # inf/nan
+            digits = 0
+        if digits < _MIN_DIGITS and not route.hints:
+            return _skip(route, f"numeric dtype, at most {digits} digits")
+        # numbers can only be digit-based types; free-form detectors don't apply
+        route.detectors = {k: v for k, v in route.detectors.items() if v is not None}
+        _restrict(route, EMAIL_TYPES | SECRET_TYPES, "numeric dtype: digit patterns only")
+        if route.skipped:
+            route.reasons.append("no detector applies to numbers")
+
+    return route
+
+
+def refine_by_content(route: ColumnRoute, values: Sequence[str]) -> ColumnRoute:
+    if route.skipped:
+        return route
+    if not values:
+        return _skip(route, "no values")
+
+    joined = "\n".join(values)
+    has_at = "@" in joined
+    has_digit_run = _DIGIT_RUN_RE.search(joined) is not None
+
+    if not has_at:
+        _restrict(route, EMAIL_TYPES, "no '@' in sample")
+    if not has_digit_run:
+        _restrict(route, DIGIT_TYPES, f"no run of {_MIN_DIGITS}+ digits in sample")
+    if _SECRET_HINT_RE.search(joined) is None:
+        _restrict(route, SECRET_TYPES, "no key/value or JWT marker in sample")
+
+    # untyped (NLP) detectors look for emails/cards/IPs/IBANs: all need digits or '@'
+    if not has_at and _ANY_DIGIT_RE.search(joined) is None:
+        untyped = [k for k, v in route.detectors.items() if v is None]
+        for k in untyped:
+            del route.detectors[k]
+        if untyped:
+            route.reasons.append("no digits or '@' in sample: NLP detectors skipped")
+
+    if route.skipped:
+        route.reasons.append("no detector can match")
+    return route
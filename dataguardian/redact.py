@@ -0,0 +1,201 @@
+"""Streaming redaction: write a sanitized copy of a file in one pass.
+
+The input is read as bytes in chunks cut at the last newline, so the
+patterns run over whole lines and memory stays at about one chunk whatever
+the file size. Each detected span is replaced in place, and the bytes
+around it are copied as they are. That keeps the layout of CSV, JSONL, SQL
+dumps and logs. Tokens are made of ``*``, letters, digits, ``[`` ``:`` and
+``]``, and a span never runs past a quote character or the field
+delimiter (sniffed for CSV/TXT): a greedy match like SENHA's
+``[^\\s]{6,}`` is cut there, so quoting and field counts stay valid.
+
+- ``mask``: ``mask_value`` with ``Settings.mask_keep_last``.
+- ``hash``: ``[TYPE:<16 hex>]``, a prefix of the findings store value hash
+  (``store.value_hash``, HMAC keyed by ``DATAGUARDIAN_STORE_HASH_KEY``).
+  The same value always gets the same token, so joins on it still work.
+  It needs the key: an unkeyed SHA-256 of a CPF or phone number is
+  brute-forced back to the value in seconds, so ``resolve_mode`` refuses.
+"""
+
+from __future__ import annotations
+
+import re
+import time
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import BinaryIO, Callable, Dict, List, Optional, Tuple
+
+from .config import Settings
+from .detectors.regex_detector import RegexDetector
+from .metrics import DETECTOR_MATCHES, DETECTOR_SECONDS
+
+REDACT_MODES = ("mask", "hash")
+CHUNK_BYTES = 4 * 1024 * 1024
+# a span ends before any of these (plus the field delimiter for delimited files)
+QUOTE_BYTES = b"\"'`"
+DELIMITED_SUFFIXES = {".csv", ".tsv", ".txt"}
+
+
+@dataclass
+class RedactStats:
+    bytes_in: int = 0
+    bytes_out: int = 0
+    seconds: float = 0.0
+    replaced: Dict[str, int] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, object]:
+        out = asdict(self)
+        out["mb_per_s"] = round(self.bytes_in / self.seconds / 1e6, 1) if self.seconds else None
+        return out
+
+
+def resolve_mode(mode: Optional[str], settings: Settings) -> str:
+    """``mode`` (default ``Settings.redact_mode``), checked; ValueError if unusable."""
+    mode = mode or settings.redact_mode
+    if mode not in REDACT_MODES:
+        raise ValueError(f"unknown redaction mode {mode!r} (expected one of {', '.join(REDACT_MODES)})")
+    if mode == "hash" and not settings.store_hash_key:
+        raise ValueError("mode 'hash' needs DATAGUARDIAN_STORE_HASH_KEY: unkeyed hashes of CPFs/phones can be reversed")
+    return mode
+
+
+def _token_fn(mode: str, settings: Settings) -> Callable[[str, bytes], bytes]:
+    from .scan import mask_value
+    from .store import value_hash
+
+    keep_last = settings.mask_keep_last
+    if mode == "hash":
+        key = settings.store_hash_key.encode()
+
+        def token(typ: str, raw: bytes) -> bytes:
+            return f"[{typ}:{value_hash(typ, raw.decode('utf-8', errors='replace'), key)[:16]}]".encode("ascii")
+        return token
+
+    def token(typ: str, raw: bytes) -> bytes:
+        try:
+            return mask_value(raw.decode("utf-8"), keep_last).encode("utf-8")
+        except UnicodeDecodeError:
+            # not UTF-8 (e.g. a cp1252 file): mask byte for byte, keep the encoding
+            keep = raw[-keep_last:] if 0 < keep_last < len(raw) else b""
+            return b"*" * (len(raw) - len(keep)) + keep
+    return token
+
+
+def _spans(
+    detector: RegexDetector, patterns: Dict[str, "object"], chunk: bytes, stops: "re.Pattern[bytes]"
+) -> List[Tuple[int, int, str]]:
+    """Validated ``(start, end, type)`` spans, cut at the first ``stops`` byte,
+    overlaps resolved leftmost-longest."""
+    found: List[Tuple[int, int, str]] = []
+    for typ, pattern in patterns.items():
+        cands = []
+        for m in pattern.finditer(chunk):
+            cut = stops.search(chunk, m.start(), m.end())
+            cands.append((m.start(), cut.start() if cut else m.end()))
+        if not cands:
+            continue
+        ok = detector.validate_mask(typ, [chunk[a:b].decode("utf-8", errors="replace") for a, b in cands])
+        found.extend((a, b, typ) for (a, b), keep in zip(cands, ok) if keep)
+    found.sort(key=lambda s: (s[0], -s[1]))
+    out: List[Tuple[int, int, str]] = []
+    end = 0
+    for a, b, typ in found:
+        if a >= end and b > a:
+            out.append((a, b, typ))
+            end = b
+    return out
+
+
+def redact_stream(
+    src: BinaryIO,
+    dst: BinaryIO,
+    *,
+    mode: Optional[str] = None,
+    settings: Optional[Settings] = None,
+    detector: Optional[RegexDetector] = None,
+    chunk_size: int = CHUNK_BYTES,
+    delimiter: bytes = b"",
+) -> RedactStats:
+    """Copy ``src`` to ``dst`` with every detected value replaced by a token.
+
+    Spans stop at quote characters and at ``delimiter`` (e.g. ``b","`` for a
+    CSV), so a replacement never swallows a field boundary.
+    """
+    settings = settings or Settings()
+    mode = resolve_mode(mode, settings)
+    detector = detector or RegexDetector()
+    patterns = detector.bytes_patterns()
+    stops = re.compile(b"[" + re.escape(QUOTE_BYTES + delimiter) + b"]")
+    token = _token_fn(mode, settings)
+    # one value shows up many times in a dump; hash/mask it once
+    memo: Dict[Tuple[str, bytes], bytes] = {}
+    stats = RedactStats()
+    counts: Counter = Counter()
+    started = time.perf_counter()
+
+    def flush(chunk: bytes) -> None:
+        t0 = time.perf_counter()
+        spans = _spans(detector, patterns, chunk, stops)
+        DETECTOR_SECONDS.inc(time.perf_counter() - t0, detector=detector.name)
+        DETECTOR_MATCHES.inc(len(spans), detector=detector.name)
+        pieces: List[bytes] = []
+        pos = 0
+        for a, b, typ in spans:
+            raw = chunk[a:b]
+            tok = memo.get((typ, raw))
+            if tok is None:
+                tok = memo[(typ, raw)] = token(typ, raw)
+                if len(memo) > 100_000:
+                    memo.clear()
+            pieces.append(chunk[pos:a])
+            pieces.append(tok)
+            pos = b
+            counts[typ] += 1
+        pieces.append(chunk[pos:])
+        out = b"".join(pieces)
+        dst.write(out)
+        stats.bytes_out += len(out)
+
+    pending = b""
+    while True:
+        data = src.read(chunk_size)
+        if not data:
+            break
+        stats.bytes_in += len(data)
+        pending += data
+        cut = pending.rfind(b"\n") + 1
+        if cut == 0 and len(pending) < 4 * chunk_size:
+            continue  # keep reading until a line ends (bounded)
+        cut = cut or len(pending)
+        flush(pending[:cut])
+        pending = pending[cut:]
+    if pending:
+        flush(pending)
+
+    stats.seconds = time.perf_counter() - started
+    stats.replaced = dict(counts)
+    return stats
+
+
+def redact_file(
+    src: str | Path,
+    dst: str | Path,
+    *,
+    mode: Optional[str] = None,
+    settings: Optional[Settings] = None,
+    detector: Optional[RegexDetector] = None,
+) -> RedactStats:
+    """Write a redacted copy of ``src`` (CSV/JSONL/SQL/TXT/log, any text) to ``dst``."""
+    src, dst = Path(src), Path(dst)
+    if src.resolve() == dst.resolve():
+        raise ValueError("refusing to redact a file onto itself")
+    delimiter = b""
+    if src.suffix.lower() in DELIMITED_SUFFIXES:
+        from .ingest import sniff_csv
+
+        fmt = sniff_csv(src, default_sep="," if src.suffix.lower() == ".csv" else "\t")
+        delimiter = (fmt.sep + fmt.quotechar).encode("ascii", errors="ignore")
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    with open(src, "rb") as fin, open(dst, "wb") as fout:
+        return redact_stream(fin, fout, mode=mode, settings=settings, detector=detector, delimiter=delimiter)
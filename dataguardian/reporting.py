@@ -1,9 +1,12 @@
 from __future__ import annotations
 
+import base64
 import json
-from dataclasses import asdict, dataclass
+import zlib
+from dataclasses import asdict, dataclass, field
 from datetime import datetime, timezone
-from typing import Any, Dict, List, Optional
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
 
 from .detectors.base import Match
 from .scoring import RiskSummary
@@ -14,6 +17,8 @@ class Finding:
     location: str
     masked_value: str
     matches: List[Match]
+    # other places the same value was seen in this scan (see valuedict)
+    also_at: List[str] = field(default_factory=list)
 
 
 @dataclass
@@ -29,22 +34,80 @@ class ScanReport:
             "created_at": self.created_at,
             "target": self.target,
             "summary": asdict(self.summary),
-            "findings": [
-                {
-                    "location": f.location,
-                    "masked_value": f.masked_value,
-                    "matches": [asdict(m) for m in f.matches],
-                }
-                for f in self.findings
-            ],
+            "findings": [finding_to_dict(f) for f in self.findings],
             "meta": self.meta,
         }
 
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ScanReport":
+        summary = data.get("summary") or {}
+        return cls(
+            created_at=data.get("created_at", ""),
+            target=data.get("target", ""),
+            summary=RiskSummary(
+                score=int(summary.get("score", 0)),
+                level=summary.get("level", "LOW"),
+                counts_by_type=dict(summary.get("counts_by_type") or {}),
+            ),
+            findings=[
+                Finding(
+                    location=f.get("location", ""),
+                    masked_value=f.get("masked_value", ""),
+                    matches=[Match(**m) for m in f.get("matches", [])],
+                    also_at=list(f.get("also_at") or []),
+                )
+                for f in data.get("findings", [])
+            ],
+            meta=data.get("meta") or {},
+        )
+
     def to_json(self, indent: int = 2) -> str:
         return json.dumps(self.to_dict(), ensure_ascii=False, indent=indent)
 
+    def iter_ndjson(self) -> Iterator[str]:
+        """NDJSON lines: a header, one line per finding, then the summary.
+
+        The summary goes last so producers can stream findings before the
+        totals are known.
+        """
+        yield json.dumps({"record": "header", "created_at": self.created_at, "target": self.target, "meta": self.meta}, ensure_ascii=False)
+        for f in self.findings:
+            yield json.dumps({"record": "finding", **finding_to_dict(f)}, ensure_ascii=False)
+        yield json.dumps({"record": "summary", **asdict(self.summary)}, ensure_ascii=False)
+
+    def to_ndjson(self) -> str:
+        return "\n".join(self.iter_ndjson()) + "\n"
+
+    def to_binary(self, path: str | Path) -> int:
+        """Write the compact ``.dgr`` format (see ``binreport``); returns its size."""
+        from .binreport import write_binary
+
+        return write_binary(self, path)
+
+    @classmethod
+    def load(cls, path: str | Path) -> "ScanReport":
+        """Load a report file: ``.dgr`` is memory-mapped with lazily read findings,
+        JSON/NDJSON are parsed in full."""
+        from .binreport import is_binary_report, load_binary
+        from .merge import read_report
+
+        return load_binary(path) if is_binary_report(path) else read_report(path)
+
 
-_HTML_TEMPLATE = """<!doctype html>
+def finding_to_dict(f: Finding) -> Dict[str, Any]:
+    out = {
+        "location": f.location,
+        "masked_value": f.masked_value,
+        "matches": [asdict(m) for m in f.matches],
+    }
+    if f.also_at:
+        out["also_at"] = f.also_at
+    return out
+
+
+HTML_PAGE_SIZE = 1000
+
+_HTML_HEAD = """<!doctype html>
 <html lang="en">
 <head>
   <meta charset="utf-8" />
@@ -59,6 +122,7 @@ _HTML_TEMPLATE = """<!doctype html>
     th { font-size: 12px; color: #475569; text-transform: uppercase; letter-spacing: .04em; }
     code { background: #f8fafc; padding: 2px 6px; border-radius: 6px; }
     .muted { color: #64748b; }
+    .pager { display: flex; gap: 8px; align-items: center; margin-bottom: 12px; }
   </style>
 </head>
 <body>
@@ -76,39 +140,160 @@ _HTML_TEMPLATE = """<!doctype html>
 
   <div class="card">
     <h2>Findings</h2>
+    {{pager}}
     <table>
       <thead><tr><th>Location</th><th>Masked value</th><th>Matches</th></tr></thead>
-      <tbody>
-        {{rows}}
-      </tbody>
+      <tbody id="rows">
+"""
+
+_HTML_FOOT = """      </tbody>
     </table>
   </div>
-</body>
+{{script}}</body>
 </html>
 """
 
+_PAGER = """<div class="pager">
+      <button id="prev">&larr;</button> <span id="page" class="muted">page 1 of {{pages}} ({{total}} findings)</span> <button id="next">&rarr;</button>
+      <select id="type"><option value="">all types</option>{{type_options}}</select>
+    </div>
+    <noscript><p class="muted">Only the first {{page_size}} findings are shown without JavaScript.</p></noscript>"""
 
-def to_html(report: ScanReport) -> str:
-    counts_li = "\n".join([f"<li><code>{k}</code>: {v}</li>" for k, v in sorted(report.summary.counts_by_type.items())]) or "<li>(none)</li>"
-    rows = []
-    for f in report.findings:
-        match_types = ", ".join(sorted({m.type for m in f.matches})) or "-"
-        rows.append(
-            "<tr>"
-            f"<td><code>{_escape(f.location)}</code></td>"
-            f"<td><code>{_escape(f.masked_value)}</code></td>"
-            f"<td>{_escape(match_types)}</td>"
-            "</tr>"
+# findings as gzip'd JSON lines, each an array of [location, masked value, types]
+# rows, decoded and paged in the browser: the DOM only ever holds one page of rows
+_PAGER_SCRIPT = """<script id="findings" type="application/octet-stream">{{data}}</script>
+<script>
+(async () => {
+  const PAGE = {{page_size}};
+  const bin = Uint8Array.from(atob(document.getElementById("findings").textContent), c => c.charCodeAt(0));
+  const text = await new Response(new Blob([bin]).stream().pipeThrough(new DecompressionStream("gzip"))).text();
+  const all = text.split("\\n").filter(Boolean).flatMap(l => JSON.parse(l));
+  const tbody = document.getElementById("rows"), label = document.getElementById("page"), sel = document.getElementById("type");
+  let rows = all, page = 0;
+  const esc = s => String(s).replace(/[&<>"']/g, c => "&#" + c.charCodeAt(0) + ";");
+  function render() {
+    const pages = Math.max(1, Math.ceil(rows.length / PAGE));
+    page = Math.min(Math.max(page, 0), pages - 1);
+    tbody.innerHTML = rows.slice(page * PAGE, (page + 1) * PAGE).map(([loc, val, types]) =>
+      `<tr><td><code>${esc(loc)}</code></td><td><code>${esc(val)}</code></td><td>${esc(types)}</td></tr>`
+    ).join("") || "<tr><td colspan=3>(no findings)</td></tr>";
+    label.textContent = `page ${page + 1} of ${pages} (${rows.length} findings)`;
+  }
+  document.getElementById("prev").onclick = () => { page--; render(); };
+  document.getElementById("next").onclick = () => { page++; render(); };
+  sel.onchange = () => {
+    const t = sel.value;
+    rows = t ? all.filter(r => r[2].split(", ").includes(t)) : all;
+    page = 0;
+    render();
+  };
+})();
+</script>
+"""
+
+
+def iter_html(report: ScanReport, *, page_size: int = HTML_PAGE_SIZE) -> Iterator[str]:
+    """HTML report in pieces, for writing/streaming without building one string.
+
+    Up to ``page_size`` findings are plain table rows. Past that, the first
+    page is still rendered as rows and every finding is embedded as
+    gzip-compressed, base64 JSON lines that a small script pages through
+    (with a type filter), so the browser never lays out 500k rows.
+    """
+    findings = report.findings
+    paged = len(findings) > page_size
+    counts = report.summary.counts_by_type
+    counts_li = "\n".join([f"<li><code>{_escape(k)}</code>: {v}</li>" for k, v in sorted(counts.items())]) or "<li>(none)</li>"
+    pager = ""
+    if paged:
+        pager = (
+            _PAGER.replace("{{pages}}", str(-(-len(findings) // page_size)))
+            .replace("{{total}}", str(len(findings)))
+            .replace("{{page_size}}", str(page_size))
+            .replace("{{type_options}}", "".join(f'<option value="{_escape(k)}">{_escape(k)}</option>' for k in sorted(counts)))
         )
 
-    html = _HTML_TEMPLATE
-    html = html.replace("{{created_at}}", _escape(report.created_at))
-    html = html.replace("{{target}}", _escape(report.target))
-    html = html.replace("{{level}}", _escape(report.summary.level))
-    html = html.replace("{{score}}", str(report.summary.score))
-    html = html.replace("{{counts_li}}", counts_li)
-    html = html.replace("{{rows}}", "\n".join(rows) if rows else "<tr><td colspan=3>(no findings)</td></tr>")
-    return html
+    head = _HTML_HEAD
+    head = head.replace("{{created_at}}", _escape(report.created_at))
+    head = head.replace("{{target}}", _escape(report.target))
+    head = head.replace("{{level}}", _escape(report.summary.level))
+    head = head.replace("{{score}}", str(report.summary.score))
+    head = head.replace("{{counts_li}}", counts_li)
+    head = head.replace("{{pager}}", pager)
+    yield head
+
+    if not findings:
+        yield "<tr><td colspan=3>(no findings)</td></tr>\n"
+    for i in range(0, min(len(findings), page_size), 500):
+        yield "".join(_html_row(f) for f in findings[i : min(i + 500, page_size)])
+
+    foot = _HTML_FOOT.split("{{script}}")
+    yield foot[0]
+    if paged:
+        script = _PAGER_SCRIPT.replace("{{page_size}}", str(page_size)).split("{{data}}")
+        yield script[0]
+        batches = (
+            json.dumps([[_html_location(f), f.masked_value, _match_types(f)] for f in findings[i : i + 10_000]], ensure_ascii=False)
+            for i in range(0, len(findings), 10_000)
+        )
+        yield from _gzip_b64_lines(batches)
+        yield script[1]
+    yield foot[1]
+
+
+def write_html(report: ScanReport, path: str | Path, *, page_size: int = HTML_PAGE_SIZE) -> None:
+    """Stream ``iter_html`` to ``path``."""
+    with open(path, "w", encoding="utf-8") as fh:
+        for piece in iter_html(report, page_size=page_size):
+            fh.write(piece)
+
+
+def to_html(report: ScanReport) -> str:
+    return "".join(iter_html(report))
+
+
+def _match_types(f: Finding) -> str:
+    return ", ".join(sorted({m.type for m in f.matches})) or "-"
+
+
+def _html_location(f: Finding) -> str:
+    return f"{f.location} (+{len(f.also_at)} more)" if f.also_at else f.location
+
+
+def _html_row(f: Finding) -> str:
+    return (
+        "<tr>"
+        f"<td><code>{_escape(_html_location(f))}</code></td>"
+        f"<td><code>{_escape(f.masked_value)}</code></td>"
+        f"<td>{_escape(_match_types(f))}</td>"
+        "</tr>\n"
+    )
+
+
+def _gzip_b64_lines(lines: Iterable[str], batch: int = 1 << 20) -> Iterator[str]:
+    """gzip + base64 of newline-joined ``lines``, produced incrementally."""
+    gz = zlib.compressobj(1, zlib.DEFLATED, 31)
+    pending = b""
+    buf: List[str] = []
+    size = 0
+
+    def encode(data: bytes, final: bool) -> Iterator[str]:
+        nonlocal pending
+        pending += data
+        cut = len(pending) if final else len(pending) - len(pending) % 3
+        if cut:
+            yield base64.b64encode(pending[:cut]).decode("ascii")
+            pending = pending[cut:]
+
+    for line in lines:
+        buf.append(line)
+        size += len(line)
+        if size >= batch:
+            yield from encode(gz.compress(("\n".join(buf) + "\n").encode("utf-8")), False)
+            buf, size = [], 0
+    if buf:
+        yield from encode(gz.compress(("\n".join(buf) + "\n").encode("utf-8")), False)
+    yield from encode(gz.flush(), True)
 
 
 def _escape(s: str) -> str:
@@ -1,44 +1,102 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import time
+from dataclasses import asdict, dataclass, field
+from itertools import islice
 from pathlib import Path
-from typing import Dict, Iterable, List, Optional, Tuple
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Tuple
 
 import pandas as pd
 
+from .budget import ScanBudget
 from .config import Settings
 from .detectors.base import Detector, Match
+from .detectors.cache import CachedDetector, DetectionCache, detector_version, shared_cache
 from .detectors.regex_detector import RegexDetector
 from .detectors.presidio_detector import PresidioDetector
+from .ingest import read_frame
+from .metrics import DETECTOR_MATCHES, DETECTOR_SECONDS, SCAN_SECONDS, SCANNED_BYTES, SCANNED_ROWS, file_type
+from .profiling import ColumnRoute, refine_by_content, route_by_dtype
 from .reporting import Finding, ScanReport, now_iso
-from .scoring import score_matches
+from .scoring import RiskSummary, score_counts, score_matches
+from .sharding import in_shard
+from .textscan import TEXT_SUFFIXES, scan_text_file
+from .tiers import FAST, NLP, EscalationPolicy, TierStats, detector_tier, escalate, exclusive_types, suspicious_header
+from .valuedict import ValueDictionary
 
 
 def mask_value(value: str, keep_last: int = 4) -> str:
     if value is None:
         return value
     s = str(value)
-    if len(s) <= keep_last:
+    if keep_last <= 0 or len(s) <= keep_last:
         return "*" * len(s)
     return "*" * (len(s) - keep_last) + s[-keep_last:]
 
 
 def default_detectors(settings: Settings) -> List[Detector]:
-    dets: List[Detector] = [RegexDetector()]
+    dets: List[Detector] = [
+        RegexDetector(
+            patterns_path=settings.patterns_path or None,
+            cell_timeout=settings.max_cell_seconds or None,
+            reload_seconds=settings.patterns_reload_seconds,
+        )
+    ]
     if settings.enable_presidio:
         p = PresidioDetector()
         if getattr(p, "available", False):
             dets.append(p)
+    if settings.detection_cache_mb > 0:
+        cache = shared_cache(settings.detection_cache_mb * 1024 * 1024)
+        dets = [CachedDetector(d, cache) for d in dets]
     return dets
 
 
+def patterns_version(detectors: Iterable[Detector]) -> Optional[str]:
+    """Version of the pattern pack the regex detector among ``detectors`` uses now."""
+    for d in detectors:
+        inner = getattr(d, "inner", d)
+        if isinstance(inner, RegexDetector):
+            return inner.refresh().version
+    return None
+
+
+def _detection_cache(detectors: Iterable[Detector]) -> Optional[DetectionCache]:
+    for d in detectors:
+        if isinstance(d, CachedDetector):
+            return d.cache
+    return None
+
+
+def cache_counts(detectors: Iterable[Detector]) -> Tuple[int, int, int]:
+    """This thread's (hits, misses, evictions) so far on the memo cache behind ``detectors``."""
+    cache = _detection_cache(detectors)
+    return cache.thread_counts() if cache is not None else (0, 0, 0)
+
+
+def cache_stats(detectors: Iterable[Detector], since: Tuple[int, int, int] = (0, 0, 0)) -> Optional[Dict[str, object]]:
+    """Memo cache metrics behind ``detectors`` (if any).
+
+    ``hits``/``misses``/``evictions`` are this thread's since ``since`` (a
+    ``cache_counts`` snapshot taken at scan start), not the shared cache's
+    process-wide totals; ``entries``/``bytes`` describe the whole cache.
+    """
+    cache = _detection_cache(detectors)
+    if cache is None:
+        return None
+    hits, misses, evictions = (now - before for now, before in zip(cache.thread_counts(), since))
+    stats = cache.stats()
+    lookups = hits + misses
+    stats.update(hits=hits, misses=misses, evictions=evictions, hit_rate=round(hits / lookups, 4) if lookups else 0.0)
+    return stats
+
+
 def scan_text(text: str, *, target: str = "text", settings: Optional[Settings] = None, detectors: Optional[List[Detector]] = None) -> ScanReport:
     settings = settings or Settings()
     detectors = detectors or default_detectors(settings)
 
-    matches: List[Match] = []
-    for d in detectors:
-        matches.extend(d.detect(text))
+    tiers = TierStats()
+    matches = _detect_tiered(detectors, [text], policy=EscalationPolicy.parse(settings.nlp_escalation), stats=tiers)[0]
 
     summary = score_matches(matches)
     findings = []
@@ -50,108 +108,417 @@ def scan_text(text: str, *, target: str = "text", settings: Optional[Settings] =
         target=target,
         summary=summary,
         findings=findings,
-        meta={"rows_scanned": 1, "detectors": [getattr(d, "name", d.__class__.__name__) for d in detectors]},
+        meta={"rows_scanned": 1, "detectors": [getattr(d, "name", d.__class__.__name__) for d in detectors], "tiers": tiers.to_dict()},
+    )
+
+
+@dataclass
+class TextBatchResult:
+    """Compact result of ``scan_texts``: only the items with matches, plus totals."""
+
+    summary: RiskSummary
+    items: List[Dict[str, Any]]
+    texts_scanned: int = 0
+    meta: Dict[str, Any] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"summary": asdict(self.summary), "texts_scanned": self.texts_scanned, "items": self.items, "meta": self.meta}
+
+
+def _timed_detect(d: Detector, values: List[str], **kwargs: Any) -> List[List[Match]]:
+    """``detect_many`` (or per-value ``detect``), recording detector time and matches."""
+    name = getattr(d, "name", d.__class__.__name__)
+    started = time.perf_counter()
+    detect_many = getattr(d, "detect_many", None)
+    results = detect_many(values, **kwargs) if detect_many else [d.detect(t) for t in values]
+    DETECTOR_SECONDS.inc(time.perf_counter() - started, detector=name)
+    DETECTOR_MATCHES.inc(sum(len(r) for r in results), detector=name)
+    return results
+
+
+def _route_kwargs(d: Detector, route: Optional[ColumnRoute]) -> Optional[Dict[str, Any]]:
+    """``detect_many`` kwargs for ``d`` under ``route``; None if the route drops it."""
+    if route is None:
+        return {}
+    name = getattr(d, "name", d.__class__.__name__)
+    if name not in route.detectors:
+        return None
+    return {"types": route.detectors[name]} if route.detectors[name] is not None else {}
+
+
+def _detect_tiered(
+    detectors: List[Detector],
+    values: List[str],
+    *,
+    policy: EscalationPolicy,
+    stats: TierStats,
+    route: Optional[ColumnRoute] = None,
+    column: Optional[str] = None,
+) -> List[List[Match]]:
+    """Matches per value: the fast tier on all of ``values``, the nlp tier on
+    the ones ``policy`` escalates (see ``tiers``)."""
+    per_value: List[List[Match]] = [[] for _ in values]
+    active = [(d, kw) for d in detectors for kw in [_route_kwargs(d, route)] if kw is not None]
+    fast = [(d, kw) for d, kw in active if detector_tier(d) == FAST]
+    nlp = [d for d, _ in active if detector_tier(d) == NLP]
+
+    if fast:
+        stats.values[FAST] += len(values)
+    for d, kwargs in fast:
+        for acc, found in zip(per_value, _timed_detect(d, values, **kwargs)):
+            acc.extend(found)
+            stats.matches[FAST] += len(found)
+
+    if nlp:
+        fast_types = {t for d, kw in fast for t in (kw.get("types") or getattr(d, "types", None) or ())}
+        covering = {id(d) for d in nlp if exclusive_types(d, fast_types)}
+        picked = escalate(policy, values, per_value, stats, column=column, coverage=bool(covering))
+        stats.values[NLP] += len(picked)
+        for d in nlp:
+            rows = [i for i, why in picked if why != "coverage" or id(d) in covering]
+            if not rows:
+                continue
+            for i, found in zip(rows, _timed_detect(d, [values[i] for i in rows])):
+                per_value[i].extend(found)
+                stats.matches[NLP] += len(found)
+    return per_value
+
+
+def _detect_deduped(
+    detectors: List[Detector],
+    values: List[str],
+    value_dict: ValueDictionary,
+    *,
+    policy: EscalationPolicy,
+    stats: TierStats,
+    route: Optional[ColumnRoute] = None,
+    column: Optional[str] = None,
+) -> Tuple[List[List[Match]], list]:
+    """``_detect_tiered`` on the values ``value_dict`` hasn't seen in this
+    detection context; returns matches per value and the dictionary entries."""
+    # results depend on which detectors ran (and their pattern versions), the
+    # route's detectors/types and NLP header escalation
+    ran = tuple(detector_version(getattr(d, "inner", d)) for d in detectors)
+    routed = None if route is None else tuple(sorted(((k, tuple(v) if v is not None else None) for k, v in route.detectors.items()), key=lambda kv: kv[0]))
+    context: Hashable = (ran, routed, bool(policy.header and column is not None and suspicious_header(column)))
+    entries, missing = value_dict.lookup(values, context)
+    if missing:
+        todo = [values[i] for i in missing]
+        for i, found in zip(missing, _detect_tiered(detectors, todo, policy=policy, stats=stats, route=route, column=column)):
+            entries[i].results[context] = tuple(found)
+    return [list(e.results[context]) for e in entries], entries
+
+
+def scan_texts(
+    texts: Iterable[str],
+    *,
+    settings: Optional[Settings] = None,
+    detectors: Optional[List[Detector]] = None,
+    batch_size: int = 1000,
+    value_dict: Optional[ValueDictionary] = None,
+) -> TextBatchResult:
+    """Scan many small texts (log lines, messages) with batched detector calls.
+
+    ``texts`` is consumed ``batch_size`` at a time, so it can be a generator.
+    Repeated texts are detected once (across batches too, through the
+    scan's ``ValueDictionary`` when ``Settings.value_dict_entries`` > 0). Each item with matches
+    becomes ``{"index", "types": {type: count}, "values": [masked match]}``:
+    no per-text report, timestamp or masked copy of the whole text.
+    """
+    settings = settings or Settings()
+    detectors = detectors or default_detectors(settings)
+
+    policy = EscalationPolicy.parse(settings.nlp_escalation)
+    tiers = TierStats()
+    if value_dict is None and settings.value_dict_entries > 0:
+        value_dict = ValueDictionary(settings.value_dict_entries)
+    items: List[Dict[str, Any]] = []
+    counts: Dict[str, int] = {}
+    it = iter(texts)
+    offset = 0
+    while True:
+        batch = [str(t)[: settings.max_chars_per_cell] if t is not None else "" for t in islice(it, max(1, batch_size))]
+        if not batch:
+            break
+        unique = list(dict.fromkeys(batch))
+        if value_dict is not None:
+            results, _ = _detect_deduped(detectors, unique, value_dict, policy=policy, stats=tiers)
+        else:
+            results = _detect_tiered(detectors, unique, policy=policy, stats=tiers)
+        per_value = dict(zip(unique, results))
+
+        for i, text in enumerate(batch):
+            found = per_value[text]
+            if not found:
+                continue
+            types: Dict[str, int] = {}
+            for m in found:
+                types[m.type] = types.get(m.type, 0) + 1
+                counts[m.type] = counts.get(m.type, 0) + 1
+            items.append({"index": offset + i, "types": types, "values": [mask_value(m.raw, settings.mask_keep_last) for m in found]})
+        offset += len(batch)
+
+    return TextBatchResult(
+        summary=score_counts(counts),
+        items=items,
+        texts_scanned=offset,
+        meta={
+            "detectors": [getattr(d, "name", d.__class__.__name__) for d in detectors],
+            "tiers": tiers.to_dict(),
+            **({"value_dict": value_dict.stats()} if value_dict is not None else {}),
+        },
     )
 
 
-def scan_dataframe(df: pd.DataFrame, *, target: str = "dataframe", settings: Optional[Settings] = None, detectors: Optional[List[Detector]] = None) -> ScanReport:
+def scan_dataframe(
+    df: pd.DataFrame,
+    *,
+    target: str = "dataframe",
+    settings: Optional[Settings] = None,
+    detectors: Optional[List[Detector]] = None,
+    budget: Optional[ScanBudget] = None,
+    value_dict: Optional[ValueDictionary] = None,
+) -> ScanReport:
+    """Scan the cells of ``df``: one finding per distinct value with matches.
+
+    With a ``value_dict`` (created per call when ``Settings.value_dict_entries``
+    > 0, or shared by ``scan_path`` across a folder) a value already seen
+    elsewhere in the scan is neither detected nor reported again: its
+    location is appended to the first finding's ``also_at``.
+    """
     settings = settings or Settings()
     detectors = detectors or default_detectors(settings)
+    budget = budget or ScanBudget.for_scan(settings)
+    if value_dict is None and settings.value_dict_entries > 0:
+        value_dict = ValueDictionary(settings.value_dict_entries)
+    timeouts_before = sum(getattr(d, "timeouts", 0) for d in detectors)
+    cache_before = cache_counts(detectors)
+    policy = EscalationPolicy.parse(settings.nlp_escalation)
+    tiers = TierStats()
 
     findings: List[Finding] = []
     all_matches: List[Match] = []
 
+    # columns the reader already left out (see ingest.read_csv_frame)
+    routing: Dict[str, Dict[str, object]] = dict(df.attrs.get("routing", {}))
+    columns_unscanned: List[str] = []
+
     max_rows = min(settings.max_rows_preview, len(df))
     for col in df.columns:
+        reason = budget.exceeded()
+        if reason:
+            budget.stop(reason)
+            columns_unscanned = [str(c) for c in df.columns[list(df.columns).index(col) :]]
+            break
+
+        route = None
+        if settings.route_columns:
+            route = route_by_dtype(str(col), df[col], detectors)
+            if route.skipped:
+                routing[str(col)] = route.to_dict()
+                continue
+
         series = df[col].dropna().astype(str)
 
         # safety: cap huge cells (DoS-ish)
         series = series.map(lambda x: x[: settings.max_chars_per_cell])
 
         values = series.head(max_rows).unique().tolist()[: settings.max_unique_per_column]
+        budget.charge(nbytes=sum(len(v) for v in values))
 
-        for i, text in enumerate(values):
-            m_here: List[Match] = []
-            for d in detectors:
-                m_here.extend(d.detect(text))
+        if route is not None:
+            route = refine_by_content(route, values)
+            routing[str(col)] = route.to_dict()
 
-            if m_here:
+        # whole column per detector call, so batch-capable detectors can
+        # validate every candidate of the column at once
+        entries: list = []
+        if value_dict is not None:
+            per_value, entries = _detect_deduped(detectors, values, value_dict, policy=policy, stats=tiers, route=route, column=str(col))
+        else:
+            per_value = _detect_tiered(detectors, values, policy=policy, stats=tiers, route=route, column=str(col))
+
+        location = f"column:{col}"
+        for i, (text, m_here) in enumerate(zip(values, per_value)):
+            if not m_here:
+                continue
+            entry = entries[i] if entries else None
+            if entry is not None and entry.finding is not None:
+                # seen before in this scan: one more location, same finding
+                entry.finding.also_at.append(location if entry.target == target else f"{target}:{location}")
                 all_matches.extend(m_here)
-                findings.append(
-                    Finding(
-                        location=f"column:{col}",
-                        masked_value=mask_value(text, settings.mask_keep_last),
-                        matches=m_here,
-                    )
-                )
+                continue
+            full = budget.findings_full()
+            if full:
+                budget.stop(full)
+                break
+            budget.charge(findings=1)
+            all_matches.extend(m_here)
+            finding = Finding(location=location, masked_value=mask_value(text, settings.mask_keep_last), matches=m_here)
+            findings.append(finding)
+            if entry is not None:
+                entry.finding, entry.target = finding, target
 
     summary = score_matches(all_matches)
+    meta = {
+        "rows_scanned": max_rows,
+        "columns": list(map(str, df.columns)),
+        "detectors": [getattr(d, "name", d.__class__.__name__) for d in detectors],
+    }
+    meta["tiers"] = tiers.to_dict()
+    meta["budget"] = budget.to_meta()
+    meta["budget"]["cell_timeouts"] = sum(getattr(d, "timeouts", 0) for d in detectors) - timeouts_before
+    if columns_unscanned:
+        meta["budget"]["columns_unscanned"] = columns_unscanned
+    if "parse_error" in df.attrs:
+        meta["parse_error"] = df.attrs["parse_error"]
+    if routing:
+        meta["routing"] = routing
+        meta["columns_skipped"] = sum(1 for r in routing.values() if r["skipped"])
+    stats = cache_stats(detectors, since=cache_before)
+    if stats:
+        meta["cache"] = stats
+    if value_dict is not None:
+        meta["value_dict"] = value_dict.stats()
     return ScanReport(
         created_at=now_iso(),
         target=target,
         summary=summary,
         findings=findings,
-        meta={
-            "rows_scanned": max_rows,
-            "columns": list(map(str, df.columns)),
-            "detectors": [getattr(d, "name", d.__class__.__name__) for d in detectors],
-        },
+        meta=meta,
     )
 
 
-def scan_path(path: str | Path, *, settings: Optional[Settings] = None) -> ScanReport:
+def _scan_file(
+    p: Path,
+    *,
+    settings: Settings,
+    budget: ScanBudget,
+    detectors: Optional[List[Detector]],
+    value_dict: Optional[ValueDictionary] = None,
+) -> ScanReport:
+    if settings.raw_text_scan and p.suffix.lower() in TEXT_SUFFIXES:
+        return scan_text_file(p, settings=settings, budget=budget)
+
+    size = p.stat().st_size
+    if settings.max_file_bytes and size > settings.max_file_bytes:
+        # structured files can't be cut at a byte offset, so an oversized one is skipped
+        budget.stop(f"file byte budget ({settings.max_file_bytes}): {size} bytes, not parsed")
+        return ScanReport(
+            created_at=now_iso(),
+            target=str(p),
+            summary=score_matches([]),
+            findings=[],
+            meta={"budget": budget.to_meta()},
+        )
+
+    detectors = detectors or default_detectors(settings)
+    df = read_frame(p, settings=settings, detectors=detectors)
+    return scan_dataframe(df, target=str(p), settings=settings, detectors=detectors, budget=budget, value_dict=value_dict)
+
+
+def _stamp_patterns(meta: Dict[str, object], before: Optional[str], detectors: List[Detector]) -> None:
+    # a pack reloaded mid-scan leaves a mixed report: no version, so it isn't cached under either
+    if before is not None and patterns_version(detectors) == before:
+        meta["patterns"] = before
+    else:
+        meta.pop("patterns", None)
+
+
+def scan_path(
+    path: str | Path,
+    *,
+    settings: Optional[Settings] = None,
+    budget: Optional[ScanBudget] = None,
+    shard: Optional[Tuple[int, int]] = None,
+    detectors: Optional[List[Detector]] = None,
+    value_dict: Optional[ValueDictionary] = None,
+) -> ScanReport:
     """Scan a file or folder.
 
     For folders, we scan supported files and aggregate (simple merge).
+    Each file gets its own child budget (``max_file_*``) under the scan one.
+    ``shard=(i, N)`` keeps only the folder files assigned to shard ``i``
+    (by path relative to the folder; a single file goes by its name, and
+    one outside the shard yields an empty report).
+    One ``ValueDictionary`` is shared by every file of the scan.
     """
     settings = settings or Settings()
+    budget = budget or ScanBudget.for_scan(settings)
+    detectors = detectors or default_detectors(settings)
+    if value_dict is None and settings.value_dict_entries > 0:
+        value_dict = ValueDictionary(settings.value_dict_entries)
     p = Path(path)
 
     if not p.exists():
         raise FileNotFoundError(str(p))
+    patterns = patterns_version(detectors)
 
-    from core.file_processor import process_file  # reuse existing robust parsing
+    if p.is_file() and shard is not None and not in_shard(p.name, shard):
+        return ScanReport(
+            created_at=now_iso(),
+            target=str(p),
+            summary=score_counts({}),
+            findings=[],
+            meta={"files_scanned": 0, "shard": f"{shard[0]}/{shard[1]}"},
+        )
 
     if p.is_file():
-        # emulate UploadedFile-ish object
-        class _F:
-            def __init__(self, file_path: Path):
-                self.name = file_path.name
-                self.type = ""
-                self._b = file_path.read_bytes()
-                self._pos = 0
-            def read(self):
-                self._pos = len(self._b)
-                return self._b
-            def seek(self, pos: int):
-                self._pos = pos
-
-        df = process_file(_F(p))
-        return scan_dataframe(df, target=str(p), settings=settings)
+        file_budget = budget.child("file", seconds=settings.max_file_seconds, max_bytes=settings.max_file_bytes)
+        report = _scan_file(p, settings=settings, budget=file_budget, detectors=detectors, value_dict=value_dict)
+        kind = file_type(p)
+        SCAN_SECONDS.observe(file_budget.elapsed, file_type=kind)
+        SCANNED_BYTES.inc(file_budget.bytes, file_type=kind)
+        SCANNED_ROWS.inc(report.meta.get("rows_scanned") or 0, file_type=kind)
+        _stamp_patterns(report.meta, patterns, detectors)
+        return report
 
     # folder: aggregate reports
-    supported = {".csv", ".json", ".jsonl", ".txt", ".sql"}
+    supported = {".csv", ".json", ".jsonl", ".sql"} | TEXT_SUFFIXES
+    files = [fp for fp in sorted(p.rglob("*")) if fp.is_file() and fp.suffix.lower() in supported]
+    if shard is not None:
+        files = [fp for fp in files if in_shard(fp.relative_to(p).as_posix(), shard)]
     reports: List[ScanReport] = []
-    for fp in sorted(p.rglob("*")):
-        if fp.is_file() and fp.suffix.lower() in supported:
-            try:
-                reports.append(scan_path(fp, settings=settings))
-            except Exception:
-                continue
+    files_unscanned = 0
+    for i, fp in enumerate(files):
+        reason = budget.exceeded()
+        if reason:
+            budget.stop(reason)
+            files_unscanned = len(files) - i
+            break
+        try:
+            reports.append(scan_path(fp, settings=settings, budget=budget, detectors=detectors, value_dict=value_dict))
+        except Exception:
+            continue
 
-    # merge
+    # merge; counts come from the file summaries, which include repeats
+    # folded into an earlier file's finding (also_at)
     all_findings: List[Finding] = []
-    all_matches: List[Match] = []
+    counts: Dict[str, int] = {}
     for r in reports:
         all_findings.extend(r.findings)
-        for f in r.findings:
-            all_matches.extend(f.matches)
+        for t, n in r.summary.counts_by_type.items():
+            counts[t] = counts.get(t, 0) + n
 
-    summary = score_matches(all_matches)
+    summary = score_counts(counts)
+    meta: Dict[str, object] = {
+        "files_scanned": len(reports),
+        "detectors": [getattr(d, "name", d.__class__.__name__) for d in detectors],
+        "budget": {
+            **budget.to_meta(),
+            "files_unscanned": files_unscanned,
+            "files_truncated": [r.target for r in reports if r.meta.get("budget", {}).get("truncated")],
+        },
+    }
+    if shard is not None:
+        meta["shard"] = f"{shard[0]}/{shard[1]}"
+    if value_dict is not None:
+        meta["value_dict"] = value_dict.stats()
+    _stamp_patterns(meta, patterns, detectors)
     return ScanReport(
         created_at=now_iso(),
         target=str(p),
         summary=summary,
         findings=all_findings,
-        meta={"files_scanned": len(reports), "detectors": default_detectors(settings) and [getattr(d, "name", d.__class__.__name__) for d in default_detectors(settings)]},
+        meta=meta,
     )
@@ -13,6 +13,7 @@ _DEFAULT_WEIGHTS: Dict[str, int] = {
     "CREDIT_CARD_NUMBER": 10,
     "CPF": 9,
     "CNPJ": 9,
+    "PIS": 9,
     "PASSWORD": 9,
     "API_KEY": 9,
     "TOKEN": 9,
@@ -38,11 +39,20 @@ def normalize_type(t: str) -> str:
 
 def score_matches(matches: Iterable[Match]) -> RiskSummary:
     counts: Dict[str, int] = {}
-    score = 0
     for m in matches:
         t = normalize_type(m.type)
         counts[t] = counts.get(t, 0) + 1
-        score += _DEFAULT_WEIGHTS.get(t, 3)
+    return score_counts(counts)
+
+
+def score_counts(counts: Dict[str, int]) -> RiskSummary:
+    """Score from per-type match counts (used to re-score merged reports)."""
+    normalized: Dict[str, int] = {}
+    for t, n in counts.items():
+        if n:
+            normalized[normalize_type(t)] = normalized.get(normalize_type(t), 0) + int(n)
+    counts = normalized
+    score = sum(_DEFAULT_WEIGHTS.get(t, 3) * n for t, n in counts.items())
 
     # volume penalty (helps show seriousness on dumps)
     total = sum(counts.values())
@@ -0,0 +1,33 @@
+"""Deterministic file sharding for multi-node scans.
+
+A file belongs to shard ``hash(relative path) % N``. The path is taken
+relative to the scan root (POSIX separators), so every node computes the same
+assignment no matter where the share is mounted.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from typing import Tuple
+
+
+def parse_shard(spec: str) -> Tuple[int, int]:
+    """Parse ``"i/N"`` (0-based ``i``) into ``(i, N)``."""
+    try:
+        i_s, n_s = spec.split("/", 1)
+        index, count = int(i_s), int(n_s)
+    except ValueError:
+        raise ValueError(f"invalid shard {spec!r}: expected 'i/N', e.g. '0/4'") from None
+    if count < 1 or not 0 <= index < count:
+        raise ValueError(f"invalid shard {spec!r}: need 0 <= i < N")
+    return index, count
+
+
+def shard_of(relative_path: str, count: int) -> int:
+    digest = hashlib.sha1(relative_path.encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") % count
+
+
+def in_shard(relative_path: str, shard: Tuple[int, int]) -> bool:
+    index, count = shard
+    return shard_of(relative_path, count) == index
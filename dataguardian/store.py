@@ -0,0 +1,178 @@
+"""Persistent, indexed findings store (SQLite).
+
+Every match of a ``ScanReport`` becomes one row, indexed by value hash,
+type, target and time, so "where has this CPF appeared in the last 90 days?"
+is an index lookup instead of re-reading old reports.
+
+Raw values are never stored. ``value_hash`` normalizes the value (digits only
+for numeric IDs, lowercase for emails) and hashes it with HMAC-SHA256 keyed by
+``DATAGUARDIAN_STORE_HASH_KEY``. Without a key it falls back to plain SHA-256,
+which is brute-forceable for small spaces like CPF — set the key in
+production.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import hmac
+import re
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from .config import Settings
+from .reporting import ScanReport
+from .scoring import normalize_type
+
+_DIGIT_TYPES = {"CPF", "CNPJ", "PIS", "CREDIT_CARD", "CREDITCARD", "CREDIT_CARD_NUMBER", "TELEFONE", "PHONE"}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS scans (
+    scan_id TEXT PRIMARY KEY,
+    created_at REAL NOT NULL,
+    target TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    level TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS findings (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    scan_id TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    target TEXT NOT NULL,
+    location TEXT NOT NULL,
+    type TEXT NOT NULL,
+    detector TEXT NOT NULL,
+    value_hash TEXT NOT NULL,
+    masked_value TEXT
+);
+CREATE INDEX IF NOT EXISTS findings_value_hash ON findings (value_hash, created_at);
+CREATE INDEX IF NOT EXISTS findings_type ON findings (type, created_at);
+CREATE INDEX IF NOT EXISTS findings_target ON findings (target, created_at);
+CREATE INDEX IF NOT EXISTS findings_created_at ON findings (created_at);
+"""
+
+
+def normalize_value(typ: str, value: str) -> str:
+    t = normalize_type(typ)
+    if t in _DIGIT_TYPES:
+        return re.sub(r"\D", "", value or "")
+    if t == "EMAIL":
+        return (value or "").strip().lower()
+    return (value or "").strip()
+
+
+@lru_cache(maxsize=1)
+def configured_hash_key() -> Optional[bytes]:
+    """``Settings.store_hash_key`` as bytes, or None if unset."""
+    key = Settings().store_hash_key
+    return key.encode() if key else None
+
+
+def value_hash(typ: str, value: str, key: Optional[bytes] = None) -> str:
+    """Stable hash of a normalized raw value (HMAC if a key is configured)."""
+    if key is None:
+        key = configured_hash_key()
+    data = normalize_value(typ, value).encode("utf-8")
+    if key:
+        return hmac.new(key, data, hashlib.sha256).hexdigest()
+    return hashlib.sha256(data).hexdigest()
+
+
+def _epoch(iso: str) -> float:
+    try:
+        return datetime.fromisoformat(iso).timestamp()
+    except (TypeError, ValueError):
+        return time.time()
+
+
+class FindingsStore:
+    def __init__(self, db_path: str | Path, *, hash_key: Optional[bytes] = None) -> None:
+        Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        self.db_path = str(db_path)
+        self._key = hash_key
+        self._conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self._lock = threading.Lock()
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def add_report(self, report: ScanReport) -> str:
+        """Insert every match of ``report`` in one transaction; returns the scan id."""
+        scan_id = uuid.uuid4().hex
+        created = _epoch(report.created_at)
+        rows = [
+            (scan_id, created, report.target, loc, normalize_type(m.type), m.detector, value_hash(m.type, m.raw, self._key), f.masked_value)
+            for f in report.findings
+            for loc in [f.location, *f.also_at]
+            for m in f.matches
+        ]
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(
+                    "INSERT INTO scans (scan_id, created_at, target, score, level) VALUES (?, ?, ?, ?, ?)",
+                    (scan_id, created, report.target, report.summary.score, report.summary.level),
+                )
+                self._conn.executemany(
+                    "INSERT INTO findings (scan_id, created_at, target, location, type, detector, value_hash, masked_value) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return scan_id
+
+    def add_reports(self, reports: Iterable[ScanReport]) -> List[str]:
+        return [self.add_report(r) for r in reports]
+
+    def query(
+        self,
+        *,
+        value_hash: Optional[str] = None,
+        type: Optional[str] = None,
+        target: Optional[str] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        limit: int = 100,
+    ) -> List[Dict[str, Any]]:
+        """Findings matching every given filter, newest first (times are epoch seconds)."""
+        where: List[str] = []
+        args: List[Any] = []
+        for col, val in (("value_hash", value_hash), ("type", normalize_type(type) if type else None), ("target", target)):
+            if val is not None:
+                where.append(f"{col} = ?")
+                args.append(val)
+        if since is not None:
+            where.append("created_at >= ?")
+            args.append(since)
+        if until is not None:
+            where.append("created_at < ?")
+            args.append(until)
+        sql = "SELECT scan_id, created_at, target, location, type, detector, value_hash, masked_value FROM findings"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY created_at DESC LIMIT ?"
+        args.append(int(limit))
+
+        with self._lock:
+            rows = self._conn.execute(sql, args).fetchall()
+        keys = ("scan_id", "created_at", "target", "location", "type", "detector", "value_hash", "masked_value")
+        out = []
+        for row in rows:
+            item = dict(zip(keys, row))
+            item["created_at"] = datetime.fromtimestamp(item["created_at"]).astimezone().isoformat()
+            out.append(item)
+        return out
+
+    def find_value(self, value: str, typ: str, *, days: Optional[float] = None, limit: int = 100) -> List[Dict[str, Any]]:
+        """Where has this raw value appeared (optionally within the last ``days``)?"""
+        since = time.time() - days * 86400 if days else None
+        return self.query(value_hash=value_hash(typ, value, self._key), type=typ, since=since, limit=limit)
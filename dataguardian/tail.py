@@ -0,0 +1,277 @@
+"""Incremental ("tail") scanning of growing log/JSONL files.
+
+A JSON state file keeps one checkpoint per file: device + inode, the byte
+offset just past the last complete line scanned, the line number there,
+and the bytes of the trailing partial line. Each run scans only
+``[offset, last newline]`` of what was appended, so its cost follows the
+new data, not the file size.
+
+- Truncation (same inode, size < offset, e.g. ``copytruncate``) restarts
+  the file at byte 0.
+- Rotation (the path now has another inode) first finishes the old file
+  if it is still next to it under another name (``app.log.1``), else
+  scans the saved partial line, then starts the new file at byte 0.
+
+JSONL files are scanned as raw text like logs (``line:N:byte:OFF``).
+"""
+
+from __future__ import annotations
+
+import base64
+import json
+import os
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .budget import ScanBudget
+from .config import Settings
+from .detectors.base import Match
+from .detectors.regex_detector import RegexDetector
+from .reporting import Finding, ScanReport, now_iso
+from .scoring import score_matches
+from .textscan import TEXT_SUFFIXES, count_newlines, scan_text_file
+
+TAIL_SUFFIXES = TEXT_SUFFIXES | {".jsonl", ".ndjson"}
+# a "line" longer than this is scanned even without its newline
+MAX_PARTIAL_BYTES = 1024 * 1024
+
+
+@dataclass
+class Checkpoint:
+    dev: int
+    inode: int
+    offset: int = 0
+    line: int = 1
+    partial: str = ""  # base64 of the bytes after ``offset`` seen last run
+    updated_at: float = 0.0
+
+    @property
+    def partial_bytes(self) -> bytes:
+        return base64.b64decode(self.partial) if self.partial else b""
+
+
+class TailState:
+    """Checkpoints by absolute path, persisted atomically as JSON."""
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self.checkpoints: Dict[str, Checkpoint] = {}
+        if self.path.exists():
+            raw = json.loads(self.path.read_text(encoding="utf-8") or "{}")
+            self.checkpoints = {k: Checkpoint(**v) for k, v in raw.get("files", {}).items()}
+
+    def get(self, file: Path) -> Optional[Checkpoint]:
+        return self.checkpoints.get(str(file.resolve()))
+
+    def set(self, file: Path, cp: Checkpoint) -> None:
+        cp.updated_at = time.time()
+        self.checkpoints[str(file.resolve())] = cp
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        tmp.write_text(json.dumps({"files": {k: asdict(v) for k, v in self.checkpoints.items()}}, indent=2), encoding="utf-8")
+        os.replace(tmp, self.path)
+
+
+def _last_newline(fh, lo: int, hi: int) -> int:
+    """Offset just past the last ``\\n`` in ``[lo, hi)``, or ``lo`` if none."""
+    pos = hi
+    while pos > lo:
+        a = max(lo, pos - 64 * 1024)
+        fh.seek(a)
+        i = fh.read(pos - a).rfind(b"\n")
+        if i >= 0:
+            return a + i + 1
+        pos = a
+    return lo
+
+
+def _find_rotated(file: Path, dev: int, inode: int) -> Optional[Path]:
+    """The old file, renamed next to ``file`` by log rotation (same dev/inode)."""
+    try:
+        siblings = list(file.parent.iterdir())
+    except OSError:
+        return None
+    for sib in siblings:
+        if sib == file or not sib.name.startswith(file.name):
+            continue
+        try:
+            st = sib.stat()
+        except OSError:
+            continue
+        if st.st_dev == dev and st.st_ino == inode:
+            return sib
+    return None
+
+
+def _scan_range(
+    file: Path, start: int, end: int, line: int, *, settings: Settings, detector: RegexDetector, budget: ScanBudget
+) -> Tuple[ScanReport, int, int]:
+    """Scan ``[start, end)``; returns (report, offset reached, line number there).
+
+    When a budget cuts the scan short, the offset goes back to the start of
+    the line it stopped in, so the next run rescans that line rather than
+    skipping what was left unreported. A single line holding more findings
+    than the budget allows keeps the mid-line offset instead, so each run
+    still makes progress.
+    """
+    report = scan_text_file(file, settings=settings, detector=detector, budget=budget, start=start, end=end, first_line=line)
+    reached = start + int(report.meta.get("bytes_scanned", 0))
+    with open(file, "rb") as fh:
+        if reached < end:
+            line_start = _last_newline(fh, start, reached)
+            if line_start > start:
+                reached = line_start
+        line += count_newlines(fh, start, reached)
+    return report, reached, line
+
+
+def tail_file(
+    file: str | Path,
+    state: TailState,
+    *,
+    settings: Optional[Settings] = None,
+    detector: Optional[RegexDetector] = None,
+    budget: Optional[ScanBudget] = None,
+    from_end: bool = False,
+) -> ScanReport:
+    """Scan what was appended to ``file`` since its checkpoint, and move the checkpoint.
+
+    A file without a checkpoint is scanned from the top, or only marked at
+    its current end with ``from_end=True``.
+    """
+    settings = settings or Settings()
+    detector = detector or RegexDetector()
+    budget = budget or ScanBudget.for_scan(settings)
+    p = Path(file)
+    st = p.stat()
+    cp = state.get(p)
+    events: List[str] = []
+    reports: List[ScanReport] = []
+
+    if cp is not None and (cp.dev, cp.inode) != (st.st_dev, st.st_ino):
+        old = _find_rotated(p, cp.dev, cp.inode)
+        if old is not None:
+            # finish the rotated file, partial last line included: it won't grow any more
+            r, _, _ = _scan_range(old, cp.offset, old.stat().st_size, cp.line, settings=settings, detector=detector, budget=budget)
+            for f in r.findings:
+                f.location = f"{old.name}:{f.location}"
+            reports.append(r)
+            events.append(f"rotated: finished {old.name} from byte {cp.offset}")
+        elif cp.partial:
+            reports.append(_scan_partial(cp, p, settings=settings, detector=detector))
+            events.append("rotated: old file gone, scanned its saved partial line")
+        else:
+            events.append("rotated: old file gone")
+        cp = None
+    elif cp is not None and st.st_size < cp.offset:
+        events.append(f"truncated: {cp.offset} -> {st.st_size} bytes, restarting at 0")
+        cp = None
+
+    if cp is None:
+        cp = Checkpoint(dev=st.st_dev, inode=st.st_ino)
+        if from_end:
+            with open(p, "rb") as fh:
+                cp.offset = _last_newline(fh, 0, st.st_size)
+            events.append(f"new file: starting at byte {cp.offset}")
+            # line numbers are unknown without reading the file; count them once
+            with open(p, "rb") as fh:
+                cp.line = 1 + count_newlines(fh, 0, cp.offset)
+
+    start = cp.offset
+    with open(p, "rb") as fh:
+        end = _last_newline(fh, start, st.st_size)
+        if end == start and st.st_size - start > MAX_PARTIAL_BYTES:
+            end = st.st_size  # no newline in sight: don't wait forever
+        fh.seek(end)
+        partial = fh.read(min(st.st_size - end, MAX_PARTIAL_BYTES))
+
+    offset, line = start, cp.line
+    if end > start:
+        r, offset, line = _scan_range(p, start, end, cp.line, settings=settings, detector=detector, budget=budget)
+        reports.append(r)
+
+    state.set(p, Checkpoint(
+        dev=st.st_dev,
+        inode=st.st_ino,
+        offset=offset,
+        line=line,
+        partial=base64.b64encode(partial).decode("ascii") if offset == end else "",
+    ))
+    report = _combine(reports, target=str(p))
+    report.meta.update({"mode": "tail", "byte_range": [start, offset], "new_bytes": offset - start, "events": events})
+    return report
+
+
+def tail_path(
+    path: str | Path,
+    state_path: str | Path,
+    *,
+    settings: Optional[Settings] = None,
+    budget: Optional[ScanBudget] = None,
+    from_end: bool = False,
+) -> ScanReport:
+    """Tail a file, or every log/JSONL file under a folder, saving checkpoints once at the end.
+
+    Findings of a folder run are prefixed with the file's relative path.
+    """
+    settings = settings or Settings()
+    budget = budget or ScanBudget.for_scan(settings)
+    detector = RegexDetector()
+    state = TailState(state_path)
+    p = Path(path)
+    if not p.exists():
+        raise FileNotFoundError(str(p))
+
+    files = [p] if p.is_file() else [fp for fp in sorted(p.rglob("*")) if fp.is_file() and fp.suffix.lower() in TAIL_SUFFIXES]
+    reports: List[ScanReport] = []
+    per_file: Dict[str, Dict[str, object]] = {}
+    for fp in files:
+        reason = budget.exceeded()
+        if reason:
+            budget.stop(reason)
+            break
+        r = tail_file(fp, state, settings=settings, detector=detector, budget=budget, from_end=from_end)
+        if fp is not p:
+            rel = fp.relative_to(p).as_posix()
+            for f in r.findings:
+                f.location = f"{rel}:{f.location}"
+        per_file[str(fp)] = {k: r.meta[k] for k in ("byte_range", "new_bytes", "events")}
+        reports.append(r)
+    state.save()
+
+    report = _combine(reports, target=str(p))
+    report.meta.update({
+        "mode": "tail",
+        "files_scanned": len(reports),
+        "new_bytes": sum(int(m["new_bytes"]) for m in per_file.values()),
+        "files": per_file,
+        "state": str(state.path),
+        "budget": budget.to_meta(),
+    })
+    return report
+
+
+def _scan_partial(cp: Checkpoint, p: Path, *, settings: Settings, detector: RegexDetector) -> ScanReport:
+    from .scan import mask_value
+
+    text = cp.partial_bytes.decode("utf-8", errors="replace")
+    matches = detector.detect(text)
+    findings = [
+        Finding(location=f"line:{cp.line}:byte:{cp.offset}", masked_value=mask_value(m.raw, settings.mask_keep_last), matches=[m])
+        for m in matches
+    ]
+    return ScanReport(created_at=now_iso(), target=str(p), summary=score_matches(matches), findings=findings, meta={})
+
+
+def _combine(reports: List[ScanReport], *, target: str) -> ScanReport:
+    findings: List[Finding] = []
+    matches: List[Match] = []
+    for r in reports:
+        findings.extend(r.findings)
+        for f in r.findings:
+            matches.extend(f.matches)
+    return ScanReport(created_at=now_iso(), target=target, summary=score_matches(matches), findings=findings, meta={})
@@ -0,0 +1,158 @@
+"""Cascading detection: pattern detectors on every value, NLP only where warranted.
+
+Detectors with a ``types`` list (``RegexDetector``, possibly behind
+``CachedDetector``) are the *fast* tier and see every value. Untyped
+detectors (Presidio/spaCy) are the *nlp* tier and only see the values that
+``EscalationPolicy`` escalates. The policy is the comma-separated
+``Settings.nlp_escalation`` spec:
+
+- ``tokens>=N``: free text, at least N whitespace-separated tokens.
+- ``ambiguous``: the fast tier hit a type it can't confirm on its own
+  (``TELEFONE`` by default; ``ambiguous=TELEFONE+SENHA`` to choose).
+- ``header``: the column name suggests names, addresses or free text
+  (``nome``, ``endereco``, ``obs``…).
+- ``always``: every value (the pre-cascade behaviour). ``never``: no NLP.
+
+Untyped detectors are not all NLP: Presidio's recognizers are the only
+source of ``IBAN_CODE``, ``IP_ADDRESS`` and ``MEDICAL_LICENSE``. A detector
+whose ``covers`` lists types the fast tier can't produce also gets every
+value the fast tier found nothing in (reason ``coverage``), whatever the
+policy, so the cascade doesn't cost recall on those types.
+
+A value that matches no criterion (e.g. a cell regex already resolved to a
+CPF) never reaches the nlp tier. ``TierStats`` counts values, matches and
+escalation reasons per tier for ``meta["tiers"]``.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from typing import Collection, Dict, FrozenSet, List, Optional, Sequence, Set, Tuple
+
+from .detectors.base import Detector, Match
+
+FAST = "fast"
+NLP = "nlp"
+
+_NLP_HEADERS = (
+    "nome", "name", "endereco", "address", "rua", "street", "obs", "observ", "coment", "comment",
+    "descri", "note", "nota", "mensag", "message", "texto", "text", "contat", "contact", "cliente",
+)
+_TOKEN_RE = re.compile(r"\S+")
+# NLP-tier entity names and the fast-tier type that already finds the same thing
+_FAST_EQUIVALENT = {"EMAIL_ADDRESS": "EMAIL", "PHONE_NUMBER": "TELEFONE"}
+
+
+def detector_tier(d: Detector) -> str:
+    return FAST if getattr(d, "types", None) is not None else NLP
+
+
+def exclusive_types(d: Detector, fast_types: Collection[str]) -> Set[str]:
+    """Types ``d`` declares in ``covers`` that no fast-tier detector produces."""
+    return {t for t in (getattr(d, "covers", None) or ()) if _FAST_EQUIVALENT.get(t, t) not in fast_types}
+
+
+def suspicious_header(column: str) -> bool:
+    """Column names that hint at names/addresses/free text, which only NLP finds.
+
+    (``profiling.header_hints`` names like ``cpf`` are covered by the fast tier.)
+    """
+    tokens = [t for t in re.split(r"[^a-z0-9]+", column.lower()) if t]
+    return any(tok.startswith(key) for tok in tokens for key in _NLP_HEADERS)
+
+
+@dataclass(frozen=True)
+class EscalationPolicy:
+    always: bool = False
+    min_tokens: Optional[int] = None
+    ambiguous: FrozenSet[str] = frozenset()
+    header: bool = False
+
+    @classmethod
+    def parse(cls, spec: str) -> "EscalationPolicy":
+        always, min_tokens, ambiguous, header = False, None, frozenset(), False
+        for part in (p.strip() for p in (spec or "").split(",")):
+            if not part or part == "never":
+                continue
+            if part == "always":
+                always = True
+            elif part == "header":
+                header = True
+            elif part == "ambiguous":
+                ambiguous = frozenset({"TELEFONE"})
+            elif part.startswith("ambiguous="):
+                ambiguous = frozenset(t.strip().upper() for t in part.split("=", 1)[1].split("+") if t.strip())
+            elif part.startswith("tokens>="):
+                try:
+                    min_tokens = int(part.split(">=", 1)[1])
+                except ValueError:
+                    raise ValueError(f"bad escalation criterion {part!r}: expected tokens>=N") from None
+            else:
+                raise ValueError(f"unknown escalation criterion {part!r} (use tokens>=N, ambiguous[=T+T], header, always, never)")
+        return cls(always=always, min_tokens=min_tokens, ambiguous=ambiguous, header=header)
+
+    def reason(self, value: str, fast_matches: Sequence[Match], *, header_hit: bool = False) -> Optional[str]:
+        """Why ``value`` goes to the nlp tier, or None if it doesn't."""
+        if self.always:
+            return "always"
+        if self.header and header_hit:
+            return "header"
+        if self.ambiguous and any(m.type in self.ambiguous for m in fast_matches):
+            return "ambiguous"
+        if self.min_tokens is not None and _enough_tokens(value, self.min_tokens):
+            return "tokens"
+        return None
+
+
+def _enough_tokens(value: str, n: int) -> bool:
+    for i, _ in enumerate(_TOKEN_RE.finditer(value), 1):
+        if i >= n:
+            return True
+    return False
+
+
+@dataclass
+class TierStats:
+    values: Dict[str, int] = field(default_factory=lambda: {FAST: 0, NLP: 0})
+    matches: Dict[str, int] = field(default_factory=lambda: {FAST: 0, NLP: 0})
+    escalated: Dict[str, int] = field(default_factory=dict)
+    not_escalated: int = 0
+
+    def to_dict(self) -> Dict[str, object]:
+        return {
+            FAST: {"values": self.values[FAST], "matches": self.matches[FAST]},
+            NLP: {
+                "values": self.values[NLP],
+                "matches": self.matches[NLP],
+                "skipped": self.not_escalated,
+                "escalated_by": dict(self.escalated),
+            },
+        }
+
+
+def escalate(
+    policy: EscalationPolicy,
+    values: Sequence[str],
+    fast_results: Sequence[Sequence[Match]],
+    stats: TierStats,
+    *,
+    column: Optional[str] = None,
+    coverage: bool = False,
+) -> List[Tuple[int, str]]:
+    """``(index, reason)`` for the ``values`` the nlp tier should see (reasons
+    counted in ``stats``). With ``coverage``, values the fast tier found
+    nothing in and no criterion picked come back with reason ``coverage``:
+    only detectors with exclusive types should get those."""
+    header_hit = policy.header and column is not None and suspicious_header(column)
+    picked: List[Tuple[int, str]] = []
+    for i, (v, found) in enumerate(zip(values, fast_results)):
+        why = policy.reason(v, found, header_hit=header_hit)
+        if why is None and coverage and not found:
+            why = "coverage"
+        if why is None:
+            stats.not_escalated += 1
+            continue
+        stats.escalated[why] = stats.escalated.get(why, 0) + 1
+        picked.append((i, why))
+    return picked
@@ -0,0 +1,83 @@
+"""Scan-wide dictionary of distinct cell values.
+
+``scan_dataframe`` dedupes within a column. This dictionary dedupes across
+columns, the tables of a dump and the files of a folder scan. Each
+distinct value gets a small integer id, keyed by a BLAKE2b digest. The
+entry keeps:
+
+- the detector results for that value, per detection context (detector
+  names and versions, route types, NLP header escalation), so each
+  distinct value is detected once;
+- the ``Finding`` first reported for it. A later occurrence only appends
+  its location to that finding's ``also_at`` instead of adding a finding.
+
+The keys are digests, but both of these hold the raw matched text
+(``Match.raw``): keep a dictionary no longer than the scan it serves. It is
+bounded by ``max_entries`` (LRU). An evicted value is detected and
+reported again the next time it shows up, so eviction only costs time.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple
+
+from .detectors.base import Match
+from .reporting import Finding
+
+
+class _Entry:
+    __slots__ = ("id", "results", "finding", "target")
+
+    def __init__(self, id: int) -> None:
+        self.id = id
+        self.results: Dict[Hashable, Tuple[Match, ...]] = {}
+        self.finding: Optional[Finding] = None
+        self.target = ""
+
+
+class ValueDictionary:
+    def __init__(self, max_entries: int = 500_000) -> None:
+        self.max_entries = max_entries
+        self._data: "OrderedDict[bytes, _Entry]" = OrderedDict()
+        self._next_id = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def key(value: str) -> bytes:
+        return hashlib.blake2b(value.encode("utf-8", errors="surrogatepass"), digest_size=16).digest()
+
+    def entry(self, value: str) -> _Entry:
+        k = self.key(value)
+        e = self._data.get(k)
+        if e is None:
+            e = self._data[k] = _Entry(id=self._next_id)
+            self._next_id += 1
+            if len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.evictions += 1
+        else:
+            self._data.move_to_end(k)
+        return e
+
+    def lookup(self, values: Sequence[str], context: Hashable) -> Tuple[List[_Entry], List[int]]:
+        """Entries for ``values`` and the indexes not yet detected under ``context``."""
+        entries = [self.entry(v) for v in values]
+        missing = [i for i, e in enumerate(entries) if context not in e.results]
+        self.hits += len(values) - len(missing)
+        self.misses += len(missing)
+        return entries, missing
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "distinct_values": self._next_id,
+            "entries": len(self._data),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
@@ -0,0 +1,327 @@
+"""Coordinator/worker scanning over a file-backed SQLite queue.
+
+No external broker: the queue is one SQLite database in WAL mode, which can
+live on storage shared by every worker host. Work items are files, or byte
+ranges of big plain-text files (see ``scan_text_file(start=, end=)``).
+
+Workers ``lease`` an item for ``lease_seconds``, ``heartbeat`` while they
+work, and ``complete`` it with the report JSON. A lease that expires (worker
+died or hung) makes the item available again; after ``max_attempts`` it is
+marked ``failed``. ``collect`` aggregates every finished item of a run into a
+single ``ScanReport``.
+"""
+
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .config import Settings
+from .detectors.base import Detector
+from .reporting import Finding, ScanReport, now_iso
+from .scoring import score_counts
+from .textscan import TEXT_SUFFIXES, count_newlines
+
+SUPPORTED_SUFFIXES = {".csv", ".json", ".jsonl", ".sql"} | TEXT_SUFFIXES
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id TEXT NOT NULL,
+    path TEXT NOT NULL,
+    start INTEGER,
+    end INTEGER,
+    first_line INTEGER,
+    status TEXT NOT NULL DEFAULT 'queued',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    lease_owner TEXT,
+    lease_expires REAL,
+    result TEXT,
+    error TEXT,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS items_run_status ON items (run_id, status);
+"""
+
+
+@dataclass(frozen=True)
+class WorkItem:
+    id: int
+    run_id: str
+    path: str
+    start: Optional[int]
+    end: Optional[int]
+    first_line: Optional[int] = None  # line number at ``start``, counted once by the enqueuer
+
+
+class WorkQueue:
+    def __init__(self, db_path: str | Path, *, max_attempts: int = 3) -> None:
+        self.db_path = str(db_path)
+        self.max_attempts = max_attempts
+        # autocommit mode; writes that must be atomic use BEGIN IMMEDIATE
+        self._conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA busy_timeout=30000")
+        self._conn.executescript(_SCHEMA)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(items)")}
+        if "first_line" not in columns:  # queue file from an older version
+            self._conn.execute("ALTER TABLE items ADD COLUMN first_line INTEGER")
+        self._lock = threading.Lock()
+
+    def close(self) -> None:
+        self._conn.close()
+
+    # -------- Coordinator side --------
+
+    def enqueue_path(self, root: str | Path, *, settings: Optional[Settings] = None, chunk_bytes: Optional[int] = None) -> str:
+        """Queue every supported file under ``root``; returns the run id.
+
+        Plain-text files larger than ``chunk_bytes`` are split into byte ranges.
+        Each range carries the line number it starts at, counted here in one
+        pass over the file, so workers don't re-count from the top.
+        """
+        settings = settings or Settings()
+        chunk = chunk_bytes or settings.queue_chunk_bytes
+        root = Path(root)
+        if not root.exists():
+            raise FileNotFoundError(str(root))
+        files = [root] if root.is_file() else [fp for fp in sorted(root.rglob("*")) if fp.is_file() and fp.suffix.lower() in SUPPORTED_SUFFIXES]
+
+        run_id = uuid.uuid4().hex[:12]
+        now = time.time()
+        rows = []
+        for fp in files:
+            size = fp.stat().st_size
+            if settings.raw_text_scan and fp.suffix.lower() in TEXT_SUFFIXES and chunk and size > chunk:
+                with open(fp, "rb") as fh, mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    line = 1
+                    for a in range(0, size, chunk):
+                        b = min(a + chunk, size)
+                        rows.append((run_id, str(fp), a, b, line, now))
+                        line += count_newlines(mm, a, b)
+            else:
+                rows.append((run_id, str(fp), None, None, None, now))
+
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            self._conn.executemany("INSERT INTO items (run_id, path, start, end, first_line, updated_at) VALUES (?, ?, ?, ?, ?, ?)", rows)
+            self._conn.execute("COMMIT")
+        return run_id
+
+    def progress(self, run_id: str) -> Dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM items WHERE run_id = ? GROUP BY status", (run_id,)).fetchall()
+        counts = {"queued": 0, "leased": 0, "done": 0, "failed": 0}
+        counts.update({status: n for status, n in rows})
+        return counts
+
+    def is_finished(self, run_id: str) -> bool:
+        p = self.progress(run_id)
+        return p["queued"] == 0 and p["leased"] == 0
+
+    def collect(self, run_id: str, *, target: Optional[str] = None) -> ScanReport:
+        """Aggregate the finished items of ``run_id`` into one report."""
+        findings: List[Finding] = []
+        counts: Dict[str, int] = {}
+        targets = set()
+        with self._lock:
+            rows = self._conn.execute("SELECT path, result FROM items WHERE run_id = ? AND status = 'done' ORDER BY id", (run_id,)).fetchall()
+            failed = [
+                {"path": path, "start": start, "end": end, "error": error}
+                for path, start, end, error in self._conn.execute(
+                    "SELECT path, start, end, error FROM items WHERE run_id = ? AND status = 'failed' ORDER BY id", (run_id,)
+                )
+            ]
+        for path, result in rows:
+            targets.add(path)
+            report = ScanReport.from_dict(json.loads(result))
+            findings.extend(report.findings)
+            for t, n in report.summary.counts_by_type.items():
+                counts[t] = counts.get(t, 0) + n
+
+        return ScanReport(
+            created_at=now_iso(),
+            target=target or f"queue:{run_id}",
+            summary=score_counts(counts),
+            findings=findings,
+            meta={"run_id": run_id, "files_scanned": len(targets), "items_done": len(rows), "items_failed": failed},
+        )
+
+    def reap(self) -> None:
+        """Mark items whose lease expired on their last attempt as failed."""
+        with self._lock:
+            self._reap(time.time())
+
+    def _reap(self, now: float) -> None:
+        self._conn.execute(
+            "UPDATE items SET status = 'failed', error = COALESCE(error, 'lease expired'), updated_at = ? "
+            "WHERE status = 'leased' AND lease_expires < ? AND attempts >= ?",
+            (now, now, self.max_attempts),
+        )
+
+    # -------- Worker side --------
+
+    def lease(self, worker_id: str, *, lease_seconds: float = 60.0, run_id: Optional[str] = None) -> Optional[WorkItem]:
+        """Atomically take the oldest queued (or expired-lease) item."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._reap(now)
+                row = self._conn.execute(
+                    "SELECT id, run_id, path, start, end, first_line FROM items "
+                    "WHERE (status = 'queued' OR (status = 'leased' AND lease_expires < ?)) "
+                    + ("AND run_id = ? " if run_id else "")
+                    + "ORDER BY id LIMIT 1",
+                    (now, run_id) if run_id else (now,),
+                ).fetchone()
+                if row is None:
+                    self._conn.execute("COMMIT")
+                    return None
+                self._conn.execute(
+                    "UPDATE items SET status = 'leased', lease_owner = ?, lease_expires = ?, attempts = attempts + 1, updated_at = ? WHERE id = ?",
+                    (worker_id, now + lease_seconds, now, row[0]),
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return WorkItem(*row)
+
+    def heartbeat(self, item_id: int, worker_id: str, *, lease_seconds: float = 60.0) -> bool:
+        """Extend the lease; False means it was lost (expired and re-leased)."""
+        now = time.time()
+        with self._lock:
+            cur = self._conn.execute(
+                "UPDATE items SET lease_expires = ?, updated_at = ? WHERE id = ? AND lease_owner = ? AND status = 'leased'",
+                (now + lease_seconds, now, item_id, worker_id),
+            )
+        return cur.rowcount == 1
+
+    def complete(self, item_id: int, worker_id: str, result_json: str) -> bool:
+        with self._lock:
+            cur = self._conn.execute(
+                "UPDATE items SET status = 'done', result = ?, error = NULL, updated_at = ? WHERE id = ? AND lease_owner = ? AND status = 'leased'",
+                (result_json, time.time(), item_id, worker_id),
+            )
+        return cur.rowcount == 1
+
+    def fail(self, item_id: int, worker_id: str, error: str) -> None:
+        """Give the item back (or mark it failed after ``max_attempts``)."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE items SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'queued' END, "
+                "error = ?, lease_owner = NULL, lease_expires = NULL, updated_at = ? WHERE id = ? AND lease_owner = ?",
+                (self.max_attempts, error, time.time(), item_id, worker_id),
+            )
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+
+def scan_item(item: WorkItem, settings: Settings, detectors: Optional[List[Detector]] = None) -> ScanReport:
+    """Scan one leased item; pass the worker's ``detectors`` so they aren't rebuilt per item."""
+    from .scan import scan_path
+    from .textscan import scan_text_file
+
+    if item.start is not None:
+        return scan_text_file(item.path, settings=settings, start=item.start, end=item.end, first_line=item.first_line)
+    return scan_path(item.path, settings=settings, detectors=detectors)
+
+
+def run_worker(
+    db_path: str | Path,
+    *,
+    settings: Optional[Settings] = None,
+    worker_id: Optional[str] = None,
+    run_id: Optional[str] = None,
+    lease_seconds: float = 60.0,
+    idle_exit_seconds: float = 5.0,
+) -> int:
+    """Process items until the queue stays empty for ``idle_exit_seconds``.
+
+    A background thread heartbeats the current lease every ``lease_seconds/3``.
+    Returns the number of items completed.
+    """
+    from .scan import default_detectors
+
+    settings = settings or Settings()
+    worker_id = worker_id or default_worker_id()
+    # built once per worker: with Presidio on, each set loads a spaCy model
+    detectors = default_detectors(settings)
+    queue = WorkQueue(db_path)
+    done = 0
+    idle_since = time.monotonic()
+    try:
+        while True:
+            item = queue.lease(worker_id, lease_seconds=lease_seconds, run_id=run_id)
+            if item is None:
+                if time.monotonic() - idle_since >= idle_exit_seconds:
+                    return done
+                time.sleep(min(0.5, idle_exit_seconds))
+                continue
+
+            stop = threading.Event()
+
+            def _beat() -> None:
+                while not stop.wait(lease_seconds / 3):
+                    if not queue.heartbeat(item.id, worker_id, lease_seconds=lease_seconds):
+                        return
+
+            beater = threading.Thread(target=_beat, daemon=True)
+            beater.start()
+            try:
+                report = scan_item(item, settings, detectors)
+            except Exception as e:
+                queue.fail(item.id, worker_id, f"{type(e).__name__}: {e}")
+            else:
+                if queue.complete(item.id, worker_id, report.to_json(indent=None)):
+                    done += 1
+            finally:
+                stop.set()
+                beater.join()
+            idle_since = time.monotonic()
+    finally:
+        queue.close()
+
+
+def scan_path_distributed(
+    path: str | Path,
+    db_path: str | Path,
+    *,
+    settings: Optional[Settings] = None,
+    workers: int = 0,
+    poll_seconds: float = 1.0,
+) -> ScanReport:
+    """Coordinator: enqueue ``path``, optionally start local workers, wait, aggregate.
+
+    With ``workers=0`` the coordinator only waits, for workers started
+    elsewhere (``python -m cli.main worker --db ...``) on the same queue file.
+    """
+    import multiprocessing as mp
+
+    settings = settings or Settings()
+    queue = WorkQueue(db_path)
+    try:
+        run_id = queue.enqueue_path(path, settings=settings)
+        procs = [mp.Process(target=run_worker, args=(db_path,), kwargs={"settings": settings, "run_id": run_id}) for _ in range(workers)]
+        for proc in procs:
+            proc.start()
+        while not queue.is_finished(run_id):
+            time.sleep(poll_seconds)
+            queue.reap()
+        for proc in procs:
+            proc.join()
+        return queue.collect(run_id, target=str(path))
+    finally:
+        queue.close()
@@ -0,0 +1,97 @@
+"""CSV ingestion throughput: legacy ``process_file`` path vs ``ingest.read_frame``.
+
+    python scripts/bench_ingest.py --mb 100
+    python scripts/bench_ingest.py --file exports/clients.csv --repeat 5
+
+The legacy path reads the bytes, decodes them to a str, wraps it in a
+StringIO and parses that. ``read_frame`` hands the path to the parser (C
+engine, or pyarrow when installed). Both read every row here, so the MB/s
+compare parsing cost; real scans stop at ``DATAGUARDIAN_MAX_ROWS``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from core.file_processor import process_file  # noqa: E402
+from dataguardian.config import Settings  # noqa: E402
+from dataguardian.ingest import csv_engines, read_frame  # noqa: E402
+from dataguardian.scan import default_detectors  # noqa: E402
+
+
+def _make_csv(path: Path, mb: float) -> None:
+    rnd = random.Random(0)
+    target = int(mb * 1024 * 1024)
+    with open(path, "w", encoding="utf-8") as fh:
+        fh.write("id,nome,cpf,email,cidade,saldo,ativo\n")
+        i = 0
+        while fh.tell() < target:
+            fh.write(f"{i},Cliente {i},529.982.247-25,c{i}@example.com,São Paulo,{rnd.random() * 1e4:.2f},{i % 2 == 0}\n")
+            i += 1
+
+
+class _Upload:
+    def __init__(self, path: Path) -> None:
+        self.name = path.name
+        self.type = ""
+        self._path = path
+
+    def read(self) -> bytes:
+        return self._path.read_bytes()
+
+    def seek(self, pos: int) -> None:
+        pass
+
+
+def _bench(label: str, fn: Callable[[], object], size: int, repeat: int) -> None:
+    best = float("inf")
+    rows = cols = 0
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        df = fn()
+        best = min(best, time.perf_counter() - t0)
+        rows, cols = df.shape
+    print(f"{label:<28} {size / best / 1e6:8.1f} MB/s   {best:6.2f}s   rows={rows} cols={cols}")
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--file", type=Path, help="CSV to read (default: generate one)")
+    ap.add_argument("--mb", type=float, default=50, help="Size of the generated CSV")
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    tmp = None
+    path = args.file
+    if path is None:
+        tmp = tempfile.NamedTemporaryFile(suffix=".csv", delete=False)
+        tmp.close()
+        path = Path(tmp.name)
+        _make_csv(path, args.mb)
+    size = path.stat().st_size
+    print(f"{path} ({size / 1e6:.1f} MB)")
+
+    try:
+        _bench("process_file (legacy)", lambda: process_file(_Upload(path)), size, args.repeat)
+        for engine in csv_engines():
+            settings = Settings(max_rows_preview=10**12, csv_engine=engine, route_columns=False)
+            _bench(f"read_frame [{engine}]", lambda: read_frame(path, settings=settings), size, args.repeat)
+            routed = Settings(max_rows_preview=10**12, csv_engine=engine)
+            dets = default_detectors(routed)
+            _bench(f"read_frame [{engine}, routed]", lambda: read_frame(path, settings=routed, detectors=dets), size, args.repeat)
+    finally:
+        if tmp is not None:
+            os.unlink(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Concurrent load test for the scan API.
+
+Start the API first, e.g.:
+
+    DATAGUARDIAN_API_WORKERS=4 uvicorn api.main:app --port 8000
+
+then:
+
+    python scripts/loadtest_api.py --url http://127.0.0.1:8000 --file samples/users.csv -c 32 -n 500
+
+Reports throughput, latency percentiles and status codes (429 = backpressure),
+and probes /health during the run to show the event loop stays responsive.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+from collections import Counter
+from pathlib import Path
+from typing import List, Optional
+
+import httpx
+
+
+def _pct(values: List[float], p: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(p / 100 * (len(values) - 1))))]
+
+
+async def _worker(client: httpx.AsyncClient, url: str, payload: Optional[bytes], name: str, jobs: asyncio.Queue, lat: List[float], codes: Counter) -> None:
+    while True:
+        try:
+            jobs.get_nowait()
+        except asyncio.QueueEmpty:
+            return
+        t0 = time.perf_counter()
+        try:
+            if payload is None:
+                r = await client.post(f"{url}/scan/text", json={"text": "contato joao@example.com cpf 529.982.247-25"})
+            else:
+                r = await client.post(f"{url}/scan/file", files={"file": (name, payload)})
+            codes[r.status_code] += 1
+        except httpx.HTTPError as e:
+            codes[type(e).__name__] += 1
+        lat.append(time.perf_counter() - t0)
+
+
+async def _health_probe(client: httpx.AsyncClient, url: str, stop: asyncio.Event, lat: List[float]) -> None:
+    while not stop.is_set():
+        t0 = time.perf_counter()
+        try:
+            await client.get(f"{url}/health")
+            lat.append(time.perf_counter() - t0)
+        except httpx.HTTPError:
+            pass
+        await asyncio.sleep(0.2)
+
+
+async def main() -> None:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--url", default="http://127.0.0.1:8000")
+    ap.add_argument("--file", type=Path, help="File to upload to /scan/file (default: /scan/text)")
+    ap.add_argument("-c", "--concurrency", type=int, default=16)
+    ap.add_argument("-n", "--requests", type=int, default=200)
+    args = ap.parse_args()
+
+    payload = args.file.read_bytes() if args.file else None
+    name = args.file.name if args.file else ""
+    jobs: asyncio.Queue = asyncio.Queue()
+    for i in range(args.requests):
+        jobs.put_nowait(i)
+
+    lat: List[float] = []
+    health_lat: List[float] = []
+    codes: Counter = Counter()
+    stop = asyncio.Event()
+    limits = httpx.Limits(max_connections=args.concurrency + 2)
+    async with httpx.AsyncClient(timeout=300, limits=limits) as client:
+        probe = asyncio.create_task(_health_probe(client, args.url, stop, health_lat))
+        t0 = time.perf_counter()
+        await asyncio.gather(*[_worker(client, args.url, payload, name, jobs, lat, codes) for _ in range(args.concurrency)])
+        elapsed = time.perf_counter() - t0
+        stop.set()
+        await probe
+
+    print(f"requests: {args.requests}  concurrency: {args.concurrency}  elapsed: {elapsed:.2f}s")
+    print(f"throughput: {args.requests / elapsed:.1f} req/s" + (f"  ({len(payload) * codes[200] / elapsed / 1e6:.1f} MB/s scanned)" if payload else ""))
+    print(f"latency: p50={_pct(lat, 50) * 1000:.0f}ms p95={_pct(lat, 95) * 1000:.0f}ms p99={_pct(lat, 99) * 1000:.0f}ms")
+    if health_lat:
+        print(f"/health during load: p50={statistics.median(health_lat) * 1000:.0f}ms max={max(health_lat) * 1000:.0f}ms")
+    print("status codes:", dict(codes))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,111 @@
+import dataclasses
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from api import main
+from api.cache import ReportCache
+from api.jobs import JobRunner, JobStore
+from api.pool import ScanPool
+
+CSV = b"nome,cpf,email\nAna,529.982.247-25,ana@example.com\n"
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    settings = dataclasses.replace(
+        main.settings,
+        api_jobs_dir=str(tmp_path / "jobs"),
+        api_spool_dir=str(tmp_path),
+        api_cache_dir="",
+        findings_db=str(tmp_path / "findings.db"),
+        store_hash_key="",
+    )
+    pool = ScanPool(workers=2, max_queue=8, kind="thread")
+    jobs = JobStore(settings.api_jobs_dir)
+    monkeypatch.setattr(main, "settings", settings)
+    monkeypatch.setattr(main, "pool", pool)
+    monkeypatch.setattr(main, "jobs", jobs)
+    monkeypatch.setattr(main, "runner", JobRunner(jobs, pool, concurrency=1))
+    monkeypatch.setattr(main, "cache", ReportCache.from_settings(settings))
+    monkeypatch.setattr(main, "_store", None)
+    with TestClient(main.app) as c:
+        yield c
+    if main._store is not None:
+        main._store.close()
+    jobs.close()
+
+
+def _upload(name="clientes.csv", data=CSV):
+    return {"file": (name, data, "text/csv")}
+
+
+def test_scan_file_etag_304_and_cache_hit(client):
+    first = client.post("/scan/file", files=_upload())
+    assert first.status_code == 200 and first.headers["x-cache"] == "miss"
+    assert first.json()["summary"]["counts_by_type"] == {"CPF": 1, "EMAIL": 1}
+
+    again = client.post("/scan/file", files=_upload("copia.csv"))
+    assert again.headers["x-cache"] == "hit" and again.headers["etag"] == first.headers["etag"]
+    assert again.json()["target"] == "api:file:copia.csv"
+
+    cond = client.post("/scan/file", files=_upload(), headers={"If-None-Match": first.headers["etag"]})
+    assert cond.status_code == 304
+
+    sha = main.hashlib.sha256(CSV).hexdigest()
+    assert client.get(f"/scan/cache/{sha}").json()["summary"]["counts_by_type"] == {"CPF": 1, "EMAIL": 1}
+    assert client.get(f"/scan/cache/{'0' * 64}").status_code == 404
+
+
+def test_jobs_queue_scan_and_report(client):
+    created = client.post("/jobs", files=_upload())
+    assert created.status_code == 202
+    job_id = created.json()["id"]
+    deadline = time.monotonic() + 10
+    while client.get(f"/jobs/{job_id}").json()["status"] not in ("done", "failed"):
+        assert time.monotonic() < deadline
+        time.sleep(0.05)
+    job = client.get(f"/jobs/{job_id}").json()
+    assert job["status"] == "done" and job["bytes_scanned"] == job["bytes_total"] == len(CSV)
+    report = client.get(f"/jobs/{job_id}/report").json()
+    assert report["summary"]["counts_by_type"] == {"CPF": 1, "EMAIL": 1}
+    assert client.get("/jobs/nope").status_code == 404
+
+
+def test_redact_endpoint(client):
+    resp = client.post("/redact", files=_upload(), params={"mode": "mask"})
+    assert resp.status_code == 200
+    assert b"529.982.247-25" not in resp.content and resp.content.splitlines()[0] == b"nome,cpf,email"
+    assert resp.headers["x-redacted"] == "CPF=1,EMAIL=1"
+    # no DATAGUARDIAN_STORE_HASH_KEY configured
+    assert client.post("/redact", files=_upload(), params={"mode": "hash"}).status_code == 400
+
+
+def test_metrics_exposition(client):
+    client.post("/scan/text", json={"text": "cpf 529.982.247-25"})
+    body = client.get("/metrics").text
+    assert "dataguardian_pool_in_flight" in body and "dataguardian_jobs_queued" in body
+    assert 'endpoint="scan_text"' in body
+
+
+def test_findings_query_and_lookup(client):
+    client.post("/scan/file", files=_upload())
+    rows = client.get("/findings", params={"type": "CPF", "days": 1}).json()
+    assert rows["count"] == 1 and rows["findings"][0]["target"] == "api:file:clientes.csv"
+    hit = client.post("/findings/lookup", json={"value": "52998224725", "type": "CPF"}).json()
+    assert hit["count"] == 1
+    assert client.get("/findings", params={"value_hash": rows["findings"][0]["value_hash"]}).json()["count"] == 1
+
+
+def test_cache_hit_is_indexed_under_its_own_target(client):
+    client.post("/scan/file", files=_upload())
+    assert client.post("/scan/file", files=_upload("copia.csv")).headers["x-cache"] == "hit"
+    rows = client.get("/findings", params={"type": "CPF"}).json()["findings"]
+    assert sorted(r["target"] for r in rows) == ["api:file:clientes.csv", "api:file:copia.csv"]
+
+
+@pytest.mark.parametrize("params", [{"limit": -1}, {"limit": 0}, {"limit": 10_001}, {"days": 0}, {"days": -5}])
+def test_findings_query_rejects_bad_window(client, params):
+    assert client.get("/findings", params=params).status_code == 400
+    assert client.post("/findings/lookup", json={"value": "x", "type": "CPF", **params}).status_code == 400
@@ -0,0 +1,36 @@
+from api.cache import ReportCache, is_sha256, scan_fingerprint
+from dataguardian.config import Settings
+
+SHA = "a" * 64
+
+
+def test_memory_lru_evicts_by_bytes():
+    cache = ReportCache(fingerprint="f", max_memory_bytes=10)
+    cache.put("1" * 64, b"aaaaaa")
+    cache.put("2" * 64, b"bbbbbb")
+    assert cache.get("1" * 64) is None
+    assert cache.get("2" * 64) == b"bbbbbb"
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+
+def test_disk_tier_survives_new_instance(tmp_path):
+    ReportCache(fingerprint="f", max_memory_bytes=0, directory=str(tmp_path)).put(SHA, b"{}")
+    again = ReportCache(fingerprint="f", max_memory_bytes=1024, directory=str(tmp_path))
+    assert again.get(SHA) == b"{}"
+    # another fingerprint (settings / patterns changed) must miss
+    assert ReportCache(fingerprint="g", max_memory_bytes=0, directory=str(tmp_path)).get(SHA) is None
+
+
+def test_fingerprint_tracks_scan_settings_only():
+    base = scan_fingerprint(Settings())
+    assert scan_fingerprint(Settings(api_workers=99)) == base
+    assert scan_fingerprint(Settings(max_rows_preview=7)) != base
+    assert is_sha256(SHA) and not is_sha256("xyz")
+
+
+def test_put_is_keyed_by_the_scan_pattern_version():
+    cache = ReportCache.from_settings(Settings(api_cache_mb=1))
+    cache.put(SHA, b"{}", patterns_version="old000000000")
+    # the process's current pack differs from the one the worker scanned with
+    assert cache.get(SHA) is None
+    assert cache.key(SHA, "old000000000") != cache.key(SHA)
@@ -0,0 +1,76 @@
+import asyncio
+import json
+import os
+import socket
+
+from api.jobs import JobRunner, JobStore, iter_report_json, run_job, safe_filename
+from api.pool import ScanPool
+
+
+def _queue_job(store, tmp_path):
+    job_id = store.new_job_id()
+    store.job_dir(job_id).mkdir()
+    path = store.job_dir(job_id) / "people.csv"
+    path.write_text("nome,cpf,email\nAna,529.982.247-25,ana@example.com\nBia,111.111.111-11,bia@example.com\n")
+    return store.create(job_id, "people.csv", path)
+
+
+def test_run_job_writes_streamable_report(tmp_path):
+    store = JobStore(tmp_path)
+    job = _queue_job(store, tmp_path)
+    assert store.claim_next().id == job.id
+
+    assert run_job(str(tmp_path), job.id) == "done"
+    done = store.get(job.id)
+    assert done.status == "done" and done.findings >= 2 and done.rows_scanned == 2
+    assert done.bytes_scanned > 0
+
+    data = json.loads("".join(iter_report_json(done.report_path)))
+    assert data["summary"]["counts_by_type"]["CPF"] == 1
+    assert {f["location"] for f in data["findings"]} >= {"column:cpf", "column:email"}
+
+
+def test_recover_requeues_jobs_of_dead_owner(tmp_path):
+    store = JobStore(tmp_path)
+    job = _queue_job(store, tmp_path)
+    store.claim_next()
+    store._conn.execute("UPDATE jobs SET owner = 'nohost-x:1' WHERE id = ?", (job.id,))
+    assert store.recover() == 0  # other host: assumed alive
+    store._conn.execute("UPDATE jobs SET owner = ? WHERE id = ?", (f"{socket.gethostname()}:999999999", job.id))
+    assert store.recover() == 1
+    assert JobStore(tmp_path).get(job.id).status == "queued"
+
+
+def test_recover_requeues_jobs_of_previous_boot_with_same_pid(tmp_path):
+    # restarted container: same hostname and PID, but a new process
+    store = JobStore(tmp_path)
+    job = _queue_job(store, tmp_path)
+    store.claim_next()
+    assert store.recover() == 0  # claimed by this very process
+    store._conn.execute("UPDATE jobs SET owner = ? WHERE id = ?", (f"{socket.gethostname()}:{os.getpid()}:oldboot", job.id))
+    assert store.recover() == 1
+
+
+def test_runner_drains_queue(tmp_path):
+    store = JobStore(tmp_path)
+    job = _queue_job(store, tmp_path)
+
+    async def run():
+        pool = ScanPool(workers=1, max_queue=0, kind="thread")
+        runner = JobRunner(store, pool, concurrency=1)
+        task = asyncio.ensure_future(runner.run())
+        for _ in range(100):
+            if store.get(job.id).status == "done":
+                break
+            await asyncio.sleep(0.05)
+        task.cancel()
+        pool.shutdown()
+
+    asyncio.run(run())
+    assert store.get(job.id).status == "done"
+
+
+def test_safe_filename():
+    assert safe_filename("../../etc/passwd") == "passwd"
+    assert safe_filename("dump 01.csv") == "dump_01.csv"
+    assert safe_filename("") == "upload"
@@ -0,0 +1,23 @@
+import asyncio
+import threading
+
+import pytest
+
+from api.pool import PoolSaturated, ScanPool
+
+
+def test_pool_rejects_when_saturated():
+    release = threading.Event()
+
+    async def run():
+        pool = ScanPool(workers=1, max_queue=0, kind="thread")
+        first = asyncio.ensure_future(pool.submit(release.wait, 5))
+        await asyncio.sleep(0.05)
+        with pytest.raises(PoolSaturated):
+            await pool.submit(len, "x")
+        release.set()
+        assert await first is True
+        assert await pool.submit(len, "abc") == 3
+        pool.shutdown()
+
+    asyncio.run(run())
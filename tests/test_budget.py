@@ -0,0 +1,32 @@
+import pandas as pd
+
+from dataguardian.config import Settings
+from dataguardian.detectors.regex_detector import RegexDetector
+from dataguardian.scan import default_detectors, scan_dataframe, scan_path
+
+
+def test_findings_budget_truncates_scan():
+    df = pd.DataFrame({"a": [f"user{i}@example.com" for i in range(20)], "b": ["x@y.com"] * 20})
+    report = scan_dataframe(df, settings=Settings(max_findings=5), detectors=[RegexDetector()])
+    assert len(report.findings) == 5
+    assert report.meta["budget"]["truncated"]
+    assert report.meta["budget"]["columns_unscanned"] == ["b"]
+
+
+def test_file_byte_budget_skips_and_flags(tmp_path):
+    (tmp_path / "a.csv").write_text("email\n" + "joao@example.com\n" * 100, encoding="utf-8")
+    (tmp_path / "b.log").write_text("ok\n" * 100, encoding="utf-8")
+    report = scan_path(tmp_path, settings=Settings(max_file_bytes=64, enable_presidio=False))
+    assert report.meta["files_scanned"] == 2
+    assert sorted(report.meta["budget"]["files_truncated"]) == sorted(str(tmp_path / n) for n in ("a.csv", "b.log"))
+
+
+def test_regex_cell_timeout_is_counted():
+    det = RegexDetector(cell_timeout=1e-9)
+    det.detect("1234 " * 20000)
+    assert det.timeouts > 0
+
+
+def test_cell_timeout_is_off_by_default():
+    det = default_detectors(Settings(max_cell_seconds=0, enable_presidio=False, detection_cache_mb=0))[0]
+    assert det.cell_timeout is None and not det.pack.timed
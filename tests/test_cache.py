@@ -0,0 +1,75 @@
+import pandas as pd
+
+from dataguardian.config import Settings
+from dataguardian.detectors.cache import CachedDetector, DetectionCache
+from dataguardian.detectors.regex_detector import RegexDetector
+from dataguardian.scan import scan_dataframe
+
+
+def test_cached_detector_hits_on_repeat_values():
+    det = CachedDetector(RegexDetector(), DetectionCache())
+    first = det.detect("email: a@b.com")
+    again = det.detect_many(["email: a@b.com", "nada"])
+    assert again[0] == first
+    stats = det.cache.stats()
+    assert stats["hits"] == 1 and stats["misses"] == 2
+
+
+def test_cache_evicts_under_memory_cap():
+    cache = DetectionCache(max_bytes=2000)
+    det = CachedDetector(RegexDetector(), cache)
+    for i in range(50):
+        det.detect(f"user{i}@example.com")
+    assert cache.stats()["bytes"] <= 2000
+    assert cache.evictions > 0
+
+
+def test_scan_dataframe_reports_cache_metrics():
+    det = CachedDetector(RegexDetector(), DetectionCache())
+    df = pd.DataFrame({"a": ["x@y.com"], "b": ["x@y.com"]})
+    # without the scan's value dictionary, which would dedupe column b itself
+    report = scan_dataframe(df, detectors=[det], settings=Settings(value_dict_entries=0))
+    assert report.meta["cache"]["hits"] == 1
+
+
+def test_scan_cache_metrics_are_per_scan():
+    det = CachedDetector(RegexDetector(), DetectionCache())
+    df = pd.DataFrame({"a": ["x@y.com"], "b": ["x@y.com"]})
+    settings = Settings(value_dict_entries=0)
+    scan_dataframe(df, detectors=[det], settings=settings)
+    again = scan_dataframe(df, detectors=[det], settings=settings)
+    # the shared cache saw 3 hits in total; this scan only made 2
+    assert again.meta["cache"]["hits"] == 2 and again.meta["cache"]["misses"] == 0
+
+
+class _Slow:
+    """Detector whose first call hits the cell timeout."""
+
+    name = "slow"
+
+    def __init__(self):
+        self.timeouts = 0
+        self.calls = 0
+
+    def detect(self, text):
+        self.calls += 1
+        if self.calls == 1:
+            self.timeouts += 1
+            return []
+        return RegexDetector().detect(text)
+
+
+def test_timed_out_cell_is_not_memoized():
+    inner = _Slow()
+    det = CachedDetector(inner, DetectionCache())
+    assert det.detect("a@b.com") == []
+    assert [m.type for m in det.detect("a@b.com")] == ["EMAIL"]
+    assert det.detect("a@b.com") and inner.calls == 2
+
+
+def test_detect_many_with_types_falls_back_to_detect():
+    inner = _Slow()
+    inner.calls = 1  # no timeout
+    det = CachedDetector(inner, DetectionCache())
+    out = det.detect_many(["a@b.com cpf 529.982.247-25", "nada"], types={"CPF"})
+    assert [[m.type for m in found] for found in out] == [["CPF"], []]
@@ -0,0 +1,31 @@
+from dataguardian.detectors.checksums import (
+    validate_card_batch,
+    validate_cnpj_batch,
+    validate_cpf_batch,
+    validate_luhn_batch,
+    validate_pis_batch,
+)
+from dataguardian.detectors.regex_detector import RegexDetector
+
+
+def test_cpf_cnpj_batch():
+    assert validate_cpf_batch(["529.982.247-25", "529.982.247-24", "111.111.111-11", "123"]).tolist() == [True, False, False, False]
+    assert validate_cnpj_batch(["11.222.333/0001-81", "11.222.333/0001-82"]).tolist() == [True, False]
+
+
+def test_luhn_and_pis_batch():
+    assert validate_luhn_batch(["4111 1111 1111 1111", "4111 1111 1111 1112", "5555-4444-3333-1111"]).tolist() == [True, False, True]
+    assert validate_pis_batch(["120.54463.14-2", "120.54463.14-3"]).tolist() == [True, False]
+
+
+def test_detect_many_matches_detect():
+    det = RegexDetector()
+    texts = ["CPF 529.982.247-25", "cartão 4111 1111 1111 1111", "", "nada aqui"]
+    assert det.detect_many(texts) == [det.detect(t) for t in texts]
+    assert any(m.type == "CREDIT_CARD" for m in det.detect(texts[1]))
+
+
+def test_card_needs_iin_and_is_not_a_cnpj():
+    # 40388368595790 passes both Luhn and the CNPJ check digits; 8... is no card network
+    assert validate_card_batch(["4111 1111 1111 1111", "40388368595790", "8111111111111112"]).tolist() == [True, False, False]
+    assert "CREDIT_CARD" not in {m.type for m in RegexDetector().detect("cnpj 40388368595790")}
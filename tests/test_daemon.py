@@ -0,0 +1,51 @@
+import json
+import os
+import signal
+import socket
+import time
+
+import pytest
+
+from cli.client import request
+from dataguardian.config import Settings
+from dataguardian import daemon
+from dataguardian.daemon import handle_request, serve
+from dataguardian.detectors.regex_detector import RegexDetector
+
+pytestmark = pytest.mark.skipif(not hasattr(os, "fork"), reason="daemon needs fork")
+
+
+def test_handle_request_rejects_relative_paths():
+    header, payload = handle_request(b'{"path": "data.csv"}', settings=Settings(), detectors=[RegexDetector()])
+    assert header["ok"] is False and "absolute" in header["error"] and payload == b""
+
+
+def test_client_scans_through_forked_daemon(tmp_path, monkeypatch):
+    monkeypatch.setattr(daemon, "REQUEST_TIMEOUT", 0.3)
+    csv = tmp_path / "clientes.csv"
+    csv.write_text("email,cpf\nana@x.com,529.982.247-25\n", encoding="utf-8")
+    sock = tmp_path / "scanner.sock"
+
+    pid = os.fork()
+    if pid == 0:
+        try:
+            serve(sock, workers=1, settings=Settings())
+        finally:
+            os._exit(0)
+    try:
+        for _ in range(200):
+            if sock.exists():
+                break
+            time.sleep(0.05)
+        # an idle client only holds the single worker until REQUEST_TIMEOUT
+        idle = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        idle.connect(str(sock))
+        header, body = request(str(sock), {"path": str(csv), "format": "json"}, timeout=30)
+        idle.close()
+        assert header["ok"] and header["size"] == len(body)
+        report = json.loads(body)
+        assert set(report["summary"]["counts_by_type"]) >= {"EMAIL", "CPF"}
+    finally:
+        os.kill(pid, signal.SIGTERM)
+        os.waitpid(pid, 0)
+    assert not sock.exists()
@@ -0,0 +1,86 @@
+import pytest
+
+from dataguardian.config import Settings
+from dataguardian.ingest import csv_engines, read_frame
+from dataguardian.scan import scan_path
+
+
+def test_row_formats_read_only_preview_rows(tmp_path):
+    csv = tmp_path / "big.csv"
+    csv.write_text("Nome,CPF\n" + "".join(f"p{i},529.982.247-25\n" for i in range(1000)))
+    df = read_frame(csv, settings=Settings(max_rows_preview=10))
+    assert list(df.columns) == ["nome", "cpf"] and len(df) == 10
+
+    jl = tmp_path / "rows.jsonl"
+    jl.write_text('{"email": "a@b.com"}\n\n{"email": "c@d.com"}\n{"email": "e@f.com"}\n')
+    assert len(read_frame(jl, max_rows=2)) == 2
+
+
+def test_scan_path_uses_bounded_reader(tmp_path):
+    csv = tmp_path / "people.csv"
+    csv.write_text("cpf\n529.982.247-25\n")
+    report = scan_path(csv)
+    assert report.summary.counts_by_type == {"CPF": 1}
+    assert report.meta["rows_scanned"] == 1
+
+
+def test_sniffs_semicolon_cp1252_export(tmp_path):
+    from dataguardian.ingest import sniff_csv
+
+    path = tmp_path / "export.csv"
+    path.write_bytes("Nome;CPF;Cidade\nJoão;529.982.247-25;São Paulo\n".encode("cp1252"))
+    fmt = sniff_csv(path)
+    assert (fmt.encoding, fmt.sep) == ("cp1252", ";")
+    df = read_frame(path)
+    assert list(df.columns) == ["nome", "cpf", "cidade"] and df["nome"][0] == "João"
+
+
+def test_sample_routing_reads_only_useful_columns(tmp_path):
+    from dataguardian.scan import default_detectors
+
+    path = tmp_path / "wide.csv"
+    path.write_text("id,active,email\n" + "".join(f"{i},true,u{i}@example.com\n" for i in range(600)))
+    settings = Settings(max_rows_preview=1000, route_sample_rows=256)
+    df = read_frame(path, settings=settings, detectors=default_detectors(settings))
+    assert list(df.columns) == ["email"] and len(df) == 600
+    assert set(df.attrs["routing"]) == {"id", "active"}
+
+    report = scan_path(path, settings=settings)
+    assert report.meta["columns_skipped"] == 2 and report.summary.counts_by_type["EMAIL"] == 200
+
+
+def test_sparse_column_is_read_by_default(tmp_path):
+    path = tmp_path / "sparse.csv"
+    path.write_text("id,obs\n" + "".join(f"{i},\n" for i in range(100)) + "100,529.982.247-25\n")
+    assert Settings().route_sample_rows == 0
+    assert scan_path(path, settings=Settings(max_rows_preview=200)).summary.counts_by_type == {"CPF": 1}
+
+
+def test_arrow_failure_falls_back_to_c_engine(tmp_path, monkeypatch):
+    from dataguardian import ingest
+
+    def broken(*args):
+        raise ValueError("ArrowInvalid: could not convert 'abc' with type int64")
+
+    monkeypatch.setattr(ingest, "_use_arrow", lambda settings: True)
+    monkeypatch.setattr(ingest, "_read_csv_arrow", broken)
+    path = tmp_path / "people.csv"
+    path.write_text("id,cpf\n1,529.982.247-25\nabc,x\n")
+    assert len(read_frame(path)) == 2
+
+
+def test_pyarrow_engine_matches_c_engine(tmp_path):
+    pytest.importorskip("pyarrow")
+    path = tmp_path / "people.csv"
+    path.write_bytes("nome;cpf\n".encode() + "".join(f"João {i};529.982.247-25\n" for i in range(50)).encode("cp1252"))
+    frames = [read_frame(path, settings=Settings(csv_engine=e, max_rows_preview=20, route_columns=False)) for e in ("c", "pyarrow")]
+    assert "pyarrow" in csv_engines()
+    assert frames[0].equals(frames[1]) and len(frames[1]) == 20
+
+
+def test_pyarrow_type_change_in_a_later_block(tmp_path):
+    pytest.importorskip("pyarrow")
+    path = tmp_path / "drift.csv"
+    path.write_text("n,cpf\n" + "1,x\n" * 400_000 + "abc,529.982.247-25\n")
+    df = read_frame(path, settings=Settings(csv_engine="pyarrow", max_rows_preview=10**6, route_columns=False))
+    assert len(df) == 400_001
@@ -0,0 +1,75 @@
+import io
+import json
+
+import pytest
+
+from dataguardian.jsonstream import flatten, iter_json_records, iter_json_rows, iter_object_items
+from dataguardian.scan import scan_path
+
+
+def test_array_elements_stream_across_small_chunks():
+    docs = [{"id": 12345, "name": "x" * 50, "nested": {"tags": ["a", "b"]}}, 7, "s", [1, 2], None]
+    fh = io.StringIO(" [ " + " , ".join(json.dumps(d) for d in docs) + " ] ")
+    assert list(iter_json_records(fh, chunk_size=4)) == docs
+
+
+def test_concatenated_values_and_single_object():
+    assert list(iter_json_records(io.StringIO('{"a": 1}\n{"a": 2}\n'), chunk_size=3)) == [{"a": 1}, {"a": 2}]
+    assert list(iter_json_records(io.StringIO('{"a": 1}'))) == [{"a": 1}]
+    assert list(iter_json_records(io.StringIO("[]"))) == []
+
+
+def test_malformed_element_stops_at_the_pending_cap():
+    class Counting(io.StringIO):
+        read_chars = 0
+
+        def read(self, n=-1):
+            data = super().read(n)
+            Counting.read_chars += len(data)
+            return data
+
+    fh = Counting('[{"a": 1}, {"b": oops}, ' + '{"c": "' + "x" * 100_000 + '"}, ' * 50 + "]")
+    records = iter_json_records(fh, chunk_size=64, max_element_chars=1000)
+    assert next(records) == {"a": 1}
+    with pytest.raises(ValueError, match="1000 chars"):
+        next(records)
+    assert Counting.read_chars < 5000  # didn't buffer the rest of the file
+
+
+def test_flatten_dotted_paths():
+    doc = {"user": {"contact": {"email": "a@b.com", "phones": ["1", "2"]}}, "items": [{"sku": 1}, {"sku": 2}]}
+    assert flatten(doc) == {"user.contact.email": ["a@b.com"], "user.contact.phones[]": ["1", "2"], "items[].sku": [1, 2]}
+
+
+def test_nested_json_file_reports_leaf_paths(tmp_path):
+    rows = [{"user": {"contact": {"email": f"u{i}@example.com"}, "cpf": "529.982.247-25"}} for i in range(3)]
+    path = tmp_path / "export.json"
+    path.write_text(json.dumps(rows))
+    report = scan_path(path)
+    locations = {f.location for f in report.findings}
+    assert locations == {"column:user.contact.email", "column:user.cpf"}
+    assert report.summary.counts_by_type == {"EMAIL": 3, "CPF": 1}
+
+
+def test_object_items_expand_arrays():
+    fh = io.StringIO('{"a": 1, "findings": [{"x": 1}, [2], 3], "b": {"c": []}, "e": []}')
+    items = list(iter_object_items(fh, expand=("findings", "e"), chunk_size=3))
+    assert items == [("a", 1), ("findings", {"x": 1}), ("findings", [2]), ("findings", 3), ("b", {"c": []})]
+    with pytest.raises(ValueError):
+        list(iter_object_items(io.StringIO('{"a": 1 "b": 2}')))
+
+
+def test_object_export_streams_its_arrays():
+    doc = {"exported": "2024-01-01", "data": [{"email": f"u{i}@example.com"} for i in range(200)]}
+    rows = list(iter_json_rows(io.StringIO(json.dumps(doc)), chunk_size=64, max_element_chars=1000))
+    assert rows[0] == {"exported": "2024-01-01"} and rows[1] == {"data": [{"email": "u0@example.com"}]} and len(rows) == 201
+    assert list(iter_json_rows(io.StringIO('{"a": 1}\n{"a": 2}'))) == [{"a": 1}, {"a": 2}]
+
+
+def test_json_file_keeps_rows_before_a_bad_element(tmp_path):
+    path = tmp_path / "export.json"
+    path.write_text('{"data": [{"cpf": "529.982.247-25"}, {"email": "ana@example.com"}, {"x": oops}]}')
+    report = scan_path(path)
+    assert report.summary.counts_by_type == {"CPF": 1, "EMAIL": 1}
+    assert {f.location for f in report.findings} == {"column:data[].cpf", "column:data[].email"}
+    assert "parse_error" in report.meta
@@ -0,0 +1,64 @@
+import json
+
+from dataguardian.config import Settings
+from dataguardian.merge import iter_report_records, merge_reports, read_report
+from dataguardian.scan import scan_path
+from dataguardian.sharding import in_shard, parse_shard
+
+
+def _tree(tmp_path):
+    root = tmp_path / "nas"
+    root.mkdir()
+    for i in range(8):
+        (root / f"f{i}.log").write_text(f"contato user{i}@example.com\n", encoding="utf-8")
+    return root
+
+
+def test_shards_partition_files(tmp_path):
+    root = _tree(tmp_path)
+    settings = Settings(enable_presidio=False)
+    scanned = [scan_path(root, settings=settings, shard=(i, 3)).meta["files_scanned"] for i in range(3)]
+    assert sum(scanned) == 8
+    assert parse_shard("1/3") == (1, 3)
+    assert in_shard("a/b.csv", (0, 1))
+
+
+def test_merge_json_and_ndjson_reports(tmp_path):
+    root = _tree(tmp_path)
+    settings = Settings(enable_presidio=False)
+    a = tmp_path / "a.json"
+    b = tmp_path / "b.ndjson"
+    a.write_text(scan_path(root, settings=settings, shard=(0, 2)).to_json(), encoding="utf-8")
+    b.write_text(scan_path(root, settings=settings, shard=(1, 2)).to_ndjson(), encoding="utf-8")
+
+    out = tmp_path / "merged.json"
+    summary = merge_reports([a, b], out)
+    merged = json.loads(out.read_text(encoding="utf-8"))
+    assert summary.counts_by_type == {"EMAIL": 8}
+    assert merged["summary"]["counts_by_type"] == {"EMAIL": 8}
+    assert len(merged["findings"]) == 8
+
+    out_nd = tmp_path / "merged.ndjson"
+    merge_reports([a, b], out_nd)
+    records = [json.loads(line)["record"] for line in out_nd.read_text(encoding="utf-8").splitlines()]
+    assert records[0] == "header" and records[-1] == "summary" and records.count("finding") == 8
+
+
+def test_shard_applies_to_a_single_file(tmp_path):
+    root = _tree(tmp_path)
+    settings = Settings(enable_presidio=False)
+    fp = root / "f0.log"
+    scanned = [scan_path(fp, settings=settings, shard=(i, 3)).summary.counts_by_type for i in range(3)]
+    assert scanned.count({"EMAIL": 1}) == 1 and scanned.count({}) == 2
+
+
+def test_json_report_findings_are_streamed(tmp_path):
+    report = tmp_path / "r.json"
+    report.write_text(
+        json.dumps({"findings": [{"location": "a"}, {"location": "b"}], "target": "t", "summary": {"counts_by_type": {"EMAIL": 2}}, "meta": {"m": 1}}),
+        encoding="utf-8",
+    )
+    records = list(iter_report_records(report))
+    assert [k for k, _ in records] == ["header", "finding", "finding", "header", "summary"]
+    loaded = read_report(report)
+    assert loaded.target == "t" and loaded.meta == {"m": 1} and len(loaded.findings) == 2
@@ -0,0 +1,25 @@
+from dataguardian.metrics import Registry
+
+
+def test_render_and_merge_deltas():
+    worker = Registry()
+    scans = worker.histogram("t_scan_seconds", "scan time", ["file_type"], buckets=(0.1, 1.0))
+    hits = worker.counter("t_hits_total", "hits", ["cache"])
+    scans.observe(0.05, file_type="csv")
+    scans.observe(2.0, file_type="csv")
+    hits.inc(3, cache="detection")
+
+    parent = Registry()
+    parent.histogram("t_scan_seconds", "scan time", ["file_type"], buckets=(0.1, 1.0))
+    parent.counter("t_hits_total", "hits", ["cache"])
+    parent.gauge("t_in_flight", "in flight", lambda: 2)
+    parent.merge(worker.drain())
+    assert worker.drain() == {}
+
+    text = parent.render()
+    assert 't_scan_seconds_bucket{file_type="csv",le="0.1"} 1' in text
+    assert 't_scan_seconds_bucket{file_type="csv",le="+Inf"} 2' in text
+    assert 't_scan_seconds_count{file_type="csv"} 2' in text
+    assert 't_hits_total{cache="detection"} 3' in text
+    assert "# TYPE t_in_flight gauge\nt_in_flight 2" in text
+    assert any(line.startswith("t_scan_seconds{file_type=csv}: n=2") for line in parent.summary())
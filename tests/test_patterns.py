@@ -0,0 +1,63 @@
+import json
+
+import pytest
+
+from dataguardian.detectors.cache import CachedDetector, DetectionCache
+from dataguardian.detectors.regex_detector import RegexDetector
+from dataguardian.patterns import get_pack
+from dataguardian.scan import scan_path
+
+
+def _write(path, patterns):
+    path.write_text(json.dumps(patterns), encoding="utf-8")
+
+
+def test_detectors_share_one_compiled_pack(tmp_path):
+    pack_file = tmp_path / "pack.json"
+    _write(pack_file, {"EMAIL": r"\b\S+@\S+\.com\b"})
+    a, b = RegexDetector(patterns_path=str(pack_file)), RegexDetector(patterns_path=str(pack_file))
+    assert a.pack is b.pack
+    assert a._compiled["EMAIL"] is b._compiled["EMAIL"]
+    assert a.version == get_pack(str(pack_file)).version
+
+
+def test_changed_pack_is_hot_reloaded(tmp_path):
+    pack_file = tmp_path / "pack.json"
+    _write(pack_file, {"EMAIL": r"\b\S+@\S+\.com\b"})
+    det = CachedDetector(RegexDetector(patterns_path=str(pack_file), reload_seconds=1e-9), DetectionCache())
+    before = det._version
+    assert det.detect_many(["id ABC-1234"]) == [[]]
+
+    _write(pack_file, {"EMAIL": r"\b\S+@\S+\.com\b", "TICKET": r"\bABC-\d{4}\b"})
+    assert det._version != before  # memo namespace moves with the pack
+    assert [m.type for m in det.detect_many(["id ABC-1234"])[0]] == ["TICKET"]
+
+
+def test_broken_pack_keeps_previous_version(tmp_path):
+    pack_file = tmp_path / "pack.json"
+    _write(pack_file, {"EMAIL": r"\b\S+@\S+\.com\b"})
+    det = RegexDetector(patterns_path=str(pack_file), reload_seconds=1e-9)
+    version = det.version
+    pack_file.write_text("{not json", encoding="utf-8")
+    assert det.version == version
+    assert det.detect("mail a@b.com")[0].type == "EMAIL"
+
+
+def test_missing_pack_keeps_previous_version_and_fails_first_load(tmp_path):
+    pack_file = tmp_path / "pack.json"
+    _write(pack_file, {"EMAIL": r"\b\S+@\S+\.com\b"})
+    det = RegexDetector(patterns_path=str(pack_file), reload_seconds=1e-9)
+    version = det.version
+    pack_file.rename(tmp_path / "pack.json.bak")  # renamed away mid-deploy
+    assert det.version == version
+    assert det.detect("mail a@b.com")[0].type == "EMAIL"
+
+    with pytest.raises(FileNotFoundError):
+        RegexDetector(patterns_path=str(tmp_path / "typo.json"))
+
+
+def test_scan_report_records_the_pack_version(tmp_path):
+    csv = tmp_path / "a.csv"
+    csv.write_text("email\na@b.com\n", encoding="utf-8")
+    detector = RegexDetector()
+    assert scan_path(csv, detectors=[detector]).meta["patterns"] == detector.version
@@ -0,0 +1,30 @@
+import pandas as pd
+
+from dataguardian.config import Settings
+from dataguardian.detectors.regex_detector import RegexDetector
+from dataguardian.profiling import header_hints
+from dataguardian.scan import scan_dataframe
+
+
+def test_header_hints():
+    assert header_hints("user_cpf") == ["CPF"]
+    assert header_hints("Email Address") == ["EMAIL"]
+    assert header_hints("hotel") == []
+
+
+def test_scan_dataframe_routes_columns():
+    df = pd.DataFrame(
+        {
+            "id": [1, 2, 3],
+            "active": [True, False, True],
+            "cpf": [52998224725, 52998224725, 52998224725],
+            "contato": ["joao@example.com", "maria@example.com", "x"],
+        }
+    )
+    report = scan_dataframe(df, settings=Settings(), detectors=[RegexDetector()])
+    routing = report.meta["routing"]
+    assert routing["id"]["skipped"] and routing["active"]["skipped"]
+    assert "EMAIL" not in routing["cpf"]["detectors"]["regex"]
+    assert routing["contato"]["detectors"]["regex"] == ["EMAIL"]
+    counts = report.summary.counts_by_type
+    assert counts["CPF"] == 1 and counts["EMAIL"] == 2
@@ -0,0 +1,55 @@
+import csv
+import io
+
+import pytest
+
+from core.file_processor import extract_sql_inserts_from_string
+from dataguardian.config import Settings
+from dataguardian.redact import redact_file, redact_stream
+
+
+def test_redact_csv_keeps_layout_and_masks_values(tmp_path):
+    src, dst = tmp_path / "clientes.csv", tmp_path / "out" / "clientes.csv"
+    src.write_text('id,cpf,email\n1,529.982.247-25,"ana@example.com"\n2,111.111.111-11,-\n', encoding="utf-8")
+    stats = redact_file(src, dst, mode="mask", settings=Settings(mask_keep_last=2))
+    lines = dst.read_text(encoding="utf-8").splitlines()
+    assert lines[0] == "id,cpf,email"
+    assert lines[1] == '1,************25,"*************om"'
+    # fails the CPF checksum: left alone
+    assert lines[2] == "2,111.111.111-11,-"
+    assert stats.replaced == {"CPF": 1, "EMAIL": 1}
+    assert stats.bytes_in == stats.bytes_out
+
+
+def test_redact_hash_is_stable_and_streams_across_chunks():
+    line = b'{"cpf": "529.982.247-25", "msg": "ok"}\n'
+    dst = io.BytesIO()
+    stats = redact_stream(io.BytesIO(line * 50), dst, mode="hash", settings=Settings(store_hash_key="k"), chunk_size=64)
+    out = dst.getvalue().splitlines()
+    assert len(out) == 50 and len(set(out)) == 1
+    assert out[0].startswith(b'{"cpf": "[CPF:') and b"529" not in out[0]
+    assert stats.replaced == {"CPF": 50}
+
+
+def test_redact_hash_refuses_without_key():
+    with pytest.raises(ValueError, match="STORE_HASH_KEY"):
+        redact_stream(io.BytesIO(b"529.982.247-25\n"), io.BytesIO(), mode="hash", settings=Settings(store_hash_key=""))
+
+
+def test_redact_never_swallows_a_csv_field(tmp_path):
+    src, dst = tmp_path / "users.csv", tmp_path / "out.csv"
+    src.write_text("id,secret,city\n1,password=hunter22,Recife\n2,\"senha: abc12345\",Natal\n", encoding="utf-8")
+    redact_file(src, dst, mode="mask", settings=Settings(mask_keep_last=0))
+    rows = list(csv.reader(io.StringIO(dst.read_text(encoding="utf-8"))))
+    assert [len(r) for r in rows] == [3, 3, 3]
+    assert [r[2] for r in rows] == ["city", "Recife", "Natal"]
+    assert "hunter22" not in rows[1][1] and "abc12345" not in rows[2][1]
+
+
+def test_redact_sql_dump_keeps_each_value(tmp_path):
+    src, dst = tmp_path / "dump.sql", tmp_path / "out.sql"
+    src.write_text("INSERT INTO users (id, secret, city) VALUES (1,'password=hunter22','Recife'),(2,'x','Natal');\n", encoding="utf-8")
+    redact_file(src, dst, mode="mask", settings=Settings(mask_keep_last=0))
+    df = extract_sql_inserts_from_string(dst.read_text(encoding="utf-8"))
+    assert list(df["city"]) == ["Recife", "Natal"]
+    assert set(df["secret"][0]) == {"*"}
@@ -0,0 +1,50 @@
+import base64
+import gzip
+import json
+import re
+
+from dataguardian.detectors.base import Match
+from dataguardian.reporting import Finding, ScanReport, to_html, write_html
+from dataguardian.scoring import score_counts
+
+
+def _report(n):
+    findings = [Finding(location=f"row:{i}", masked_value="<b>***</b>", matches=[Match(detector="regex", type="CPF", raw="x")]) for i in range(n)]
+    return ScanReport(created_at="now", target="t.csv", summary=score_counts({"CPF": n}), findings=findings, meta={})
+
+
+def test_small_report_is_plain_rows():
+    html = to_html(_report(3))
+    assert html.count("<tr><td>") == 3 and "&lt;b&gt;" in html
+    assert 'id="findings"' not in html
+
+
+def test_large_report_embeds_compressed_pages(tmp_path):
+    out = tmp_path / "r.html"
+    write_html(_report(2500), out, page_size=1000)
+    html = out.read_text(encoding="utf-8")
+    # first page rendered, the rest only in the compressed payload
+    assert html.count("<tr><td><code>row:") == 1000
+    payload = re.search(r'<script id="findings" type="application/octet-stream">([^<]*)</script>', html).group(1)
+    rows = [r for line in gzip.decompress(base64.b64decode(payload)).decode("utf-8").splitlines() for r in json.loads(line)]
+    assert len(rows) == 2500
+    assert rows[-1] == ["row:2499", "<b>***</b>", "CPF"]
+
+
+def test_binary_report_round_trips_lazily(tmp_path):
+    from dataguardian.binreport import LazyFindings
+    from dataguardian.merge import read_report
+
+    report = _report(5)
+    report.findings[2].matches.append(Match(detector="regex", type="EMAIL", raw="ana@example.com"))
+    report.findings[3].also_at = ["row:9", "b.csv:row:1"]
+    report.findings.append(Finding(location="row:5", masked_value="", matches=[]))
+    path = tmp_path / "r.dgr"
+    report.to_binary(path)
+
+    loaded = ScanReport.load(path)
+    assert isinstance(loaded.findings, LazyFindings)
+    assert loaded.to_dict() == report.to_dict()
+    assert loaded.findings[-1].matches == [] and len(loaded.findings[1:3]) == 2
+    assert loaded.findings.type_counts() == {"CPF": 5, "EMAIL": 1}
+    assert read_report(path).to_dict() == report.to_dict()
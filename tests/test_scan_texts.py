@@ -0,0 +1,27 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from api.main import _read_body
+from dataguardian.scan import scan_texts
+
+
+def test_scan_texts_batches_and_reports_only_hits():
+    msgs = (m for m in ["ok", "cpf 529.982.247-25", "ok", "mail ana@example.com", "cpf 529.982.247-25"])
+    res = scan_texts(msgs, batch_size=2)
+    assert res.texts_scanned == 5
+    assert [it["index"] for it in res.items] == [1, 3, 4]
+    assert res.items[0]["types"] == {"CPF": 1} and res.items[0]["values"] == ["**********7-25"]
+    assert res.summary.counts_by_type["CPF"] == 2 and res.summary.counts_by_type["EMAIL"] == 1
+
+
+def test_texts_body_is_capped():
+    async def chunks():
+        for _ in range(4):
+            yield b"x" * 10
+
+    assert asyncio.run(_read_body(chunks(), 40)) == b"x" * 40
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(_read_body(chunks(), 25))
+    assert exc.value.status_code == 413
@@ -0,0 +1,19 @@
+from dataguardian.config import Settings
+from dataguardian.detectors.regex_detector import RegexDetector
+from dataguardian.scan import scan_text
+from dataguardian.store import FindingsStore, value_hash
+
+
+def test_store_indexes_hashes_and_finds_value(tmp_path):
+    store = FindingsStore(tmp_path / "findings.db", hash_key=b"k")
+    report = scan_text("CPF 529.982.247-25", target="dump.sql", settings=Settings(), detectors=[RegexDetector()])
+    store.add_report(report)
+
+    rows = store.find_value("52998224725", "CPF", days=90)
+    assert [r["target"] for r in rows] == ["dump.sql"]
+    assert rows[0]["value_hash"] == value_hash("CPF", "529.982.247-25", b"k")
+    assert store.find_value("11144477735", "CPF") == []
+
+    raw = b"".join(fp.read_bytes() for fp in tmp_path.glob("findings.db*"))
+    assert b"529.982.247-25" not in raw and b"52998224725" not in raw
+    store.close()
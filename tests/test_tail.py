@@ -0,0 +1,67 @@
+import os
+
+from dataguardian.config import Settings
+from dataguardian.tail import tail_path
+
+
+def _append(fp, text):
+    with open(fp, "a", encoding="utf-8") as fh:
+        fh.write(text)
+
+
+def test_tail_scans_only_appended_complete_lines(tmp_path):
+    fp, state = tmp_path / "app.log", tmp_path / "state.json"
+    fp.write_text("email ana@example.com\n", encoding="utf-8")
+    first = tail_path(fp, state)
+    assert first.summary.counts_by_type == {"EMAIL": 1}
+
+    _append(fp, "cpf 529.982.247-25\nhalf a line bob@exa")
+    second = tail_path(fp, state)
+    assert second.summary.counts_by_type == {"CPF": 1}
+    assert second.findings[0].location.startswith("line:2:")
+
+    _append(fp, "mple.com\n")
+    third = tail_path(fp, state)
+    assert third.summary.counts_by_type == {"EMAIL": 1}
+    assert third.findings[0].location.startswith("line:3:")
+    assert tail_path(fp, state).meta["new_bytes"] == 0
+
+
+def test_tail_restarts_after_truncation(tmp_path):
+    fp, state = tmp_path / "app.log", tmp_path / "state.json"
+    fp.write_text("x" * 100 + "\n", encoding="utf-8")
+    tail_path(fp, state)
+    fp.write_text("cpf 529.982.247-25\n", encoding="utf-8")
+    report = tail_path(fp, state)
+    assert report.summary.counts_by_type == {"CPF": 1}
+    assert report.meta["files"][str(fp)]["events"][0].startswith("truncated")
+
+
+def test_tail_finishes_rotated_file_then_reads_new_one(tmp_path):
+    fp, state = tmp_path / "app.log", tmp_path / "state.json"
+    fp.write_text("boot\n", encoding="utf-8")
+    tail_path(fp, state)
+    _append(fp, "late ana@example.com\n")
+    os.rename(fp, tmp_path / "app.log.1")
+    fp.write_text("cpf 529.982.247-25\n", encoding="utf-8")
+
+    report = tail_path(fp, state)
+    assert report.summary.counts_by_type == {"EMAIL": 1, "CPF": 1}
+    assert any(f.location.startswith("app.log.1:line:2:") for f in report.findings)
+
+
+def test_findings_budget_cut_is_rescanned_next_run(tmp_path):
+    fp, state = tmp_path / "app.log", tmp_path / "state.json"
+    fp.write_text("".join(f"user{i}@example.com\n" for i in range(3)), encoding="utf-8")
+    settings = Settings(max_findings=1)
+    lines = [tail_path(fp, state, settings=settings).findings[0].location.split(":")[1] for _ in range(3)]
+    assert lines == ["1", "2", "3"]
+    assert tail_path(fp, state, settings=settings).meta["new_bytes"] == 0
+
+
+def test_findings_budget_within_one_line_still_progresses(tmp_path):
+    fp, state = tmp_path / "app.log", tmp_path / "state.json"
+    fp.write_text("a@example.com b@example.com c@example.com\n", encoding="utf-8")
+    settings = Settings(max_findings=1)
+    seen = [tail_path(fp, state, settings=settings).findings[0].location for _ in range(3)]
+    assert len(set(seen)) == 3
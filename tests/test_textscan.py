@@ -0,0 +1,21 @@
+from dataguardian.config import Settings
+from dataguardian.textscan import scan_text_file
+
+
+def test_text_file_reports_line_and_byte(tmp_path):
+    fp = tmp_path / "app.log"
+    fp.write_text("boot ok\nuser=joao email=joao@example.com\nCPF 529.982.247-25\n", encoding="utf-8")
+    report = scan_text_file(fp, settings=Settings())
+    locs = {f.matches[0].type: f.location for f in report.findings}
+    assert locs["EMAIL"] == "line:2:byte:24"
+    assert locs["CPF"].startswith("line:3:")
+
+
+def test_text_file_matches_across_window_boundary(tmp_path):
+    fp = tmp_path / "big.log"
+    fp.write_bytes(b"x" * 30 + b" joao@example.com " + b"y" * 30 + b"\n")
+    settings = Settings(text_window_bytes=40, text_window_overlap=32)
+    report = scan_text_file(fp, settings=settings)
+    assert report.meta["windows"] > 1
+    assert report.summary.counts_by_type == {"EMAIL": 1}
+
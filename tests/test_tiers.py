@@ -0,0 +1,63 @@
+import pandas as pd
+import pytest
+
+from dataguardian.config import Settings
+from dataguardian.detectors.base import Match
+from dataguardian.detectors.regex_detector import RegexDetector
+from dataguardian.scan import scan_dataframe
+from dataguardian.tiers import EscalationPolicy
+
+
+class FakeNLP:
+    name = "nlp"
+
+    def __init__(self):
+        self.seen = []
+
+    def detect(self, text):
+        self.seen.append(text)
+        return [Match(detector=self.name, type="PERSON", raw="Ana")] if "Ana" in text else []
+
+
+def test_nlp_tier_only_sees_escalated_values():
+    nlp = FakeNLP()
+    df = pd.DataFrame({
+        "cpf": ["529.982.247-25", "111.444.777-35"],
+        "codigo": ["ligar 11 98765-4321", "X-1"],
+        "obs": ["Ana pediu retorno", "ok"],
+    })
+    report = scan_dataframe(df, settings=Settings(route_columns=False, nlp_escalation="ambiguous,header"), detectors=[RegexDetector(), nlp])
+    # cpf column: regex resolved it, no criterion -> never sent; "X-1" has nothing ambiguous
+    assert sorted(nlp.seen) == ["Ana pediu retorno", "ligar 11 98765-4321", "ok"]
+    tiers = report.meta["tiers"]
+    assert tiers["fast"]["values"] == 6
+    assert tiers["nlp"] == {"values": 3, "matches": 1, "skipped": 3, "escalated_by": {"ambiguous": 1, "header": 2}}
+    assert report.summary.counts_by_type["PERSON"] == 1
+
+
+def test_policy_parse():
+    p = EscalationPolicy.parse("tokens>=5, ambiguous=telefone+senha")
+    assert p.min_tokens == 5 and p.ambiguous == {"TELEFONE", "SENHA"} and not p.header
+    assert p.reason("a b c d e", []) == "tokens" and p.reason("a b", []) is None
+    assert EscalationPolicy.parse("always").reason("", []) == "always"
+    with pytest.raises(ValueError):
+        EscalationPolicy.parse("sometimes")
+
+
+class FakePresidio(FakeNLP):
+    name = "presidio"
+    covers = ("EMAIL_ADDRESS", "IP_ADDRESS", "IBAN_CODE")
+
+    def detect(self, text):
+        self.seen.append(text)
+        return [Match(detector=self.name, type="IP_ADDRESS", raw=text)] if text.count(".") == 3 else []
+
+
+def test_recognizer_only_types_bypass_the_nlp_gate():
+    presidio, nlp = FakePresidio(), FakeNLP()
+    df = pd.DataFrame({"ip": ["192.168.10.20"], "cpf": ["529.982.247-25"]})
+    report = scan_dataframe(df, settings=Settings(), detectors=[RegexDetector(), presidio, nlp])
+    assert report.summary.counts_by_type["IP_ADDRESS"] == 1
+    # the CPF was resolved by regex; the plain NLP detector stays gated
+    assert presidio.seen == ["192.168.10.20"] and nlp.seen == []
+    assert report.meta["tiers"]["nlp"]["escalated_by"] == {"coverage": 1}
@@ -0,0 +1,62 @@
+import pandas as pd
+
+from dataguardian.config import Settings
+from dataguardian.reporting import ScanReport
+from dataguardian.scan import scan_dataframe, scan_path
+from dataguardian.valuedict import ValueDictionary
+
+
+class CountingRegex:
+    def __init__(self):
+        from dataguardian.detectors.regex_detector import RegexDetector
+
+        self.inner = RegexDetector()
+        self.name, self.types = "regex", self.inner.types
+        self.seen = 0
+
+    def detect_many(self, texts, types=None):
+        self.seen += len(texts)
+        return self.inner.detect_many(texts, types=types)
+
+
+def test_value_detected_once_and_reported_once_across_columns():
+    det = CountingRegex()
+    df = pd.DataFrame({"cpf": ["529.982.247-25", "x"], "cpf_backup": ["529.982.247-25", "y"], "doc": ["529.982.247-25", "x"]})
+    report = scan_dataframe(df, settings=Settings(route_columns=False), detectors=[det])
+    assert det.seen == 3  # 529..., x, y
+    assert len(report.findings) == 1
+    assert report.findings[0].also_at == ["column:cpf_backup", "column:doc"]
+    # risk still counts every occurrence
+    assert report.summary.counts_by_type == {"CPF": 3}
+    assert report.meta["value_dict"]["distinct_values"] == 3
+
+
+def test_folder_scan_shares_the_dictionary(tmp_path):
+    for name in ("a.csv", "b.csv"):
+        (tmp_path / name).write_text("email\nana@example.com\n", encoding="utf-8")
+    report = scan_path(tmp_path)
+    assert len(report.findings) == 1
+    assert report.findings[0].also_at == [f"{tmp_path / 'b.csv'}:column:email"]
+    assert report.summary.counts_by_type == {"EMAIL": 2}
+    assert ScanReport.from_dict(report.to_dict()).findings[0].also_at == report.findings[0].also_at
+
+
+def test_dictionary_is_bounded():
+    vd = ValueDictionary(max_entries=2)
+    vd.lookup(["a", "b", "c"], None)
+    assert vd.stats()["entries"] == 2 and vd.evictions == 1
+
+
+def test_results_are_keyed_by_the_detectors_that_ran():
+    class Blind:
+        name, types = "blind", []
+
+        def detect_many(self, texts, types=None):
+            return [[] for _ in texts]
+
+    vd = ValueDictionary()
+    df = pd.DataFrame({"email": ["ana@example.com"]})
+    settings = Settings(route_columns=False)
+    assert scan_dataframe(df, settings=settings, detectors=[Blind()], value_dict=vd).findings == []
+    report = scan_dataframe(df, settings=settings, detectors=[CountingRegex()], value_dict=vd)
+    assert report.summary.counts_by_type == {"EMAIL": 1}
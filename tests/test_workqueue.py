@@ -0,0 +1,62 @@
+import time
+
+from dataguardian.config import Settings
+from dataguardian.workqueue import WorkQueue, run_worker
+
+
+def test_queue_splits_ranges_and_collects(tmp_path):
+    root = tmp_path / "data"
+    root.mkdir()
+    (root / "big.log").write_text("".join(f"line {i} user{i}@example.com\n" for i in range(200)), encoding="utf-8")
+    (root / "users.csv").write_text("email\njoao@example.com\n", encoding="utf-8")
+    settings = Settings(enable_presidio=False)
+
+    db = tmp_path / "queue.db"
+    queue = WorkQueue(db)
+    run_id = queue.enqueue_path(root, settings=settings, chunk_bytes=1000)
+    assert queue.progress(run_id)["queued"] > 2
+
+    assert run_worker(db, settings=settings, idle_exit_seconds=0) == queue.progress(run_id)["done"]
+    report = queue.collect(run_id)
+    assert report.summary.counts_by_type["EMAIL"] == 201
+    assert report.meta["files_scanned"] == 2
+    # line numbers come from the enqueuer's per-range line base
+    lines = sorted(int(f.location.split(":")[1]) for f in report.findings if f.location.startswith("line:"))
+    assert lines == list(range(1, 201))
+    queue.close()
+
+
+def test_expired_lease_is_retried_then_failed(tmp_path):
+    queue = WorkQueue(tmp_path / "q.db", max_attempts=2)
+    (tmp_path / "a.csv").write_text("x\n1\n", encoding="utf-8")
+    run_id = queue.enqueue_path(tmp_path / "a.csv")
+
+    first = queue.lease("w1", lease_seconds=0.01)
+    time.sleep(0.02)
+    second = queue.lease("w2", lease_seconds=0.01)
+    assert first.id == second.id
+    assert not queue.complete(first.id, "w1", "{}")  # w1 lost its lease
+    time.sleep(0.02)
+    assert queue.lease("w3") is None
+    assert queue.progress(run_id)["failed"] == 1
+    queue.close()
+
+
+def test_worker_builds_detectors_once(tmp_path, monkeypatch):
+    from dataguardian import scan
+
+    built = []
+    real = scan.default_detectors
+    monkeypatch.setattr(scan, "default_detectors", lambda settings: built.append(1) or real(settings))
+    root = tmp_path / "data"
+    root.mkdir()
+    for i in range(3):
+        (root / f"u{i}.csv").write_text(f"email\nu{i}@example.com\n", encoding="utf-8")
+    settings = Settings(enable_presidio=False)
+    db = tmp_path / "queue.db"
+    queue = WorkQueue(db)
+    run_id = queue.enqueue_path(root, settings=settings)
+    assert run_worker(db, settings=settings, idle_exit_seconds=0) == 3
+    assert len(built) == 1
+    assert queue.collect(run_id).summary.counts_by_type == {"EMAIL": 3}
+    queue.close()